@@ -0,0 +1,270 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import deque, namedtuple
+
+"""
+Subsistema de auditoria usado pelo AuditMixin.
+Cada alteração gera um evento estruturado (entidade, id, usuário, status anterior e novo,
+instante monotônico e horário de parede), guardado em um buffer circular de capacidade fixa.
+Uma thread escritora descarrega o buffer em lotes para o destino configurado (JSONL ou SQLite)
+quando ele atinge o tamanho do lote ou quando o intervalo de tempo se esgota; se o buffer
+enche, quem registra aguarda o escritor (os eventos nunca são descartados). Com destino, o
+histórico de uma entidade é lido do destino e completado com os eventos ainda no buffer; sem
+destino, os eventos ficam em memória. Os três caminhos consultam um índice por entidade
+(id_entidade → eventos ou posições no arquivo), com o id normalizado como texto.
+"""
+
+EventoAuditoria = namedtuple("EventoAuditoria", ("entidade", "id_entidade", "acao", "usuario",
+                                                  "status_anterior", "status_novo", "monotonico",
+                                                  "registrado_em"))
+
+
+def chave_entidade(id_entidade):
+    """Chave do índice por entidade: o id como texto, igual em todos os destinos."""
+    return str(id_entidade)
+
+
+def identificar_usuario(usuario):
+    """Representa o usuário pelo CPF quando disponível (ou pelo próprio valor, ex.: "SISTEMA")."""
+    if usuario is None or isinstance(usuario, str):
+        return usuario
+    return getattr(usuario, "cpf", None) or str(usuario)
+
+
+class DestinoJSONL:
+    """Grava os eventos como uma linha JSON por evento, sempre em modo de acréscimo.
+    As posições das linhas de cada entidade ficam em um índice, montado com uma leitura do arquivo
+    existente na primeira operação e atualizado a cada lote gravado."""
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._trava = threading.Lock()
+        self._posicoes = None
+
+    def _indexar(self):
+        """Monta o índice id_entidade → posições das linhas a partir do arquivo já gravado."""
+        self._posicoes = {}
+        try:
+            with open(self.caminho, "rb") as arquivo:
+                posicao = 0
+                for linha in arquivo:
+                    if linha.strip():
+                        id_entidade = json.loads(linha)["id_entidade"]
+                        self._posicoes.setdefault(chave_entidade(id_entidade), []).append(posicao)
+                    posicao += len(linha)
+        except FileNotFoundError:
+            pass
+
+    def escrever(self, eventos):
+        with self._trava:
+            if self._posicoes is None:
+                self._indexar()
+            with open(self.caminho, "ab") as arquivo:
+                posicao = arquivo.tell()
+                linhas = []
+                for evento in eventos:
+                    # o id é gravado como texto, como no DestinoSQLite
+                    chave = chave_entidade(evento.id_entidade)
+                    dados = evento._replace(id_entidade=chave)._asdict()
+                    linha = (json.dumps(dados, ensure_ascii=False) + "\n").encode("utf-8")
+                    self._posicoes.setdefault(chave, []).append(posicao)
+                    posicao += len(linha)
+                    linhas.append(linha)
+                arquivo.writelines(linhas)
+
+    def ler_historico(self, id_entidade):
+        with self._trava:
+            if self._posicoes is None:
+                self._indexar()
+            posicoes = self._posicoes.get(chave_entidade(id_entidade))
+            if not posicoes:
+                return []
+            eventos = []
+            with open(self.caminho, "rb") as arquivo:
+                for posicao in posicoes:
+                    arquivo.seek(posicao)
+                    eventos.append(EventoAuditoria(**json.loads(arquivo.readline())))
+            return eventos
+
+    def fechar(self):
+        pass
+
+
+class DestinoSQLite:
+    """Grava os eventos em uma tabela indexada por id_entidade (modo WAL)."""
+    _ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS auditoria (
+            entidade TEXT NOT NULL,
+            id_entidade TEXT NOT NULL,
+            acao TEXT NOT NULL,
+            usuario TEXT,
+            status_anterior TEXT,
+            status_novo TEXT,
+            monotonico REAL NOT NULL,
+            registrado_em REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_auditoria_entidade ON auditoria (id_entidade);
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._trava = threading.Lock()
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.executescript(self._ESQUEMA)
+
+    def escrever(self, eventos):
+        linhas = [evento[:1] + (chave_entidade(evento.id_entidade),) + evento[2:] for evento in eventos]
+        with self._trava, self.conexao:
+            self.conexao.executemany("INSERT INTO auditoria VALUES (?, ?, ?, ?, ?, ?, ?, ?)", linhas)
+
+    def ler_historico(self, id_entidade):
+        with self._trava:
+            cursor = self.conexao.execute(
+                "SELECT * FROM auditoria WHERE id_entidade = ? ORDER BY rowid", (chave_entidade(id_entidade),))
+            return [EventoAuditoria(*linha) for linha in cursor]
+
+    def fechar(self):
+        with self._trava:
+            self.conexao.close()
+
+
+class RegistroAuditoria:
+    def __init__(self, destino=None, tamanho_lote=500, intervalo=1.0, capacidade=10000):
+        if capacidade < tamanho_lote:
+            raise ValueError("Erro: A capacidade do buffer deve ser maior ou igual ao tamanho do lote.")
+        self.destino = destino
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.capacidade = capacidade
+
+        self._buffer = deque()
+        self._condicao = threading.Condition()
+        self._trava_escrita = threading.Lock()
+        # sem destino, o histórico de cada entidade fica em memória (id_entidade → eventos)
+        self._eventos_por_entidade = {} if destino is None else None
+        self._escritor = None
+        self._encerrado = False
+        self.eventos_gravados = 0
+
+    # ---------
+    # REGISTRO
+    # ---------
+
+    def registrar(self, entidade, id_entidade, acao, usuario=None, status_anterior=None, status_novo=None):
+        """Registra um evento; custo O(1), sem E/S no chamador."""
+        evento = EventoAuditoria(entidade, id_entidade, acao, identificar_usuario(usuario),
+                                 status_anterior, status_novo, time.monotonic(), time.time())
+        with self._condicao:
+            if self._encerrado and self.destino is not None:
+                raise ValueError("Erro: O registro de auditoria já foi encerrado.")
+            if self.destino is None:
+                self._eventos_por_entidade.setdefault(chave_entidade(id_entidade), []).append(evento)
+                return evento
+            if self._escritor is None:
+                self._iniciar_escritor()
+            while len(self._buffer) >= self.capacidade:
+                self._condicao.notify_all()
+                self._condicao.wait()
+            self._buffer.append(evento)
+            if len(self._buffer) >= self.tamanho_lote:
+                self._condicao.notify_all()
+        return evento
+
+    # --------
+    # ESCRITOR
+    # --------
+
+    def _iniciar_escritor(self):
+        self._escritor = threading.Thread(target=self._executar_escritor, name="escritor-auditoria", daemon=True)
+        self._escritor.start()
+        atexit.register(self.fechar)
+
+    def _retirar_lote(self):
+        quantidade = min(len(self._buffer), self.tamanho_lote)
+        return [self._buffer.popleft() for _ in range(quantidade)]
+
+    def _gravar_lote(self):
+        """Retira e grava um lote; a trava de escrita mantém a ordem entre lotes."""
+        with self._trava_escrita:
+            with self._condicao:
+                lote = self._retirar_lote()
+                self._condicao.notify_all()
+            if lote:
+                self.destino.escrever(lote)
+                self.eventos_gravados += len(lote)
+        return len(lote)
+
+    def _executar_escritor(self):
+        while True:
+            with self._condicao:
+                # política de descarga: lote cheio, intervalo esgotado ou encerramento
+                prazo = time.monotonic() + self.intervalo
+                while len(self._buffer) < self.tamanho_lote and not self._encerrado:
+                    restante = prazo - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._condicao.wait(restante)
+                encerrado = self._encerrado
+            if not self._gravar_lote() and encerrado:
+                return
+
+    def descarregar(self):
+        """Grava imediatamente todos os eventos pendentes no buffer."""
+        if self.destino is None:
+            return
+        while self._gravar_lote():
+            pass
+
+    def fechar(self):
+        """Encerra o escritor após gravar os eventos pendentes."""
+        with self._condicao:
+            if self._encerrado:
+                return
+            self._encerrado = True
+            self._condicao.notify_all()
+        if self._escritor is not None:
+            self._escritor.join()
+        self.descarregar()
+        if self.destino is not None:
+            self.destino.fechar()
+
+    @property
+    def pendentes(self):
+        return len(self._buffer)
+
+    # --------
+    # CONSULTA
+    # --------
+
+    def historico(self, id_entidade):
+        """Eventos da entidade em ordem de registro: os já gravados no destino seguidos dos ainda
+        no buffer. Sem destino, os guardados em memória."""
+        chave = chave_entidade(id_entidade)
+        if self.destino is None:
+            with self._condicao:
+                return list(self._eventos_por_entidade.get(chave, ()))
+        # a trava de escrita impede que um lote esteja fora do buffer e ainda não gravado
+        with self._trava_escrita:
+            eventos = self.destino.ler_historico(id_entidade)
+            with self._condicao:
+                eventos.extend(evento for evento in self._buffer if chave_entidade(evento.id_entidade) == chave)
+        return eventos
+
+
+_registro_padrao = RegistroAuditoria()
+
+
+def obter_registro():
+    """Registro de auditoria em uso pelo AuditMixin."""
+    return _registro_padrao
+
+
+def configurar_registro(registro):
+    """Substitui o registro de auditoria em uso; o anterior é fechado. Retorna o novo registro."""
+    global _registro_padrao
+    anterior, _registro_padrao = _registro_padrao, registro
+    anterior.fechar()
+    return registro
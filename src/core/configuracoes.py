@@ -1,37 +1,251 @@
-"""Classe responsável pela definição de limites e configurações padrões do sistema cumprindo as regras de negócio e 
-fazendo uso do Pattern Singleton, mantendo a padronização das instâncias e da consistência global em todo o sistema
+import json
+import os
+import threading
+import weakref
+from types import MappingProxyType
+
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+"""Classe responsável pela definição de limites e configurações padrões do sistema cumprindo as regras de negócio e
+fazendo uso do Pattern Singleton, mantendo a padronização das instâncias e da consistência global em todo o sistema.
+Os valores vigentes ficam em um instantâneo imutável e versionado: cada alteração publica um novo instantâneo
+de forma atômica (cópia na escrita) e avisa os assinantes, de modo que um lote processado com um instantâneo
+usa os mesmos limites do início ao fim, mesmo que um parâmetro mude no meio do processamento.
+Os valores podem ser carregados de um arquivo TOML ou JSON, com sobrescritas por município
+(resolvidas uma vez por instantâneo e mantidas em cache), e recarregados quando a data de
+modificação do arquivo muda; os leitores nunca aguardam a trava.
         Atributos:
         FREQUENCIA_MINIMA (float): Percentual mínimo de presença (RN02).
         INDICE_LACUNA_MINIMO (float): Limite inferior para detecção de lacunas (RN03).
+        MEDIA_MINIMA (float): Média de notas abaixo da qual o aluno conta para a lacuna (RN03).
         LIMITE_CUSTO_DEMANDA (float): Teto orçamentário para requisições (RN04)."""
+
+
+class InstantaneoConfiguracoes:
+    """Conjunto imutável de parâmetros em uma versão da configuração."""
+    __slots__ = ("_versao", "_valores", "_sobrescritas", "_por_municipio")
+
+    def __init__(self, versao, valores, sobrescritas=None):
+        object.__setattr__(self, "_versao", versao)
+        object.__setattr__(self, "_valores", MappingProxyType(dict(valores)))
+        object.__setattr__(self, "_sobrescritas", MappingProxyType(
+            {id_municipio: MappingProxyType(dict(parametros)) for id_municipio, parametros in (sobrescritas or {}).items()}))
+        object.__setattr__(self, "_por_municipio", {})
+
+    @property
+    def sobrescritas(self):
+        return self._sobrescritas
+
+    def para_municipio(self, id_municipio):
+        """Instantâneo (mesma versão) com as sobrescritas do município aplicadas.
+        O resultado fica em cache neste instantâneo; sem sobrescritas, retorna o próprio."""
+        parametros = self._sobrescritas.get(id_municipio)
+        if not parametros:
+            return self
+        municipal = self._por_municipio.get(id_municipio)
+        if municipal is None:
+            municipal = self._por_municipio.setdefault(
+                id_municipio, InstantaneoConfiguracoes(self._versao, {**self._valores, **parametros}))
+        return municipal
+
+    @property
+    def versao(self):
+        return self._versao
+
+    @property
+    def valores(self):
+        return self._valores
+
+    def __getattr__(self, nome):
+        try:
+            return self._valores[nome]
+        except KeyError:
+            raise AttributeError(f"Parâmetro de configuração inexistente: {nome}") from None
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("Erro: Instantâneos de configuração são imutáveis; use Configuracoes.atualizar_parametro.")
+
+    def __repr__(self):
+        return f"InstantaneoConfiguracoes(versao={self._versao}, {dict(self._valores)})"
+
+
+def ler_arquivo_configuracao(caminho):
+    """Lê um arquivo .toml ou .json e retorna (parametros, sobrescritas_por_municipio).
+    As sobrescritas ficam na seção/chave "municipios", indexadas pelo id do município."""
+    if caminho.lower().endswith(".toml"):
+        if tomllib is None:
+            raise ImportError("Erro: A leitura de arquivos TOML requer Python 3.11+ (módulo tomllib).")
+        with open(caminho, "rb") as arquivo:
+            dados = tomllib.load(arquivo)
+    else:
+        with open(caminho, encoding="utf-8") as arquivo:
+            dados = json.load(arquivo)
+    if not isinstance(dados, dict):
+        raise ValueError("Erro: O arquivo de configuração deve conter um objeto/tabela.")
+    dados = dict(dados)
+    sobrescritas = dados.pop("municipios", None) or dados.pop("MUNICIPIOS", None) or {}
+    if not isinstance(sobrescritas, dict) or not all(isinstance(p, dict) for p in sobrescritas.values()):
+        raise ValueError("Erro: A seção municipios deve mapear o id do município aos seus parâmetros.")
+    return dados, sobrescritas
+
+
 class Configuracoes:
     _instancia = None
-    FREQUENCIA_MINIMA = 0.75
-    INDICE_LACUNA_MINIMO = 0.3
-    LIMITE_CUSTO_DEMANDA = 15000.0
+    _PADROES = {
+        "FREQUENCIA_MINIMA": 0.75,
+        "INDICE_LACUNA_MINIMO": 0.3,
+        "MEDIA_MINIMA": 6.0,
+        "LIMITE_CUSTO_DEMANDA": 15000.0,
+    }
 
     def __new__(cls):
         """Método especial para criação da instância ou padronização de já criadas"""
         if cls._instancia is None:
-            cls._instancia = super().__new__(cls)
+            instancia = super().__new__(cls)
+            instancia._trava = threading.Lock()
+            instancia._assinantes = []
+            instancia._atual = InstantaneoConfiguracoes(1, cls._PADROES)
+            instancia._arquivo = None
+            instancia._assinatura_arquivo = None
+            instancia._observador = None
+            instancia._parar_observacao = threading.Event()
+            cls._instancia = instancia
         return cls._instancia
 
+    def __getattr__(self, nome):
+        """Leitura direta de um parâmetro (ex.: config.FREQUENCIA_MINIMA) no instantâneo vigente"""
+        if nome.startswith("_"):
+            raise AttributeError(nome)
+        return getattr(self._atual, nome)
 
-    def atualizar_parametro(self, nome, valor):
-        """Método para alteração de limites e configurações pré-estabelecidas"""
+    def instantaneo(self):
+        """Retorna o instantâneo vigente; leia uma vez por lote para usar limites consistentes"""
+        return self._atual
+
+    def para_municipio(self, id_municipio):
+        """Instantâneo vigente com as sobrescritas do município (consulta em cache, sem trava)"""
+        return self._atual.para_municipio(id_municipio)
+
+    @property
+    def versao(self):
+        return self._atual.versao
+
+    def assinar(self, funcao):
+        """Registra uma função chamada com o novo instantâneo a cada publicação.
+        Métodos são guardados por referência fraca, sem manter o objeto vivo."""
+        referencia = weakref.WeakMethod(funcao) if hasattr(funcao, "__self__") else (lambda: funcao)
+        with self._trava:
+            self._assinantes.append(referencia)
+
+    def _publicar(self, alterar, sobrescritas=None):
+        """Gera e publica, sob a trava, o próximo instantâneo a partir dos valores vigentes;
+        os assinantes são avisados fora da trava. Sem novas sobrescritas, mantém as atuais."""
+        with self._trava:
+            valores = alterar(dict(self._atual.valores))
+            if sobrescritas is None:
+                sobrescritas = self._atual.sobrescritas
+            novo = InstantaneoConfiguracoes(self._atual.versao + 1, valores, sobrescritas)
+            self._atual = novo
+            self._assinantes = [referencia for referencia in self._assinantes if referencia() is not None]
+            assinantes = [referencia() for referencia in self._assinantes]
+        for funcao in assinantes:
+            if funcao is not None:
+                funcao(novo)
+        return novo
+
+    @staticmethod
+    def _validar(nome, valor, atuais):
         nome = nome.upper()
-        if hasattr(self, nome) and not nome.startswith("_"):
-            atual = getattr(self, nome)
-            permitidos = (int, float) if isinstance(atual, float) else type(atual)
-            if isinstance(valor, permitidos):
-                setattr(self, nome, valor)
-            else:
-                raise TypeError("Valor fornecido inválido")
-        else:
+        if nome.startswith("_") or nome not in atuais:
             raise ValueError("Parâmetro fornecido inválido")
+        atual = atuais[nome]
+        permitidos = (int, float) if isinstance(atual, float) else type(atual)
+        if not isinstance(valor, permitidos):
+            raise TypeError("Valor fornecido inválido")
+        return nome, float(valor) if isinstance(atual, float) else valor
+
+    def atualizar_parametros(self, **parametros):
+        """Altera vários parâmetros de uma vez, publicando um único instantâneo"""
+        def alterar(valores):
+            for nome, valor in parametros.items():
+                nome, valor = self._validar(nome, valor, valores)
+                valores[nome] = valor
+            return valores
+        return self._publicar(alterar)
+
+    def atualizar_parametro(self, nome, valor):
+        """Método para alteração de limites e configurações pré-estabelecidas"""
+        return self.atualizar_parametros(**{nome: valor})
 
     def resetar_padroes(self):
-        """Método de redefinação das configurações iniciais do sistema"""
-        for k in list(self.__dict__.keys()):
-            if not k.startswith("_"):
-                delattr(self, k)
\ No newline at end of file
+        """Método de redefinação das configurações iniciais do sistema (remove as sobrescritas)"""
+        return self._publicar(lambda valores: dict(self._PADROES), sobrescritas={})
+
+    # -------
+    # ARQUIVO
+    # -------
+
+    @staticmethod
+    def _assinatura_de(caminho):
+        estado = os.stat(caminho)
+        return estado.st_mtime_ns, estado.st_size
+
+    def carregar_arquivo(self, caminho):
+        """Carrega parâmetros e sobrescritas por município de um arquivo TOML ou JSON.
+        Parâmetros ausentes no arquivo assumem os valores padrão."""
+        assinatura = self._assinatura_de(caminho)
+        parametros, sobrescritas = ler_arquivo_configuracao(caminho)
+
+        valores = dict(self._PADROES)
+        for nome, valor in parametros.items():
+            nome, valor = self._validar(nome, valor, valores)
+            valores[nome] = valor
+        municipais = {}
+        for id_municipio, parametros_municipio in sobrescritas.items():
+            municipais[id_municipio] = dict(self._validar(nome, valor, valores)
+                                            for nome, valor in parametros_municipio.items())
+
+        novo = self._publicar(lambda _: valores, sobrescritas=municipais)
+        self._arquivo, self._assinatura_arquivo = caminho, assinatura
+        return novo
+
+    def recarregar_se_alterado(self):
+        """Recarrega o arquivo se a data de modificação (ou tamanho) mudou. Retorna True se recarregou."""
+        caminho = self._arquivo
+        if caminho is None:
+            return False
+        try:
+            if self._assinatura_de(caminho) == self._assinatura_arquivo:
+                return False
+        except FileNotFoundError:
+            return False
+        self.carregar_arquivo(caminho)
+        return True
+
+    def observar_arquivo(self, intervalo=1.0):
+        """Inicia uma thread que verifica o arquivo periodicamente e o recarrega quando muda.
+        Um arquivo inválido mantém o instantâneo anterior em vigor."""
+        if self._arquivo is None:
+            raise ValueError("Erro: Nenhum arquivo de configuração foi carregado.")
+        if self._observador is not None:
+            return
+
+        def observar():
+            while not self._parar_observacao.wait(intervalo):
+                try:
+                    self.recarregar_se_alterado()
+                except (ValueError, TypeError, OSError):
+                    pass
+
+        self._parar_observacao.clear()
+        self._observador = threading.Thread(target=observar, name="observador-configuracoes", daemon=True)
+        self._observador.start()
+
+    def parar_observacao(self):
+        if self._observador is not None:
+            self._parar_observacao.set()
+            self._observador.join()
+            self._observador = None
@@ -9,9 +9,14 @@ class DemandaFactory:
 
     """Métodos que permitem a criação de instâncias de demanda de acordo com o tipo e validam as regras de negócio:
     02 - Geração de demanda pedagógica automática caso a evasão de uma turma ultrapasse 25% 
-    03 - Alteração automática do status de uma demanda de insfraestrutura caso ultrapasse o valor limite definido"""
+    03 - Alteração automática do status de uma demanda de insfraestrutura caso ultrapasse o valor limite definido
+    Com indice_lacuna informado (RN03), a demanda pedagógica automática descreve a lacuna de aprendizagem da turma;
+    referencia_mensal=(ano, mes) identifica o mês avaliado pela RN02"""
     @staticmethod
     def criar_demanda(tipo_demanda, solicitante, descricao=None, prioridade="NORMAL", **kwargs):
+        # em lotes, o chamador informa o instantâneo de configuração usado no lote inteiro
+        config = kwargs.get("config") or DemandaFactory.config.instantaneo()
+        config = config.para_municipio(getattr(solicitante, "id_municipio", None))
         id_demanda = str(uuid.uuid4())
         turma_selecionada = kwargs.get("turma")
         if tipo_demanda.upper() == "PEDAGOGICA":
@@ -20,21 +25,27 @@ class DemandaFactory:
                 alunos_abaixo_media = kwargs.get("alunos_abaixo_media")
                 frequencia_turma = kwargs.get("frequencia_turma")
                 alunos_presentes = kwargs.get("alunos_presentes")
+                indice_lacuna = kwargs.get("indice_lacuna")
                 if not descricao:
                     solicitante = "SISTEMA"
-                    media_mensal = kwargs.get("media_mensal", 0)
                     prioridade = "ALTA"
-                    descricao = f"Demanda pedagógica gerada automaticamente para a turma {turma_selecionada} devido alta taxa de evasão de {(1 - media_mensal) * 100}%"
+                    if indice_lacuna is not None:
+                        descricao = f"Demanda pedagógica gerada automaticamente para a turma {turma_selecionada} devido lacuna de aprendizagem: {indice_lacuna * 100:.1f}% dos alunos abaixo da média (limite {config.INDICE_LACUNA_MINIMO * 100:.1f}%)"
+                    else:
+                        media_mensal = kwargs.get("media_mensal", 0)
+                        descricao = f"Demanda pedagógica gerada automaticamente para a turma {turma_selecionada} devido alta taxa de evasão de {(1 - media_mensal) * 100}%"
                     
                 return DemandaPedagogica(id_demanda, descricao, prioridade, solicitante, 
-                                        total_alunos, alunos_abaixo_media,frequencia_turma, alunos_presentes, turma_selecionada)
+                                        total_alunos, alunos_abaixo_media,frequencia_turma, alunos_presentes, turma_selecionada,
+                                        indice_lacuna if indice_lacuna is not None else 0.0,
+                                        kwargs.get("referencia_mensal"))
             else:
                 raise ValueError("Informe uma turma para criar uma demanda!")
             
         elif tipo_demanda.upper() == "INFRAESTRUTURA":
             custo_estimado = kwargs.get("custo_estimado", 0)
             localizacao_demanda = kwargs.get("localizacao_demanda")
-            if custo_estimado > DemandaFactory.config.LIMITE_CUSTO_DEMANDA:
+            if custo_estimado > config.LIMITE_CUSTO_DEMANDA:
                 prioridade = "MAXIMA"
                 if  descricao:  
                     descricao += "[GERADO PELO SISTEMA]: Valor estimado da demanda ultrapassa o valor limite.\nSolicitando autorização do Secretário Municipal para aprovação"
@@ -42,7 +53,7 @@ class DemandaFactory:
                     descricao = "[GERADO PELO SISTEMA]: Valor estimado da demanda ultrapassa o valor limite.\nSolicitando autorização do Secretário Municipal para aprovação"
             nova_demanda = DemandaInfraestrutura(id_demanda, descricao, prioridade, solicitante, custo_estimado, localizacao_demanda)
             if prioridade == "MAXIMA":
-                nova_demanda.atualizar_status("AGUARDANDO LICITACAO")
+                nova_demanda.atualizar_status("AGUARDANDO LICITACAO", "SISTEMA")
 
             return nova_demanda
 
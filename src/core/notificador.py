@@ -0,0 +1,306 @@
+import asyncio
+import json
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+from src.core.saida import obter_logger
+
+"""
+Despachante assíncrono (asyncio) de notificações de demandas críticas.
+Assinantes se registram por papel (GESTOR, SECRETARIO) e, opcionalmente, por município;
+cada assinatura tem uma fila limitada e uma tarefa que entrega as notificações ao seu destino
+(e-mail, SMS, ou os destinos de memória e arquivo usados em testes). Alertas repetidos da mesma
+demanda ainda não entregues são combinados em um só (vale o mais recente). Produtores assíncronos
+aguardam espaço na fila (publicar); o código síncrono das demandas usa notificar, que apenas
+agenda a entrega no laço do notificador, executado em uma thread própria, e nunca bloqueia.
+Uma assinatura criada com o laço já em execução é ativada na hora quando a chamada vem da
+própria thread do laço; vinda de outra thread, a ativação é agendada e, até lá, as notificações
+recebidas ficam guardadas na fila da assinatura.
+"""
+
+logger = obter_logger(__name__)
+
+PAPEIS = ("GESTOR", "SECRETARIO")
+
+Notificacao = namedtuple("Notificacao", ("id_demanda", "id_municipio", "prioridade", "descricao", "emitida_em"))
+
+
+def notificacao_da_demanda(demanda):
+    return Notificacao(demanda.id_demanda, demanda.id_municipio, demanda.prioridade,
+                       demanda.descricao, datetime.now().isoformat())
+
+
+class DestinoMemoria:
+    """Guarda as entregas em uma lista (assinatura, notificacao); usado em testes."""
+    def __init__(self):
+        self.entregues = []
+
+    async def entregar(self, assinatura, notificacao):
+        self.entregues.append((assinatura, notificacao))
+
+
+class DestinoArquivo:
+    """Acrescenta cada entrega como uma linha JSON; a escrita ocorre fora do laço de eventos."""
+    def __init__(self, caminho):
+        self.caminho = caminho
+
+    def _escrever(self, linha):
+        with open(self.caminho, "a", encoding="utf-8") as arquivo:
+            arquivo.write(linha + "\n")
+
+    async def entregar(self, assinatura, notificacao):
+        linha = json.dumps({"papel": assinatura.papel, "id_municipio_assinatura": assinatura.id_municipio,
+                            **notificacao._asdict()}, ensure_ascii=False, default=str)
+        await asyncio.to_thread(self._escrever, linha)
+
+
+class Assinatura:
+    def __init__(self, papel, destino, id_municipio=None, capacidade=100):
+        papel = papel.upper()
+        if papel not in PAPEIS:
+            raise ValueError(f"Erro: Papel inválido: {papel!r} (use GESTOR ou SECRETARIO).")
+        if capacidade < 1:
+            raise ValueError("Erro: A capacidade da fila deve ser positiva.")
+        self.papel = papel
+        self.destino = destino
+        self.id_municipio = id_municipio
+        self.capacidade = capacidade
+
+        # fila combinada: id_demanda -> notificação mais recente, em ordem de chegada
+        self._pendentes = {}
+        self._tem_itens = None
+        self._tem_espaco = None
+        self._ociosa = None
+        self._tarefa = None
+        self._em_entrega = 0
+        self.entregues = 0
+        self.combinadas = 0
+        self.descartadas = 0
+
+    def _preparar(self):
+        """Cria as primitivas asyncio no laço em execução."""
+        self._tem_itens = asyncio.Event()
+        self._tem_espaco = asyncio.Event()
+        self._ociosa = asyncio.Event()
+        if len(self._pendentes) < self.capacidade:
+            self._tem_espaco.set()
+        if self._pendentes:
+            self._tem_itens.set()
+        else:
+            self._ociosa.set()
+
+    @property
+    def ativa(self):
+        return self._tem_itens is not None
+
+    def _enfileirar(self, notificacao):
+        """Retorna True se a notificação foi aceita (nova ou combinada com uma pendente).
+        Antes da ativação, a notificação apenas fica na fila; _preparar sinaliza os eventos."""
+        if notificacao.id_demanda in self._pendentes:
+            self._pendentes[notificacao.id_demanda] = notificacao
+            self.combinadas += 1
+            return True
+        if len(self._pendentes) >= self.capacidade:
+            return False
+        self._pendentes[notificacao.id_demanda] = notificacao
+        if self.ativa:
+            self._ociosa.clear()
+            self._tem_itens.set()
+            if len(self._pendentes) >= self.capacidade:
+                self._tem_espaco.clear()
+        return True
+
+    async def _aguardar(self, evento):
+        """Aguarda o evento; antes da ativação (agendada no laço), apenas cede a vez."""
+        if self.ativa:
+            await getattr(self, evento).wait()
+        else:
+            await asyncio.sleep(0)
+
+    async def _executar(self):
+        while True:
+            await self._tem_itens.wait()
+            id_demanda = next(iter(self._pendentes))
+            notificacao = self._pendentes.pop(id_demanda)
+            if not self._pendentes:
+                self._tem_itens.clear()
+            self._tem_espaco.set()
+            self._em_entrega = 1
+            try:
+                await self.destino.entregar(self, notificacao)
+                self.entregues += 1
+            except Exception:
+                logger.exception("Erro ao entregar notificação da demanda %s", id_demanda)
+            finally:
+                self._em_entrega = 0
+                if not self._pendentes:
+                    self._ociosa.set()
+
+    @property
+    def pendentes(self):
+        """Notificações aguardando na fila ou em entrega."""
+        return len(self._pendentes) + self._em_entrega
+
+    def __repr__(self):
+        return f"Assinatura({self.papel}, municipio={self.id_municipio})"
+
+
+class Notificador:
+    def __init__(self, capacidade=100):
+        self.capacidade = capacidade
+        self._assinaturas = {}
+        self._laco = None
+        self._thread = None
+        self._trava = threading.Lock()
+        self._trava_assinaturas = threading.Lock()
+
+    # -----------
+    # ASSINATURAS
+    # -----------
+
+    def assinar(self, papel, destino, id_municipio=None, capacidade=None):
+        """Registra um assinante do papel informado; sem município, recebe alertas de todos."""
+        assinatura = Assinatura(papel, destino, id_municipio, capacidade or self.capacidade)
+        with self._trava_assinaturas:
+            self._assinaturas.setdefault((assinatura.papel, id_municipio), []).append(assinatura)
+        laco = self._laco
+        if laco is not None:
+            if self._na_thread_do_laco(laco):
+                self._ativar(assinatura)
+            else:
+                laco.call_soon_threadsafe(self._ativar, assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura):
+        with self._trava_assinaturas:
+            self._assinaturas[(assinatura.papel, assinatura.id_municipio)].remove(assinatura)
+        if assinatura._tarefa is not None:
+            self._laco.call_soon_threadsafe(assinatura._tarefa.cancel)
+
+    def assinantes(self, id_municipio, papeis=PAPEIS):
+        """Assinaturas que recebem alertas do município: as do município e as globais."""
+        encontradas = []
+        with self._trava_assinaturas:
+            for papel in papeis:
+                encontradas.extend(self._assinaturas.get((papel, id_municipio), ()))
+                if id_municipio is not None:
+                    encontradas.extend(self._assinaturas.get((papel, None), ()))
+        return encontradas
+
+    # ---------------
+    # LAÇO DE EVENTOS
+    # ---------------
+
+    @staticmethod
+    def _na_thread_do_laco(laco):
+        try:
+            return asyncio.get_running_loop() is laco
+        except RuntimeError:
+            return False
+
+    def _ativar(self, assinatura):
+        """Executado no laço; a assinatura pode já ter sido ativada por iniciar."""
+        if assinatura._tarefa is not None:
+            return
+        assinatura._preparar()
+        assinatura._tarefa = asyncio.get_running_loop().create_task(assinatura._executar())
+
+    async def iniciar(self):
+        """Inicia as tarefas de entrega no laço em execução (uso dentro de uma aplicação asyncio)."""
+        self._laco = asyncio.get_running_loop()
+        for assinatura in self._todas():
+            self._ativar(assinatura)
+
+    def iniciar_em_segundo_plano(self):
+        """Executa o laço do notificador em uma thread própria (uso a partir de código síncrono)."""
+        with self._trava:
+            if self._laco is not None:
+                return
+            pronto = threading.Event()
+
+            def executar():
+                laco = asyncio.new_event_loop()
+                asyncio.set_event_loop(laco)
+                laco.run_until_complete(self.iniciar())
+                pronto.set()
+                laco.run_forever()
+
+            self._thread = threading.Thread(target=executar, name="notificador", daemon=True)
+            self._thread.start()
+            pronto.wait()
+
+    async def aguardar_entregas(self):
+        """Aguarda até que todas as filas estejam vazias (sinalizado por cada assinatura ao esvaziar)."""
+        while True:
+            pendentes = [assinatura for assinatura in self._todas() if assinatura.pendentes]
+            if not pendentes:
+                return
+            for assinatura in pendentes:
+                await assinatura._aguardar("_ociosa")
+
+    async def encerrar(self):
+        """Entrega o que está pendente e cancela as tarefas de entrega."""
+        await self.aguardar_entregas()
+        for assinatura in self._todas():
+            if assinatura._tarefa is not None:
+                assinatura._tarefa.cancel()
+                assinatura._tarefa = None
+
+    def encerrar_segundo_plano(self, timeout=5.0):
+        if self._thread is None:
+            return
+        laco = self._laco
+        asyncio.run_coroutine_threadsafe(self.encerrar(), laco).result(timeout)
+        laco.call_soon_threadsafe(laco.stop)
+        self._thread.join(timeout)
+        self._thread = None
+        self._laco = None
+
+    def _todas(self):
+        with self._trava_assinaturas:
+            return [assinatura for assinaturas in self._assinaturas.values() for assinatura in assinaturas]
+
+    # ----------
+    # PUBLICAÇÃO
+    # ----------
+
+    async def publicar(self, notificacao, papeis=PAPEIS):
+        """Enfileira a notificação para os assinantes, aguardando espaço nas filas cheias."""
+        if self._laco is None:
+            await self.iniciar()
+        for assinatura in self.assinantes(notificacao.id_municipio, papeis):
+            while not assinatura._enfileirar(notificacao):
+                await assinatura._aguardar("_tem_espaco")
+
+    def _publicar_sem_bloquear(self, notificacao, papeis):
+        for assinatura in self.assinantes(notificacao.id_municipio, papeis):
+            if not assinatura._enfileirar(notificacao):
+                assinatura.descartadas += 1
+                logger.warning("Fila de notificações cheia (%r): alerta da demanda %s descartado.",
+                               assinatura, notificacao.id_demanda)
+
+    def notificar(self, demanda, papeis=PAPEIS):
+        """Agenda o alerta da demanda sem bloquear quem chamou. Retorna False se não há assinantes."""
+        notificacao = notificacao_da_demanda(demanda)
+        if not self.assinantes(notificacao.id_municipio, papeis):
+            return False
+        if self._laco is None:
+            self.iniciar_em_segundo_plano()
+        self._laco.call_soon_threadsafe(self._publicar_sem_bloquear, notificacao, papeis)
+        return True
+
+
+_notificador_padrao = Notificador()
+
+
+def obter_notificador():
+    """Notificador usado por Demanda.emitir_notificacao_critica."""
+    return _notificador_padrao
+
+
+def configurar_notificador(notificador):
+    """Substitui o notificador em uso. Retorna o novo notificador."""
+    global _notificador_padrao
+    _notificador_padrao = notificador
+    return notificador
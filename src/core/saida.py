@@ -0,0 +1,113 @@
+import logging
+import sys
+import threading
+from contextlib import contextmanager
+
+"""
+Camada central de saída e eventos do sistema, baseada no módulo logging.
+Os módulos obtêm um logger com obter_logger(__name__) e emitem mensagens com formatação
+preguiçosa (logger.info("Turma %s", id_turma)): o texto só é montado quando o nível está
+habilitado. No modo interativo (padrão, nível INFO) as mensagens vão para o console, como os
+antigos print; no modo silencioso/lote as mensagens da thread que entrou no modo são
+descartadas por um filtro dos loggers, antes de o texto ser montado, sem alterar o nível
+global nem a saída das demais threads. Ouvintes podem ser registrados para receber os eventos.
+"""
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+AVISO = logging.WARNING
+ERRO = logging.ERROR
+SILENCIOSO = logging.CRITICAL + 10
+
+RAIZ = "src"
+
+_logger_raiz = logging.getLogger(RAIZ)
+
+# threads em modo_silencioso (ident → blocos abertos)
+_threads_silenciosas = {}
+_trava_silencio = threading.Lock()
+
+
+class _FiltroSilencio(logging.Filter):
+    """Descarta os registros emitidos por threads em modo_silencioso."""
+    def filter(self, registro):
+        return registro.thread not in _threads_silenciosas
+
+
+_filtro_silencio = _FiltroSilencio()
+
+
+class _SaidaConsole(logging.Handler):
+    """Escreve a mensagem no sys.stdout vigente, sem prefixos, como o print."""
+    def emit(self, registro):
+        try:
+            print(self.format(registro), file=sys.stdout)
+        except Exception:
+            self.handleError(registro)
+
+
+class _Ouvinte(logging.Handler):
+    def __init__(self, funcao, nivel):
+        super().__init__(nivel)
+        self.funcao = funcao
+
+    def emit(self, registro):
+        self.funcao(registro)
+
+
+_console = _SaidaConsole()
+_console.setFormatter(logging.Formatter("%(message)s"))
+_logger_raiz.addHandler(_console)
+_logger_raiz.setLevel(INFO)
+_logger_raiz.propagate = False
+_logger_raiz.addFilter(_filtro_silencio)
+
+
+def obter_logger(nome):
+    """Logger do módulo informado (use __name__), subordinado à saída central."""
+    logger = logging.getLogger(nome if nome.startswith(RAIZ) else f"{RAIZ}.{nome}")
+    # o filtro fica no próprio logger: o registro é descartado antes de chegar a qualquer handler
+    if _filtro_silencio not in logger.filters:
+        logger.addFilter(_filtro_silencio)
+    return logger
+
+
+def configurar_saida(nivel=INFO, console=True):
+    """Define o nível global e se as mensagens são exibidas no console."""
+    _logger_raiz.setLevel(nivel)
+    if console and _console not in _logger_raiz.handlers:
+        _logger_raiz.addHandler(_console)
+    elif not console and _console in _logger_raiz.handlers:
+        _logger_raiz.removeHandler(_console)
+
+
+def nivel_atual():
+    return _logger_raiz.level
+
+
+@contextmanager
+def modo_silencioso():
+    """Suprime as mensagens emitidas pela thread atual durante o bloco (processamento em lote).
+    As demais threads seguem com a saída normal; blocos aninhados são contados por thread."""
+    ident = threading.get_ident()
+    with _trava_silencio:
+        _threads_silenciosas[ident] = _threads_silenciosas.get(ident, 0) + 1
+    try:
+        yield
+    finally:
+        with _trava_silencio:
+            if _threads_silenciosas[ident] == 1:
+                del _threads_silenciosas[ident]
+            else:
+                _threads_silenciosas[ident] -= 1
+
+
+def adicionar_ouvinte(funcao, nivel=DEBUG):
+    """Registra uma função que recebe cada logging.LogRecord emitido. Retorna o handler criado."""
+    ouvinte = _Ouvinte(funcao, nivel)
+    _logger_raiz.addHandler(ouvinte)
+    return ouvinte
+
+
+def remover_ouvinte(ouvinte):
+    _logger_raiz.removeHandler(ouvinte)
@@ -0,0 +1,486 @@
+import re
+import threading
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+
+from src.database.arquivo_frequencia import obter_catalogo
+
+"""
+Repositório em memória que centraliza municípios, escolas, turmas, usuários e demandas,
+seguindo o Pattern Repository. Cada entidade é guardada em índices por identificador
+(dicionários), de forma que buscas e verificações de duplicidade são O(1) mesmo com o
+volume de uma rede estadual. Índices secundários agrupam escolas por município, turmas
+por escola e demandas por status e por município; o índice por status acompanha cada
+Demanda.atualizar_status por um ouvinte registrado na própria demanda.
+Opcionalmente, um backend de persistência (ex.: PersistenciaSQLite) pode ser conectado:
+salvar() grava o conteúdo em memória e as buscas por itens ausentes carregam do backend
+apenas a entidade pedida, sem trazer diários e frequências de toda a rede. Diários e frequências
+são recarregados a partir da primeira posição ainda não arquivada no catálogo de anos encerrados.
+"""
+class RepositorioGeral:
+    def __init__(self, persistencia=None, motor_notas=None):
+        self.persistencia = persistencia
+        self._motor_notas = motor_notas
+        self._municipios = {}
+        self._escolas = {}
+        self._turmas = {}
+        self._demandas = {}
+
+        self._usuarios_por_cpf = {}
+        self._usuarios_por_email = {}
+        self._alunos_por_matricula = {}
+        self._professores_por_registro = {}
+
+        self._escolas_por_municipio = {}
+        self._turmas_por_escola = {}
+        self._demandas_por_status = {}
+        self._demandas_por_municipio = {}
+        self._indexacao_demandas = {}
+        self._trava_demandas = threading.Lock()
+        self._diarios_restaurados = set()
+
+    # ----------
+    # MUNICÍPIOS
+    # ----------
+
+    def adicionar_municipio(self, municipio):
+        """Cadastra um município, impedindo ids duplicados"""
+        if municipio.id_municipio in self._municipios:
+            raise ValueError(f"Erro: Município {municipio.id_municipio} já cadastrado!")
+        self._municipios[municipio.id_municipio] = municipio
+        self._escolas_por_municipio.setdefault(municipio.id_municipio, {})
+
+    def buscar_municipio(self, id_municipio):
+        municipio = self._municipios.get(id_municipio)
+        if municipio is None and self.persistencia is not None:
+            municipio = self.carregar_municipio(id_municipio)
+        return municipio
+
+    def listar_municipios(self):
+        return list(self._municipios.values())
+
+    # --------
+    # ESCOLAS
+    # --------
+
+    def adicionar_escola(self, escola):
+        """Cadastra uma escola e a indexa pelo município em que está situada"""
+        if escola.id_escola in self._escolas:
+            raise ValueError(f"Erro: Escola {escola.id_escola} já cadastrada!")
+        self._escolas[escola.id_escola] = escola
+        self._escolas_por_municipio.setdefault(escola.id_municipio, {})[escola.id_escola] = escola
+        self._turmas_por_escola.setdefault(escola.id_escola, {})
+
+    def buscar_escola(self, id_escola):
+        escola = self._escolas.get(id_escola)
+        if escola is None and self.persistencia is not None:
+            dados = self.persistencia.ler_escola(id_escola)
+            if dados is not None:
+                self.carregar_municipio(dados["id_municipio"])
+                escola = self._escolas.get(id_escola)
+        return escola
+
+    def listar_escolas(self):
+        return list(self._escolas.values())
+
+    def escolas_do_municipio(self, id_municipio):
+        return list(self._escolas_por_municipio.get(id_municipio, {}).values())
+
+    # ------
+    # TURMAS
+    # ------
+
+    def adicionar_turma(self, turma):
+        """Cadastra uma turma e a indexa pela escola a que pertence"""
+        if turma.id_turma in self._turmas:
+            raise ValueError(f"Erro: Turma {turma.id_turma} já cadastrada!")
+        self._turmas[turma.id_turma] = turma
+        self._turmas_por_escola.setdefault(turma.id_escola, {})[turma.id_turma] = turma
+
+    def buscar_turma(self, id_turma):
+        turma = self._turmas.get(id_turma)
+        if turma is None and self.persistencia is not None:
+            dados = self.persistencia.ler_turma(id_turma)
+            if dados is not None and self.buscar_escola(dados["id_escola"]) is not None:
+                turma = self._turmas.get(id_turma)
+        return turma
+
+    def listar_turmas(self):
+        return list(self._turmas.values())
+
+    def turmas_da_escola(self, id_escola):
+        return list(self._turmas_por_escola.get(id_escola, {}).values())
+
+    # --------
+    # USUÁRIOS
+    # --------
+
+    def adicionar_usuario(self, usuario):
+        """Cadastra um usuário, impedindo CPF, email, matrícula ou registro funcional repetidos"""
+        if usuario.cpf in self._usuarios_por_cpf:
+            raise ValueError(f"Erro: Já existe um usuário cadastrado com o CPF {usuario.cpf}!")
+        if usuario.email in self._usuarios_por_email:
+            raise ValueError(f"Erro: Já existe um usuário cadastrado com o email {usuario.email}!")
+
+        id_matricula = getattr(usuario, 'id_matricula', None)
+        if id_matricula is not None and id_matricula in self._alunos_por_matricula:
+            raise ValueError(f"Erro: Matrícula {id_matricula} já cadastrada!")
+
+        registro_funcional = getattr(usuario, 'registro_funcional', None)
+        if registro_funcional is not None and registro_funcional in self._professores_por_registro:
+            raise ValueError(f"Erro: Registro funcional {registro_funcional} já cadastrado!")
+
+        self._usuarios_por_cpf[usuario.cpf] = usuario
+        self._usuarios_por_email[usuario.email] = usuario
+        if id_matricula is not None:
+            self._alunos_por_matricula[id_matricula] = usuario
+        if registro_funcional is not None:
+            self._professores_por_registro[registro_funcional] = usuario
+
+    def atualizar_email(self, usuario, novo_email):
+        """Troca o email de um usuário cadastrado, mantendo o índice por email sem repetições"""
+        anterior = usuario.email
+        usuario.email = novo_email
+        if usuario.email == anterior:
+            return
+        if usuario.email in self._usuarios_por_email:
+            email, usuario.email = usuario.email, anterior
+            raise ValueError(f"Erro: Já existe um usuário cadastrado com o email {email}!")
+        if self._usuarios_por_email.get(anterior) is usuario:
+            del self._usuarios_por_email[anterior]
+        self._usuarios_por_email[usuario.email] = usuario
+
+    def listar_usuarios(self):
+        return list(self._usuarios_por_cpf.values())
+
+    def listar_alunos(self):
+        return list(self._alunos_por_matricula.values())
+
+    def buscar_usuario_por_cpf(self, cpf):
+        return self._resolver_usuario(re.sub(r'\D', '', cpf))
+
+    def buscar_usuario_por_email(self, email):
+        return self._usuarios_por_email.get(email.lower().strip())
+
+    def buscar_aluno(self, id_matricula):
+        id_matricula = id_matricula.strip().upper()
+        aluno = self._alunos_por_matricula.get(id_matricula)
+        if aluno is None and self.persistencia is not None:
+            dados = self.persistencia.ler_aluno(id_matricula)
+            if dados is not None:
+                turma = self.buscar_turma(dados["id_turma"]) if dados["id_turma"] else None
+                if turma is not None:
+                    self.carregar_alunos_da_turma(turma.id_turma)
+                    aluno = self._alunos_por_matricula.get(id_matricula)
+                else:
+                    aluno = self._construir_aluno(dados, None)
+        return aluno
+
+    def buscar_professor(self, registro_funcional):
+        registro_funcional = registro_funcional.strip().upper()
+        professor = self._professores_por_registro.get(registro_funcional)
+        if professor is None and self.persistencia is not None:
+            dados = self.persistencia.ler_professor(registro_funcional)
+            if dados is not None:
+                # a escola vem antes, para o professor ser ligado ao objeto Escola (e ao município)
+                if dados.get("id_escola"):
+                    self.buscar_escola(dados["id_escola"])
+                professor = self._professores_por_registro.get(registro_funcional) or self._construir_professor(dados)
+        return professor
+
+    # --------
+    # DEMANDAS
+    # --------
+
+    def resolver_municipio_demanda(self, demanda):
+        """Descobre o município da demanda pelo solicitante ou, nas pedagógicas, pela turma alvo"""
+        id_municipio = demanda.id_municipio
+        if id_municipio is not None:
+            return id_municipio
+
+        escola = getattr(demanda.solicitante, 'escola_associada', None)
+        if hasattr(escola, 'id_municipio'):
+            return escola.id_municipio
+
+        turma = getattr(demanda, 'turma_alvo', None)
+        if turma is not None:
+            escola = self._escolas.get(turma.id_escola)
+            if escola is not None:
+                return escola.id_municipio
+        return None
+
+    def adicionar_demanda(self, demanda, id_municipio=None):
+        """Cadastra uma demanda e a indexa por status e por município.
+        O município pode ser informado quando não for possível deduzi-lo da demanda."""
+        if demanda.id_demanda in self._demandas:
+            raise ValueError(f"Erro: Demanda {demanda.id_demanda} já cadastrada!")
+        if id_municipio is None:
+            id_municipio = self.resolver_municipio_demanda(demanda)
+        if id_municipio is not None and demanda.id_municipio is None:
+            demanda.vincular_municipio(id_municipio)
+
+        self._demandas[demanda.id_demanda] = demanda
+        self._demandas_por_status.setdefault(demanda.status, {})[demanda.id_demanda] = demanda
+        self._demandas_por_municipio.setdefault(id_municipio, {})[demanda.id_demanda] = demanda
+        self._indexacao_demandas[demanda.id_demanda] = (demanda.status, id_municipio)
+        demanda.adicionar_ouvinte_status(self._status_alterado)
+
+    def _status_alterado(self, demanda, status_anterior):
+        """Ouvinte de Demanda.atualizar_status: mantém o índice por status em dia"""
+        if demanda.id_demanda in self._indexacao_demandas:
+            self.reindexar_demanda(demanda)
+
+    def buscar_demanda(self, id_demanda):
+        demanda = self._demandas.get(id_demanda)
+        if demanda is None and self.persistencia is not None:
+            dados = self.persistencia.ler_demanda(id_demanda)
+            if dados is not None:
+                demanda = self._construir_demanda(dados, self.persistencia.municipio_da_demanda(id_demanda))
+        return demanda
+
+    def municipio_da_demanda(self, id_demanda):
+        indexacao = self._indexacao_demandas.get(id_demanda)
+        return indexacao[1] if indexacao else None
+
+    def reindexar_demanda(self, demanda):
+        """Atualiza o índice de status da demanda (chamado a cada demanda.atualizar_status)"""
+        # demandas de municípios diferentes podem mudar de status em paralelo (ProcessadorDemandas)
+        with self._trava_demandas:
+            status_indexado, id_municipio = self._indexacao_demandas[demanda.id_demanda]
+            if status_indexado == demanda.status:
+                return
+
+            por_status = self._demandas_por_status[status_indexado]
+            del por_status[demanda.id_demanda]
+            if not por_status:
+                del self._demandas_por_status[status_indexado]
+
+            self._demandas_por_status.setdefault(demanda.status, {})[demanda.id_demanda] = demanda
+            self._indexacao_demandas[demanda.id_demanda] = (demanda.status, id_municipio)
+
+    def atualizar_status_demanda(self, id_demanda, novo_status, usuario=None):
+        """Altera o status da demanda; o índice por status é atualizado pelo ouvinte da demanda"""
+        demanda = self._demandas.get(id_demanda)
+        if demanda is None:
+            raise ValueError(f"Erro: Demanda {id_demanda} não encontrada!")
+        demanda.atualizar_status(novo_status, usuario)
+
+    def remover_demanda(self, id_demanda):
+        demanda = self._demandas.pop(id_demanda, None)
+        if demanda is None:
+            return None
+
+        demanda.remover_ouvinte_status(self._status_alterado)
+        status_indexado, id_municipio = self._indexacao_demandas.pop(id_demanda)
+        for indice, chave in ((self._demandas_por_status, status_indexado),
+                              (self._demandas_por_municipio, id_municipio)):
+            grupo = indice[chave]
+            del grupo[id_demanda]
+            if not grupo:
+                del indice[chave]
+        return demanda
+
+    def listar_demandas(self):
+        return list(self._demandas.values())
+
+    def demandas_por_status(self, status):
+        return list(self._demandas_por_status.get(status.upper(), {}).values())
+
+    def demandas_em_aberto(self):
+        """Demandas com status fora de Demanda.STATUS_FINAIS, lidas pelo índice por status"""
+        from src.models.demanda import Demanda
+
+        with self._trava_demandas:
+            grupos = [grupo for status, grupo in self._demandas_por_status.items()
+                      if status not in Demanda.STATUS_FINAIS]
+            return [demanda for grupo in grupos for demanda in grupo.values()]
+
+    def demandas_do_municipio(self, id_municipio, status=None):
+        demandas = self._demandas_por_municipio.get(id_municipio, {})
+        if status is None:
+            return list(demandas.values())
+
+        status = status.upper()
+        por_status = self._demandas_por_status.get(status, {})
+        # percorre o menor dos dois grupos para filtrar pelo outro índice
+        if len(por_status) < len(demandas):
+            return [d for id_d, d in por_status.items() if id_d in demandas]
+        return [d for id_d, d in demandas.items() if self._indexacao_demandas[id_d][0] == status]
+
+    # ------------
+    # PERSISTÊNCIA
+    # ------------
+
+    @property
+    def motor_notas(self):
+        """Motor de notas (RN03) cujas avaliações são gravadas e restauradas com as turmas
+        (padrão: o motor usado por Professor.lancar_nota)"""
+        if self._motor_notas is None:
+            from src.services.motor_notas import obter_motor_notas
+            return obter_motor_notas()
+        return self._motor_notas
+
+    def salvar(self):
+        """Grava o conteúdo em memória no backend de persistência conectado"""
+        if self.persistencia is None:
+            raise ValueError("Erro: Nenhum backend de persistência conectado ao repositório!")
+        self.persistencia.salvar_repositorio(self)
+
+    def carregar_municipio(self, id_municipio):
+        """Carrega o município com suas escolas, turmas (com o diário de classe) e gestores.
+        Alunos, professores e frequências ficam para carregar_alunos_da_turma."""
+        from src.models.municipio import Municipio
+        from src.models.escola import Escola
+        from src.models.turma import Turma
+
+        if id_municipio in self._municipios:
+            return self._municipios[id_municipio]
+        dados = self.persistencia.ler_municipio(id_municipio)
+        if dados is None:
+            return None
+
+        municipio = Municipio(dados["nome"], dados["id_municipio"], dados["estado"],
+                              dados["verba_disponivel_municipio"])
+        self.adicionar_municipio(municipio)
+
+        for dados_escola in self.persistencia.iterar_escolas_do_municipio(id_municipio):
+            escola = Escola(dados_escola["nome"], dados_escola["endereco"], dados_escola["id_escola"], None,
+                            dados_escola["verba_disponivel_escola"], dados_escola["id_municipio"])
+            self.adicionar_escola(escola)
+            municipio.cadastrar_escola(escola)
+
+            for dados_turma in self.persistencia.iterar_turmas_da_escola(escola.id_escola):
+                turma = Turma(dados_turma["id_turma"], dados_turma["nome_truma"],
+                              dados_turma["ano_letivo"], dados_turma["id_escola"])
+                self.adicionar_turma(turma)
+                escola.adicionar_turma(turma)
+                self._restaurar_diario(turma)
+
+        for dados_gestor in self.persistencia.iterar_gestores_do_municipio(id_municipio):
+            self._construir_gestor(dados_gestor)
+        return municipio
+
+    def carregar_alunos_da_turma(self, id_turma):
+        """Carrega professores, diário de classe, alunos e frequências de uma turma"""
+        turma = self.buscar_turma(id_turma)
+        if turma is None:
+            return None
+
+        for dados in self.persistencia.iterar_professores_da_turma(id_turma):
+            professor = self._professores_por_registro.get(dados["registro_funcional"])
+            if professor is None:
+                professor = self._construir_professor(dados)
+            turma.adicionar_professor(professor)
+
+        self._restaurar_diario(turma)
+
+        for dados in self.persistencia.iterar_alunos_da_turma(id_turma):
+            if dados["id_matricula"] not in self._alunos_por_matricula:
+                self._construir_aluno(dados, turma)
+        return turma
+
+    def _restaurar_diario(self, turma):
+        """Recarrega o diário e as avaliações persistidos na primeira carga da turma, antes de
+        qualquer aula ou nota nova, para que as posições em memória continuem alinhadas às gravadas"""
+        if turma.id_turma in self._diarios_restaurados:
+            return
+        self._diarios_restaurados.add(turma.id_turma)
+        # aulas de anos arquivados continuam no banco, mas são consultadas no catálogo
+        catalogo = obter_catalogo()
+        arquivadas = catalogo.aulas_arquivadas(turma.id_turma) if catalogo is not None else 0
+        turma.restaurar_diario(self.persistencia.iterar_diario(turma.id_turma, arquivadas), arquivadas)
+
+        escola = self._escolas.get(turma.id_escola)
+        id_municipio = escola.id_municipio if escola is not None else None
+        for disciplina, avaliacoes in groupby(self.persistencia.iterar_avaliacoes(turma.id_turma), itemgetter(0)):
+            self.motor_notas.restaurar(turma, disciplina, ((id_matricula, nota) for _, id_matricula, nota in avaliacoes),
+                                       id_municipio)
+
+    def _construir_aluno(self, dados, turma):
+        from src.models.aluno import Aluno
+
+        aluno = Aluno(dados["nome"], dados["cpf"], dados["email"], dados["senha"], dados["telefone"],
+                      dados["data_nascimento"], dados["id_matricula"], status=dados["status"])
+        for disciplina, nota in dados.get("notas", {}).items():
+            aluno.registrar_nota(disciplina, nota)
+        catalogo = obter_catalogo()
+        arquivados = catalogo.registros_arquivados(aluno.id_matricula) if catalogo is not None else 0
+        if arquivados:
+            aluno.presenca.iniciar_em(arquivados)
+        aluno.registrar_presencas_em_lote(self.persistencia.iterar_frequencia(aluno.id_matricula,
+                                                                             a_partir_de=arquivados))
+        self.adicionar_usuario(aluno)
+        if turma is not None:
+            turma.adicionar_aluno(aluno)
+        return aluno
+
+    def _construir_professor(self, dados):
+        from src.models.professor import Professor
+
+        escola = self._escolas.get(dados["id_escola"], dados["id_escola"])
+        professor = Professor(dados["nome"], dados["cpf"], dados["email"], dados["senha"], dados["telefone"],
+                              dados["data_nascimento"], dados["registro_funcional"], escola,
+                              dados["titulacao"], dados["area_atuacao"], dados["salario"], status=dados["status"])
+        self.adicionar_usuario(professor)
+        return professor
+
+    def _construir_gestor(self, dados):
+        from src.models.gestor import Gestor
+
+        escola = self._escolas[dados["id_escola"]]
+        gestor = Gestor(dados["nome"], dados["cpf"], dados["email"], dados["senha"], dados["telefone"],
+                        dados["data_nascimento"], escola, dados["verba_escolar_total"], status=dados["status"])
+        escola.gestor_atual = gestor
+        self.adicionar_usuario(gestor)
+        return gestor
+
+    def _construir_secretario(self, dados):
+        from src.models.secretario import Secretario
+
+        municipio = self.buscar_municipio(dados["id_municipio"])
+        secretario = Secretario(dados["nome"], dados["cpf"], dados["email"], dados["senha"], dados["telefone"],
+                                dados["data_nascimento"], municipio, dados["verba_municipal_total"],
+                                dados["departamento"], status=dados["status"])
+        self.adicionar_usuario(secretario)
+        return secretario
+
+    def _resolver_usuario(self, cpf):
+        usuario = self._usuarios_por_cpf.get(cpf)
+        if usuario is not None or self.persistencia is None:
+            return usuario
+
+        dados = self.persistencia.ler_usuario_por_cpf(cpf)
+        if dados is None:
+            return None
+        if dados["tipo"] == "Aluno":
+            return self.buscar_aluno(dados["id_matricula"])
+        if dados["tipo"] == "Professor":
+            return self.buscar_professor(dados["registro_funcional"])
+        if dados["tipo"] == "Gestor":
+            self.buscar_escola(dados["id_escola"])
+            return self._usuarios_por_cpf.get(cpf)
+        if dados["tipo"] == "Secretario":
+            return self._construir_secretario(dados)
+        return None
+
+    def _construir_demanda(self, dados, id_municipio):
+        from src.models.demanda_infraestrutura import DemandaInfraestrutura
+        from src.models.demanda_pedagogica import DemandaPedagogica
+
+        solicitante = self._resolver_usuario(dados["solicitante"]) or dados["solicitante"]
+        if dados["tipo"] == "DemandaInfraestrutura":
+            demanda = DemandaInfraestrutura(dados["id_demanda"], dados["descricao"], dados["prioridade"], solicitante,
+                                            dados["custo_estimado"], dados["localizacao_demanda"])
+        else:
+            turma = self.buscar_turma(dados["id_turma"]) if dados["id_turma"] else None
+            demanda = DemandaPedagogica(dados["id_demanda"], dados["descricao"], dados["prioridade"], solicitante,
+                                        dados["total_alunos"], dados["alunos_abaixo_media"], dados["frequencia_turma"],
+                                        dados["alunos_presentes"], turma, dados["indice_lacuna"],
+                                        dados.get("referencia_mensal"))
+
+        # o status e a data de criação são restaurados sem passar por atualizar_status
+        demanda._Demanda__status = dados["status"]
+        demanda._criado_em = datetime.fromisoformat(dados["criado_em"])
+        self.adicionar_demanda(demanda, id_municipio)
+        return demanda
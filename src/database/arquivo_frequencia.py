@@ -0,0 +1,404 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+"""
+Arquivo binário da frequência de anos letivos encerrados, lido por mmap.
+Cada ano vira um arquivo de largura fixa (frequencia_<ano>.bin):
+  - cabeçalho: assinatura, versão, ano, quantidade de turmas e de alunos e a posição dos índices;
+  - índice de turmas (id_turma, posição, aulas) e índice de alunos (id_matricula, id_turma,
+    posição, registros, presenças), ordenados pelo id para busca binária direto no arquivo;
+  - dados: as datas (ordinais uint32) das aulas de cada turma e, para cada aluno, as datas dos
+    registros seguidas das presenças acumuladas (uint32).
+Todos os inteiros são little-endian. As consultas fazem bisect sobre visões (memoryview) do mapa,
+sem trazer o ano para o heap. O CatalogoArquivos arquiva um ano a partir dos objetos vivos,
+retira esse trecho da memória (Turma.descartar_ate) e responde às consultas por período e por
+mês usadas por HistoricoFrequencia e Turma (que o recebem por configurar_catalogo), que somam a
+parte arquivada à parte viva. As cargas da persistência pulam as posições já arquivadas
+(aulas_arquivadas, registros_arquivados), para que nada seja contado duas vezes após reiniciar.
+"""
+
+ASSINATURA = b"SFAF"
+VERSAO = 1
+LARGURA_ID = 32
+
+_CABECALHO = struct.Struct("<4sHHIIQQ")
+_ENTRADA_TURMA = struct.Struct(f"<{LARGURA_ID}sQI4x")
+_ENTRADA_ALUNO = struct.Struct(f"<{LARGURA_ID}s{LARGURA_ID}sQII")
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _chave(identificador):
+    chave = str(identificador).encode("utf-8")
+    if len(chave) > LARGURA_ID:
+        raise ValueError(f"Erro: Identificador maior que {LARGURA_ID} bytes não cabe no arquivo: {identificador!r}")
+    return chave.ljust(LARGURA_ID, b"\0")
+
+
+def _texto(chave):
+    return chave.rstrip(b"\0").decode("utf-8")
+
+
+def _u32(valores):
+    dados = array("I", valores)
+    if not _LITTLE_ENDIAN:
+        dados.byteswap()
+    return dados.tobytes()
+
+
+def _limites_mes(ano, mes):
+    inicio = date(ano, mes, 1)
+    fim = date(ano + 1, 1, 1) if mes == 12 else date(ano, mes + 1, 1)
+    return inicio.toordinal(), fim.toordinal() - 1
+
+
+def escrever_arquivo_anual(caminho, ano, aulas_por_turma, registros_por_aluno):
+    """Grava o arquivo do ano.
+    aulas_por_turma: {id_turma: [ordinais]}; registros_por_aluno: {id_matricula: (id_turma, [(ordinal, presente)])}.
+    A gravação é atômica (arquivo temporário e os.replace)."""
+    turmas = sorted((_chave(id_turma), sorted(ordinais)) for id_turma, ordinais in aulas_por_turma.items())
+    alunos = sorted((_chave(id_matricula), _chave(id_turma or ""), sorted(registros))
+                    for id_matricula, (id_turma, registros) in registros_por_aluno.items())
+
+    indice_turmas = _CABECALHO.size
+    indice_alunos = indice_turmas + len(turmas) * _ENTRADA_TURMA.size
+    posicao = indice_alunos + len(alunos) * _ENTRADA_ALUNO.size
+    posicao += -posicao % 8
+
+    entradas, blocos = [], []
+    for chave, ordinais in turmas:
+        entradas.append(_ENTRADA_TURMA.pack(chave, posicao, len(ordinais)))
+        blocos.append(_u32(ordinais))
+        posicao += 4 * len(ordinais)
+    for chave, chave_turma, registros in alunos:
+        acumulados = [0]
+        for _, presente in registros:
+            acumulados.append(acumulados[-1] + (1 if presente else 0))
+        entradas.append(_ENTRADA_ALUNO.pack(chave, chave_turma, posicao, len(registros), acumulados[-1]))
+        blocos.append(_u32(ordinal for ordinal, _ in registros))
+        blocos.append(_u32(acumulados))
+        posicao += 4 * (2 * len(registros) + 1)
+
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(_CABECALHO.pack(ASSINATURA, VERSAO, ano, len(turmas), len(alunos), indice_turmas, indice_alunos))
+        arquivo.writelines(entradas)
+        arquivo.write(bytes(-arquivo.tell() % 8))
+        arquivo.writelines(blocos)
+    os.replace(temporario, caminho)
+
+
+class ArquivoFrequenciaAnual:
+    """Leitura, por mmap, do arquivo de frequência de um ano letivo."""
+    def __init__(self, caminho):
+        self.caminho = caminho
+        with open(caminho, "rb") as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        assinatura, versao, self.ano, self._qtd_turmas, self._qtd_alunos, self._indice_turmas, self._indice_alunos = \
+            _CABECALHO.unpack_from(self._mapa, 0)
+        if assinatura != ASSINATURA or versao != VERSAO:
+            self._mapa.close()
+            raise ValueError(f"Erro: {caminho} não é um arquivo de frequência válido (versão {VERSAO}).")
+
+    def fechar(self):
+        self._mapa.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    # -------
+    # ÍNDICES
+    # -------
+
+    def _buscar(self, inicio_indice, quantidade, estrutura, identificador):
+        chave = _chave(identificador)
+        mapa = self._mapa
+        baixo, alto = 0, quantidade
+        while baixo < alto:
+            meio = (baixo + alto) // 2
+            posicao = inicio_indice + meio * estrutura.size
+            atual = mapa[posicao:posicao + LARGURA_ID]
+            if atual < chave:
+                baixo = meio + 1
+            elif atual > chave:
+                alto = meio
+            else:
+                return estrutura.unpack_from(mapa, posicao)
+        return None
+
+    def _entrada_turma(self, id_turma):
+        return self._buscar(self._indice_turmas, self._qtd_turmas, _ENTRADA_TURMA, id_turma)
+
+    def _entrada_aluno(self, id_matricula):
+        return self._buscar(self._indice_alunos, self._qtd_alunos, _ENTRADA_ALUNO, id_matricula)
+
+    def _iterar_indice(self, inicio_indice, quantidade, estrutura):
+        for i in range(quantidade):
+            yield estrutura.unpack_from(self._mapa, inicio_indice + i * estrutura.size)
+
+    def turmas(self):
+        return [_texto(entrada[0]) for entrada in self._iterar_indice(self._indice_turmas, self._qtd_turmas, _ENTRADA_TURMA)]
+
+    def alunos(self):
+        return [_texto(entrada[0]) for entrada in self._iterar_indice(self._indice_alunos, self._qtd_alunos, _ENTRADA_ALUNO)]
+
+    def __contains__(self, id_matricula):
+        return self._entrada_aluno(id_matricula) is not None
+
+    # ---------
+    # CONSULTAS
+    # ---------
+
+    def _contar(self, posicao, quantidade, inicio, fim, com_acumulados):
+        """Bisect sobre as datas do bloco; retorna (registros, presencas) no intervalo de ordinais."""
+        if quantidade == 0:
+            return 0, 0
+        fim_bloco = posicao + 4 * (2 * quantidade + 1 if com_acumulados else quantidade)
+        if _LITTLE_ENDIAN:
+            with memoryview(self._mapa) as visao, visao[posicao:fim_bloco] as bloco, bloco.cast("I") as valores:
+                return self._contar_valores(valores, quantidade, inicio, fim, com_acumulados)
+        valores = array("I", self._mapa[posicao:fim_bloco])
+        valores.byteswap()
+        return self._contar_valores(valores, quantidade, inicio, fim, com_acumulados)
+
+    @staticmethod
+    def _contar_valores(valores, quantidade, inicio, fim, com_acumulados):
+        esquerda = bisect_left(valores, inicio, 0, quantidade)
+        direita = bisect_right(valores, fim, 0, quantidade)
+        if direita <= esquerda:
+            return 0, 0
+        if not com_acumulados:
+            return direita - esquerda, 0
+        return direita - esquerda, valores[quantidade + direita] - valores[quantidade + esquerda]
+
+    def contar_aulas(self, id_turma, inicio, fim):
+        """Aulas da turma com ordinal entre inicio e fim (inclusive)"""
+        entrada = self._entrada_turma(id_turma)
+        if entrada is None:
+            return 0
+        return self._contar(entrada[1], entrada[2], inicio, fim, False)[0]
+
+    def contar_presencas(self, id_matricula, inicio, fim):
+        """(registros, presencas) do aluno com ordinal entre inicio e fim (inclusive)"""
+        entrada = self._entrada_aluno(id_matricula)
+        if entrada is None:
+            return 0, 0
+        return self._contar(entrada[2], entrada[3], inicio, fim, True)
+
+    def aulas_no_mes(self, id_turma, mes):
+        return self.contar_aulas(id_turma, *_limites_mes(self.ano, mes))
+
+    def quantidade_aulas(self, id_turma):
+        entrada = self._entrada_turma(id_turma)
+        return entrada[2] if entrada is not None else 0
+
+    def quantidade_registros(self, id_matricula):
+        entrada = self._entrada_aluno(id_matricula)
+        return entrada[3] if entrada is not None else 0
+
+    def presencas_mes(self, id_matricula, mes):
+        return self.contar_presencas(id_matricula, *_limites_mes(self.ano, mes))[1]
+
+    def frequencia(self, id_matricula):
+        """Percentual de presença do aluno no ano sobre as aulas da sua turma (None se não arquivado)"""
+        entrada = self._entrada_aluno(id_matricula)
+        if entrada is None:
+            return None
+        turma = self._entrada_turma(_texto(entrada[1]))
+        aulas = turma[2] if turma is not None else entrada[3]
+        return round(entrada[4] / aulas * 100, 2) if aulas else 100.0
+
+    def registros(self, id_matricula):
+        """Gera (data, presente) do aluno, lendo do arquivo (uso em auditorias)"""
+        entrada = self._entrada_aluno(id_matricula)
+        if entrada is None:
+            return
+        _, _, posicao, quantidade, _ = entrada
+        valores = array("I", self._mapa[posicao:posicao + 4 * (2 * quantidade + 1)])
+        if not _LITTLE_ENDIAN:
+            valores.byteswap()
+        for i in range(quantidade):
+            yield date.fromordinal(valores[i]), valores[quantidade + i + 1] > valores[quantidade + i]
+
+    def aulas(self, id_turma):
+        """Datas das aulas arquivadas da turma"""
+        entrada = self._entrada_turma(id_turma)
+        if entrada is None:
+            return []
+        _, posicao, quantidade = entrada
+        valores = array("I", self._mapa[posicao:posicao + 4 * quantidade])
+        if not _LITTLE_ENDIAN:
+            valores.byteswap()
+        return [date.fromordinal(ordinal) for ordinal in valores]
+
+
+class CatalogoArquivos:
+    """Arquivos anuais de um diretório; cada ano é mapeado na primeira consulta."""
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+        os.makedirs(diretorio, exist_ok=True)
+        self._abertos = {}
+        self._trava = threading.Lock()
+        self.anos = frozenset(self._anos_no_diretorio())
+
+    def _anos_no_diretorio(self):
+        for nome in os.listdir(self.diretorio):
+            if nome.startswith("frequencia_") and nome.endswith(".bin"):
+                ano = nome[len("frequencia_"):-len(".bin")]
+                if ano.isdigit():
+                    yield int(ano)
+
+    def caminho(self, ano):
+        return os.path.join(self.diretorio, f"frequencia_{ano}.bin")
+
+    def anual(self, ano):
+        """Arquivo do ano (None se o ano não foi arquivado)"""
+        if ano not in self.anos:
+            return None
+        arquivo = self._abertos.get(ano)
+        if arquivo is None:
+            with self._trava:
+                arquivo = self._abertos.get(ano)
+                if arquivo is None:
+                    arquivo = self._abertos[ano] = ArquivoFrequenciaAnual(self.caminho(ano))
+        return arquivo
+
+    def fechar(self):
+        with self._trava:
+            for arquivo in self._abertos.values():
+                arquivo.fechar()
+            self._abertos.clear()
+
+    # ---------
+    # CONSULTAS
+    # ---------
+
+    def _anos_no_intervalo(self, inicio, fim):
+        if not self.anos:
+            return ()
+        inicio = inicio.toordinal() if isinstance(inicio, date) else inicio
+        fim = fim.toordinal() if isinstance(fim, date) else fim
+        ano_inicio, ano_fim = date.fromordinal(inicio).year, date.fromordinal(fim).year
+        return [(ano, inicio, fim) for ano in sorted(self.anos) if ano_inicio <= ano <= ano_fim]
+
+    def contar_presencas(self, id_matricula, inicio, fim):
+        """(registros, presencas) arquivados do aluno entre as datas informadas"""
+        registros = presencas = 0
+        for ano, inicio_ordinal, fim_ordinal in self._anos_no_intervalo(inicio, fim):
+            r, p = self.anual(ano).contar_presencas(id_matricula, inicio_ordinal, fim_ordinal)
+            registros += r
+            presencas += p
+        return registros, presencas
+
+    def contar_aulas(self, id_turma, inicio, fim):
+        """Aulas arquivadas da turma entre as datas informadas"""
+        return sum(self.anual(ano).contar_aulas(id_turma, inicio_ordinal, fim_ordinal)
+                   for ano, inicio_ordinal, fim_ordinal in self._anos_no_intervalo(inicio, fim))
+
+    def presencas_mes(self, id_matricula, mes, ano):
+        arquivo = self.anual(ano)
+        return arquivo.presencas_mes(id_matricula, mes) if arquivo is not None else 0
+
+    def aulas_no_mes(self, id_turma, mes, ano):
+        arquivo = self.anual(ano)
+        return arquivo.aulas_no_mes(id_turma, mes) if arquivo is not None else 0
+
+    def aulas_arquivadas(self, id_turma):
+        """Quantidade de aulas da turma em todos os anos arquivados: as posições globais anteriores
+        à primeira aula que a carga da persistência deve trazer para a memória"""
+        return sum(self.anual(ano).quantidade_aulas(id_turma) for ano in self.anos)
+
+    def registros_arquivados(self, id_matricula):
+        """Quantidade de registros de frequência do aluno em todos os anos arquivados"""
+        return sum(self.anual(ano).quantidade_registros(id_matricula) for ano in self.anos)
+
+    # ------------
+    # ARQUIVAMENTO
+    # ------------
+
+    def arquivar_ano(self, turmas, ano):
+        """Fechamento do ano letivo: grava no arquivo do ano as aulas e presenças das turmas com data
+        no ano e as retira da memória (Turma.descartar_ate). Anos anteriores devem ter sido arquivados
+        antes. Se o ano já tiver arquivo, os registros são acrescentados a ele.
+        Retorna (aulas, registros) arquivados."""
+        turmas = list(turmas)
+        limite = date(ano, 12, 31).toordinal()
+        aulas_por_turma, registros_por_aluno = self._conteudo_existente(ano)
+
+        for turma in turmas:
+            quantidade = turma._datas_aulas.prefixo_ate(limite)
+            aulas = aulas_por_turma.setdefault(turma.id_turma, [])
+            for aula in turma._diario_de_classe[:quantidade]:
+                self._conferir_ano(aula["data"].year, ano, turma.id_turma)
+                aulas.append(aula["data"].toordinal())
+
+            for aluno in turma.alunos_matriculados:
+                historico = aluno._historico_frequencia
+                if historico is None:
+                    continue
+                quantidade = historico._datas.prefixo_ate(limite)
+                if quantidade == 0:
+                    continue
+                _, registros = registros_por_aluno.setdefault(aluno.id_matricula, (turma.id_turma, []))
+                for posicao in range(quantidade):
+                    ordinal = historico._datas[posicao]
+                    self._conferir_ano(date.fromordinal(ordinal).year, ano, aluno.id_matricula)
+                    registros.append((ordinal, historico.presente(posicao)))
+
+        with self._trava:
+            arquivo = self._abertos.pop(ano, None)
+            if arquivo is not None:
+                arquivo.fechar()
+            escrever_arquivo_anual(self.caminho(ano), ano, aulas_por_turma, registros_por_aluno)
+            self.anos = self.anos | {ano}
+
+        aulas_arquivadas = sum(turma.descartar_ate(ano) for turma in turmas)
+        registros_arquivados = sum(len(registros) for _, registros in registros_por_aluno.values())
+        return aulas_arquivadas, registros_arquivados
+
+    @staticmethod
+    def _conferir_ano(ano_registro, ano, identificador):
+        if ano_registro != ano:
+            raise ValueError(f"Erro: {identificador} possui registros de {ano_registro} ainda não arquivados; "
+                             f"arquive os anos anteriores a {ano} primeiro.")
+
+    def _conteudo_existente(self, ano):
+        arquivo = self.anual(ano)
+        if arquivo is None:
+            return {}, {}
+        aulas_por_turma = {id_turma: [d.toordinal() for d in arquivo.aulas(id_turma)] for id_turma in arquivo.turmas()}
+        registros_por_aluno = {}
+        for id_matricula in arquivo.alunos():
+            entrada = arquivo._entrada_aluno(id_matricula)
+            registros_por_aluno[id_matricula] = (_texto(entrada[1]) or None,
+                                                 [(d.toordinal(), p) for d, p in arquivo.registros(id_matricula)])
+        return aulas_por_turma, registros_por_aluno
+
+
+_catalogo_padrao = None
+
+
+def obter_catalogo():
+    """Catálogo consultado por HistoricoFrequencia e Turma (None: nenhum ano arquivado)."""
+    return _catalogo_padrao
+
+
+def configurar_catalogo(catalogo):
+    """Define o catálogo de arquivos anuais em uso e o injeta em HistoricoFrequencia e Turma.
+    Retorna o catálogo."""
+    from src.models.historico_frequencia import HistoricoFrequencia
+    from src.models.turma import Turma
+
+    global _catalogo_padrao
+    _catalogo_padrao = catalogo
+    HistoricoFrequencia.usar_catalogo(catalogo)
+    Turma.usar_catalogo(catalogo)
+    return catalogo
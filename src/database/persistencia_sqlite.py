@@ -0,0 +1,327 @@
+import json
+import sqlite3
+from datetime import date
+
+"""
+Backend de persistência em SQLite para o RepositorioGeral.
+As entidades são gravadas a partir dos seus métodos to_dict (coluna "dados", em JSON),
+com os identificadores e chaves de relacionamento em colunas indexadas. Diários de classe,
+frequências e as avaliações do motor de notas ficam em tabelas próprias, uma linha por
+registro, e são gravados apenas a partir do último registro já persistido. Todas as escritas
+usam executemany dentro de uma única transação e o banco opera em modo WAL. As leituras devolvem dicionários ou geradores,
+para que o repositório monte os objetos sob demanda.
+"""
+class PersistenciaSQLite:
+    TAMANHO_LOTE = 5000
+
+    _ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS municipios (
+            id_municipio TEXT PRIMARY KEY,
+            dados TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS escolas (
+            id_escola TEXT PRIMARY KEY,
+            id_municipio TEXT,
+            dados TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_escolas_municipio ON escolas (id_municipio);
+        CREATE TABLE IF NOT EXISTS turmas (
+            id_turma TEXT PRIMARY KEY,
+            id_escola TEXT,
+            dados TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_turmas_escola ON turmas (id_escola);
+        CREATE TABLE IF NOT EXISTS usuarios (
+            cpf TEXT PRIMARY KEY,
+            tipo TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE,
+            id_matricula TEXT UNIQUE,
+            registro_funcional TEXT UNIQUE,
+            id_turma TEXT,
+            id_escola TEXT,
+            id_municipio TEXT,
+            dados TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_usuarios_turma ON usuarios (id_turma);
+        CREATE INDEX IF NOT EXISTS idx_usuarios_escola ON usuarios (id_escola);
+        CREATE INDEX IF NOT EXISTS idx_usuarios_municipio ON usuarios (id_municipio);
+        CREATE TABLE IF NOT EXISTS turma_professor (
+            id_turma TEXT NOT NULL,
+            registro_funcional TEXT NOT NULL,
+            PRIMARY KEY (id_turma, registro_funcional)
+        );
+        CREATE TABLE IF NOT EXISTS demandas (
+            id_demanda TEXT PRIMARY KEY,
+            tipo TEXT NOT NULL,
+            status TEXT NOT NULL,
+            prioridade TEXT NOT NULL,
+            id_municipio TEXT,
+            dados TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_demandas_status ON demandas (status);
+        CREATE INDEX IF NOT EXISTS idx_demandas_municipio ON demandas (id_municipio, status);
+        CREATE TABLE IF NOT EXISTS diario (
+            id_turma TEXT NOT NULL,
+            posicao INTEGER NOT NULL,
+            data INTEGER NOT NULL,
+            conteudo TEXT NOT NULL,
+            PRIMARY KEY (id_turma, posicao)
+        );
+        CREATE TABLE IF NOT EXISTS frequencia (
+            id_matricula TEXT NOT NULL,
+            posicao INTEGER NOT NULL,
+            data INTEGER NOT NULL,
+            presente INTEGER NOT NULL,
+            PRIMARY KEY (id_matricula, posicao)
+        );
+        CREATE INDEX IF NOT EXISTS idx_frequencia_data ON frequencia (id_matricula, data);
+        CREATE TABLE IF NOT EXISTS avaliacoes (
+            id_turma TEXT NOT NULL,
+            disciplina TEXT NOT NULL,
+            posicao INTEGER NOT NULL,
+            id_matricula TEXT NOT NULL,
+            nota REAL NOT NULL,
+            PRIMARY KEY (id_turma, disciplina, posicao)
+        );
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(self._ESQUEMA)
+
+    def fechar(self):
+        self._conexao.close()
+
+    @staticmethod
+    def _json(dados):
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+    def _executar_em_lotes(self, sql, linhas):
+        """Executa o comando em lotes de TAMANHO_LOTE linhas, sem materializar o iterável inteiro."""
+        lote = []
+        for linha in linhas:
+            lote.append(linha)
+            if len(lote) >= self.TAMANHO_LOTE:
+                self._conexao.executemany(sql, lote)
+                lote.clear()
+        if lote:
+            self._conexao.executemany(sql, lote)
+
+    # -------
+    # ESCRITA
+    # -------
+
+    def salvar_municipios(self, municipios):
+        self._executar_em_lotes(
+            "INSERT OR REPLACE INTO municipios VALUES (?, ?)",
+            ((m.id_municipio, self._json(m.to_dict())) for m in municipios))
+
+    def salvar_escolas(self, escolas):
+        self._executar_em_lotes(
+            "INSERT OR REPLACE INTO escolas VALUES (?, ?, ?)",
+            ((e.id_escola, e.id_municipio, self._json(e.to_dict())) for e in escolas))
+
+    def salvar_turmas(self, turmas):
+        turmas = list(turmas)
+        self._executar_em_lotes(
+            "INSERT OR REPLACE INTO turmas VALUES (?, ?, ?)",
+            ((t.id_turma, t.id_escola, self._json(t.to_dict())) for t in turmas))
+        self._executar_em_lotes(
+            "INSERT OR IGNORE INTO turma_professor VALUES (?, ?)",
+            ((t.id_turma, p.registro_funcional) for t in turmas for p in t._professores_regentes))
+
+    def _linha_usuario(self, usuario):
+        dados = usuario.to_dict(incluir_historico=False) if hasattr(usuario, "id_matricula") else usuario.to_dict()
+        return (usuario.cpf, dados["tipo"], usuario.email, dados.get("id_matricula"),
+                dados.get("registro_funcional"), dados.get("id_turma"), dados.get("id_escola"),
+                dados.get("id_municipio"), self._json(dados))
+
+    def salvar_usuarios(self, usuarios):
+        self._executar_em_lotes(
+            "INSERT OR REPLACE INTO usuarios VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self._linha_usuario(u) for u in usuarios))
+
+    def salvar_demandas(self, demandas_com_municipio):
+        """Recebe pares (demanda, id_municipio)."""
+        self._executar_em_lotes(
+            "INSERT OR REPLACE INTO demandas VALUES (?, ?, ?, ?, ?, ?)",
+            ((d.id_demanda, d.__class__.__name__, d.status, d.prioridade, id_mun, self._json(d.to_dict()))
+             for d, id_mun in demandas_com_municipio))
+
+    def _posicoes_persistidas(self, tabela, coluna):
+        return dict(self._conexao.execute(f"SELECT {coluna}, MAX(posicao) + 1 FROM {tabela} GROUP BY {coluna}"))
+
+    def salvar_diarios(self, turmas):
+        """Grava apenas as aulas posteriores às já persistidas de cada turma."""
+        persistidas = self._posicoes_persistidas("diario", "id_turma")
+
+        def linhas():
+            for turma in turmas:
+                inicio = persistidas.get(turma.id_turma, 0)
+                base = turma.posicao_inicial_diario
+                if inicio < base:
+                    raise ValueError(f"Erro: Aulas da turma {turma.id_turma} descartadas da memória antes de serem persistidas.")
+                if inicio > base + len(turma._diario_de_classe):
+                    raise ValueError(f"Erro: O diário da turma {turma.id_turma} em memória não contém as "
+                                     f"{inicio} aulas já persistidas; recarregue-o antes de salvar.")
+                for posicao in range(inicio, base + len(turma._diario_de_classe)):
+                    aula = turma._diario_de_classe[posicao - base]
+                    yield (turma.id_turma, posicao, aula["data"].toordinal(), aula["conteudo"])
+
+        self._executar_em_lotes("INSERT INTO diario VALUES (?, ?, ?, ?)", linhas())
+
+    def salvar_frequencias(self, alunos):
+        """Grava apenas os registros de frequência posteriores aos já persistidos de cada aluno."""
+        persistidas = self._posicoes_persistidas("frequencia", "id_matricula")
+
+        def linhas():
+            for aluno in alunos:
+                posicao = persistidas.get(aluno.id_matricula, 0)
+                historico = aluno._historico_frequencia
+                registros = len(historico) + historico.posicao_inicial if historico is not None else 0
+                if posicao > registros:
+                    raise ValueError(f"Erro: A frequência do aluno {aluno.id_matricula} em memória não contém os "
+                                     f"{posicao} registros já persistidos; recarregue-a antes de salvar.")
+                if historico is None:
+                    continue
+                for ordinal, presente in historico.registros_compactos(posicao):
+                    yield (aluno.id_matricula, posicao, ordinal, int(presente))
+                    posicao += 1
+
+        self._executar_em_lotes("INSERT INTO frequencia VALUES (?, ?, ?, ?)", linhas())
+
+    def salvar_avaliacoes(self, motor, turmas):
+        """Grava apenas as avaliações do motor de notas (RN03) posteriores às já persistidas de cada
+        (turma, disciplina)."""
+        persistidas = {(id_turma, disciplina): quantidade for id_turma, disciplina, quantidade in self._conexao.execute(
+            "SELECT id_turma, disciplina, MAX(posicao) + 1 FROM avaliacoes GROUP BY id_turma, disciplina")}
+
+        def linhas():
+            for turma in turmas:
+                for disciplina in motor.disciplinas(turma.id_turma):
+                    inicio = persistidas.get((turma.id_turma, disciplina), 0)
+                    if inicio > motor.total_avaliacoes(turma.id_turma, disciplina):
+                        raise ValueError(f"Erro: As avaliações de {disciplina} da turma {turma.id_turma} em memória não "
+                                         f"contêm as {inicio} já persistidas; recarregue a turma antes de salvar.")
+                    avaliacoes = motor.avaliacoes(turma.id_turma, disciplina, inicio)
+                    for posicao, (id_matricula, nota) in enumerate(avaliacoes, inicio):
+                        yield (turma.id_turma, disciplina, posicao, id_matricula, nota)
+
+        self._executar_em_lotes("INSERT INTO avaliacoes VALUES (?, ?, ?, ?, ?)", linhas())
+
+    def salvar_repositorio(self, repositorio):
+        """Persiste todo o conteúdo do repositório em uma única transação."""
+        usuarios = repositorio.listar_usuarios()
+        alunos = repositorio.listar_alunos()
+        turmas = repositorio.listar_turmas()
+        with self._conexao:
+            self.salvar_municipios(repositorio.listar_municipios())
+            self.salvar_escolas(repositorio.listar_escolas())
+            self.salvar_turmas(turmas)
+            self.salvar_usuarios(usuarios)
+            self.salvar_demandas((d, repositorio.municipio_da_demanda(d.id_demanda))
+                                 for d in repositorio.listar_demandas())
+            self.salvar_diarios(turmas)
+            self.salvar_frequencias(alunos)
+            self.salvar_avaliacoes(repositorio.motor_notas, turmas)
+
+    # -------
+    # LEITURA
+    # -------
+
+    def _ler(self, sql, parametros):
+        linha = self._conexao.execute(sql, parametros).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def _iterar(self, sql, parametros):
+        for (dados,) in self._conexao.execute(sql, parametros):
+            yield json.loads(dados)
+
+    def ler_municipio(self, id_municipio):
+        return self._ler("SELECT dados FROM municipios WHERE id_municipio = ?", (id_municipio,))
+
+    def ler_escola(self, id_escola):
+        return self._ler("SELECT dados FROM escolas WHERE id_escola = ?", (id_escola,))
+
+    def iterar_escolas_do_municipio(self, id_municipio):
+        return self._iterar("SELECT dados FROM escolas WHERE id_municipio = ?", (id_municipio,))
+
+    def ler_turma(self, id_turma):
+        return self._ler("SELECT dados FROM turmas WHERE id_turma = ?", (id_turma,))
+
+    def iterar_turmas_da_escola(self, id_escola):
+        return self._iterar("SELECT dados FROM turmas WHERE id_escola = ?", (id_escola,))
+
+    def ler_usuario_por_cpf(self, cpf):
+        return self._ler("SELECT dados FROM usuarios WHERE cpf = ?", (cpf,))
+
+    def ler_usuario_por_email(self, email):
+        return self._ler("SELECT dados FROM usuarios WHERE email = ?", (email,))
+
+    def ler_aluno(self, id_matricula):
+        return self._ler("SELECT dados FROM usuarios WHERE id_matricula = ?", (id_matricula,))
+
+    def ler_professor(self, registro_funcional):
+        return self._ler("SELECT dados FROM usuarios WHERE registro_funcional = ?", (registro_funcional,))
+
+    def iterar_alunos_da_turma(self, id_turma):
+        return self._iterar("SELECT dados FROM usuarios WHERE tipo = 'Aluno' AND id_turma = ?", (id_turma,))
+
+    def iterar_professores_da_turma(self, id_turma):
+        return self._iterar(
+            "SELECT u.dados FROM turma_professor tp JOIN usuarios u "
+            "ON u.registro_funcional = tp.registro_funcional WHERE tp.id_turma = ?", (id_turma,))
+
+    def iterar_gestores_do_municipio(self, id_municipio):
+        return self._iterar(
+            "SELECT u.dados FROM usuarios u JOIN escolas e ON e.id_escola = u.id_escola "
+            "WHERE u.tipo = 'Gestor' AND e.id_municipio = ?", (id_municipio,))
+
+    def ler_demanda(self, id_demanda):
+        return self._ler("SELECT dados FROM demandas WHERE id_demanda = ?", (id_demanda,))
+
+    def iterar_demandas(self, id_municipio=None, status=None):
+        filtros, parametros = [], []
+        if id_municipio is not None:
+            filtros.append("id_municipio = ?")
+            parametros.append(id_municipio)
+        if status is not None:
+            filtros.append("status = ?")
+            parametros.append(status.upper())
+        where = f" WHERE {' AND '.join(filtros)}" if filtros else ""
+        return self._iterar(f"SELECT dados FROM demandas{where}", parametros)
+
+    def municipio_da_demanda(self, id_demanda):
+        linha = self._conexao.execute("SELECT id_municipio FROM demandas WHERE id_demanda = ?", (id_demanda,)).fetchone()
+        return linha[0] if linha else None
+
+    def iterar_diario(self, id_turma, a_partir_de=0):
+        """Gera (data, conteudo) das aulas da turma, na ordem de registro, a partir da posição informada."""
+        cursor = self._conexao.execute(
+            "SELECT data, conteudo FROM diario WHERE id_turma = ? AND posicao >= ? ORDER BY posicao",
+            (id_turma, a_partir_de))
+        for ordinal, conteudo in cursor:
+            yield date.fromordinal(ordinal), conteudo
+
+    def iterar_frequencia(self, id_matricula, inicio=None, fim=None, a_partir_de=0):
+        """Gera (data, presente) do aluno na ordem de registro, a partir da posição informada e
+        opcionalmente entre duas datas."""
+        sql = "SELECT data, presente FROM frequencia WHERE id_matricula = ? AND posicao >= ?"
+        parametros = [id_matricula, a_partir_de]
+        if inicio is not None:
+            sql += " AND data >= ?"
+            parametros.append(inicio.toordinal())
+        if fim is not None:
+            sql += " AND data <= ?"
+            parametros.append(fim.toordinal())
+        for ordinal, presente in self._conexao.execute(sql + " ORDER BY posicao", parametros):
+            yield date.fromordinal(ordinal), bool(presente)
+
+    def iterar_avaliacoes(self, id_turma):
+        """Gera (disciplina, id_matricula, nota) das avaliações da turma, na ordem de lançamento de cada disciplina."""
+        return self._conexao.execute(
+            "SELECT disciplina, id_matricula, nota FROM avaliacoes WHERE id_turma = ? ORDER BY disciplina, posicao",
+            (id_turma,))
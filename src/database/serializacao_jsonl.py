@@ -0,0 +1,578 @@
+import gzip
+import hashlib
+import json
+import time
+from datetime import date, datetime
+from itertools import accumulate
+
+from src.database.arquivo_frequencia import obter_catalogo
+
+"""
+Serialização em fluxo (JSONL) do grafo Municipio -> Escola -> Turma -> Aluno, com professores,
+gestores, secretários, demandas, diários de classe e frequências.
+Cada linha é um registro {"registro": tipo, ...} com os dados do to_dict da entidade, e as
+ligações são feitas por referência (id_municipio, id_escola, id_turma, cpf), nunca por cópias
+aninhadas. Diários e frequências vão em um registro por turma/aluno, com as datas em
+ordinais codificados por diferença e as presenças em uma string de bits; as avaliações do motor
+de notas (RN03) vão em um registro por turma e disciplina. Cada bloco informa a posição global do
+primeiro registro, de modo que a carga pode continuar de onde parou.
+Uma exportação devolve uma MarcaExportacao (marca d'água): a impressão digital de cada entidade
+e as posições já exportadas de cada diário, histórico e caderno de notas. Exportar com uma marca
+grava apenas as entidades alteradas desde ela, as aulas, presenças e avaliações novas e a remoção
+das demandas excluídas.
+O CarregadorJSONL lê instantâneos e incrementos, em ordem, reconstruindo e religando os objetos
+em um RepositorioGeral: um registro de entidade já carregada é aplicado por inteiro, inclusive a
+transferência de turma do aluno, os vínculos do professor e a troca de gestor da escola. Ficam de
+fora apenas os identificadores que definem a posição no grafo (id_municipio da escola, id_escola
+da turma, município do secretário) e, nas demandas, os campos fixados na criação: delas só o
+status e o índice de lacuna são atualizados. Arquivos terminados em .gz são comprimidos com gzip.
+"""
+
+ORDEM_USUARIOS = ("Professor", "Gestor", "Secretario", "Aluno")
+
+
+def _abrir(caminho, modo):
+    if caminho.endswith(".gz"):
+        return gzip.open(caminho, modo + "t", encoding="utf-8")
+    return open(caminho, modo, encoding="utf-8")
+
+
+def _codificar_datas(ordinais):
+    anterior = 0
+    diferencas = []
+    for ordinal in ordinais:
+        diferencas.append(ordinal - anterior)
+        anterior = ordinal
+    return diferencas
+
+
+def _decodificar_datas(diferencas):
+    return [date.fromordinal(ordinal) for ordinal in accumulate(diferencas)]
+
+
+class MarcaExportacao:
+    """Estado de uma exportação: impressões digitais por (registro, id) e posições já exportadas."""
+    def __init__(self, escopo=None, impressoes=None, posicoes_diario=None, posicoes_frequencia=None,
+                 gerada_em=None, posicoes_avaliacoes=None):
+        self.escopo = escopo
+        self.impressoes = impressoes if impressoes is not None else {}
+        self.posicoes_diario = posicoes_diario if posicoes_diario is not None else {}
+        self.posicoes_frequencia = posicoes_frequencia if posicoes_frequencia is not None else {}
+        self.gerada_em = gerada_em
+        # {id_turma: {disciplina: avaliações já exportadas}}
+        self.posicoes_avaliacoes = posicoes_avaliacoes if posicoes_avaliacoes is not None else {}
+
+    def to_dict(self):
+        return {
+            "escopo": self.escopo,
+            "gerada_em": self.gerada_em,
+            "impressoes": [[registro, identificador, impressao]
+                           for (registro, identificador), impressao in self.impressoes.items()],
+            "posicoes_diario": self.posicoes_diario,
+            "posicoes_frequencia": self.posicoes_frequencia,
+            "posicoes_avaliacoes": self.posicoes_avaliacoes
+        }
+
+    @classmethod
+    def from_dict(cls, dados):
+        return cls(dados.get("escopo"),
+                   {(registro, identificador): impressao for registro, identificador, impressao in dados["impressoes"]},
+                   dict(dados.get("posicoes_diario", {})), dict(dados.get("posicoes_frequencia", {})),
+                   dados.get("gerada_em"),
+                   {id_turma: dict(posicoes) for id_turma, posicoes in dados.get("posicoes_avaliacoes", {}).items()})
+
+    def salvar(self, caminho):
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(self.to_dict(), arquivo, ensure_ascii=False)
+
+    @classmethod
+    def carregar(cls, caminho):
+        with open(caminho, encoding="utf-8") as arquivo:
+            return cls.from_dict(json.load(arquivo))
+
+
+class ExportadorJSONL:
+    def __init__(self, repositorio):
+        self.repositorio = repositorio
+        self._codificador = json.JSONEncoder(ensure_ascii=False, default=str)
+
+    # ------
+    # ESCOPO
+    # ------
+
+    def _entidades(self, id_municipio):
+        """Retorna (municipios, escolas, turmas, usuarios, demandas_com_municipio) do escopo."""
+        repositorio = self.repositorio
+        if id_municipio is None:
+            demandas = [(d, repositorio.municipio_da_demanda(d.id_demanda)) for d in repositorio.listar_demandas()]
+            return (repositorio.listar_municipios(), repositorio.listar_escolas(), repositorio.listar_turmas(),
+                    repositorio.listar_usuarios(), demandas)
+
+        municipio = repositorio.buscar_municipio(id_municipio)
+        if municipio is None:
+            raise ValueError(f"Erro: Município {id_municipio} não encontrado!")
+        escolas = repositorio.escolas_do_municipio(id_municipio)
+        turmas = [turma for escola in escolas for turma in repositorio.turmas_da_escola(escola.id_escola)]
+
+        usuarios = {}
+        for escola in escolas:
+            if escola.gestor_atual is not None:
+                usuarios[escola.gestor_atual.cpf] = escola.gestor_atual
+        for turma in turmas:
+            for professor in turma._professores_regentes:
+                usuarios.setdefault(professor.cpf, professor)
+            for aluno in turma.alunos_matriculados:
+                usuarios.setdefault(aluno.cpf, aluno)
+        for usuario in repositorio.listar_usuarios():
+            if usuario.__class__.__name__ == "Secretario" and usuario.id_municipio == id_municipio:
+                usuarios.setdefault(usuario.cpf, usuario)
+
+        demandas = [(d, id_municipio) for d in repositorio.demandas_do_municipio(id_municipio)]
+        return [municipio], escolas, turmas, list(usuarios.values()), demandas
+
+    # ---------
+    # REGISTROS
+    # ---------
+
+    @staticmethod
+    def _dados_usuario(usuario):
+        if hasattr(usuario, "id_matricula"):
+            return usuario.to_dict(incluir_historico=False)
+        return usuario.to_dict()
+
+    def _registros_entidades(self, municipios, escolas, turmas, usuarios, demandas):
+        """Gera (chave, registro) das entidades, em ordem de dependência."""
+        for municipio in municipios:
+            yield ("municipio", municipio.id_municipio), {"registro": "municipio", **municipio.to_dict()}
+        for escola in escolas:
+            yield ("escola", escola.id_escola), {"registro": "escola", **escola.to_dict()}
+        for turma in turmas:
+            yield ("turma", turma.id_turma), {"registro": "turma", **turma.to_dict()}
+
+        ordem = {tipo: posicao for posicao, tipo in enumerate(ORDEM_USUARIOS)}
+        for usuario in sorted(usuarios, key=lambda u: ordem.get(u.__class__.__name__, len(ordem))):
+            yield ("usuario", usuario.cpf), {"registro": "usuario", **self._dados_usuario(usuario)}
+
+        for demanda, id_municipio in demandas:
+            yield ("demanda", demanda.id_demanda), {"registro": "demanda", **demanda.to_dict(),
+                                                     "id_municipio": id_municipio}
+
+    @staticmethod
+    def _bloco_diario(turma, inicio):
+        base = turma.posicao_inicial_diario
+        if inicio < base:
+            raise ValueError(f"Erro: Aulas da turma {turma.id_turma} descartadas da memória antes de serem exportadas.")
+        aulas = turma._diario_de_classe[inicio - base:]
+        if not aulas:
+            return None
+        return {"registro": "diario", "id_turma": turma.id_turma, "inicio": inicio,
+                "datas": _codificar_datas(aula["data"].toordinal() for aula in aulas),
+                "conteudos": [aula["conteudo"] for aula in aulas]}
+
+    @staticmethod
+    def _bloco_frequencia(aluno, inicio=None):
+        historico = aluno._historico_frequencia
+        if historico is None:
+            return None
+        if inicio is None:
+            inicio = historico.posicao_inicial
+        ordinais = []
+        presencas = []
+        for ordinal, presente in historico.registros_compactos(inicio):
+            ordinais.append(ordinal)
+            presencas.append("1" if presente else "0")
+        if not ordinais:
+            return None
+        return {"registro": "frequencia", "id_matricula": aluno.id_matricula, "inicio": inicio,
+                "datas": _codificar_datas(ordinais), "presencas": "".join(presencas)}
+
+    @staticmethod
+    def _bloco_avaliacoes(motor, id_turma, disciplina, inicio):
+        alunos = []
+        notas = []
+        for id_matricula, nota in motor.avaliacoes(id_turma, disciplina, inicio):
+            alunos.append(id_matricula)
+            notas.append(nota)
+        if not alunos:
+            return None
+        return {"registro": "avaliacoes", "id_turma": id_turma, "disciplina": disciplina, "inicio": inicio,
+                "alunos": alunos, "notas": notas}
+
+    # ----------
+    # EXPORTAÇÃO
+    # ----------
+
+    def exportar(self, caminho, marca=None, id_municipio=None):
+        """Grava o instantâneo (sem marca) ou o incremento desde a marca informada.
+        Retorna o resumo com a nova marca, a ser usada na próxima exportação incremental."""
+        if marca is not None and marca.escopo != id_municipio:
+            raise ValueError("Erro: A marca de exportação pertence a outro escopo.")
+        inicio_exportacao = time.perf_counter()
+        anteriores = marca.impressoes if marca is not None else {}
+        nova = MarcaExportacao(id_municipio,
+                               posicoes_diario=dict(marca.posicoes_diario) if marca is not None else {},
+                               posicoes_frequencia=dict(marca.posicoes_frequencia) if marca is not None else {},
+                               gerada_em=datetime.now().isoformat(),
+                               posicoes_avaliacoes={id_turma: dict(posicoes) for id_turma, posicoes
+                                                    in marca.posicoes_avaliacoes.items()} if marca is not None else {})
+        municipios, escolas, turmas, usuarios, demandas = self._entidades(id_municipio)
+        codificar = self._codificador.encode
+        resumo = {"entidades": 0, "inalteradas": 0, "aulas": 0, "presencas": 0, "avaliacoes": 0, "remocoes": 0}
+
+        with _abrir(caminho, "w") as arquivo:
+            escrever = arquivo.write
+            for chave, registro in self._registros_entidades(municipios, escolas, turmas, usuarios, demandas):
+                linha = codificar(registro)
+                impressao = hashlib.blake2b(linha.encode("utf-8"), digest_size=8).hexdigest()
+                nova.impressoes[chave] = impressao
+                if anteriores.get(chave) == impressao:
+                    resumo["inalteradas"] += 1
+                    continue
+                escrever(linha)
+                escrever("\n")
+                resumo["entidades"] += 1
+
+            for (registro, identificador) in anteriores:
+                if registro == "demanda" and (registro, identificador) not in nova.impressoes:
+                    escrever(codificar({"registro": "remocao", "tipo": "demanda", "id_demanda": identificador}))
+                    escrever("\n")
+                    resumo["remocoes"] += 1
+
+            for turma in turmas:
+                bloco = self._bloco_diario(turma, nova.posicoes_diario.get(turma.id_turma, turma.posicao_inicial_diario))
+                if bloco is not None:
+                    escrever(codificar(bloco))
+                    escrever("\n")
+                    resumo["aulas"] += len(bloco["datas"])
+                nova.posicoes_diario[turma.id_turma] = turma.posicao_inicial_diario + turma.total_aulas
+
+            motor = self.repositorio.motor_notas
+            for turma in turmas:
+                for disciplina in motor.disciplinas(turma.id_turma):
+                    posicoes = nova.posicoes_avaliacoes.setdefault(turma.id_turma, {})
+                    bloco = self._bloco_avaliacoes(motor, turma.id_turma, disciplina, posicoes.get(disciplina, 0))
+                    if bloco is not None:
+                        escrever(codificar(bloco))
+                        escrever("\n")
+                        resumo["avaliacoes"] += len(bloco["notas"])
+                    posicoes[disciplina] = motor.total_avaliacoes(turma.id_turma, disciplina)
+
+            for usuario in usuarios:
+                if not hasattr(usuario, "id_matricula"):
+                    continue
+                bloco = self._bloco_frequencia(usuario, nova.posicoes_frequencia.get(usuario.id_matricula))
+                if bloco is not None:
+                    escrever(codificar(bloco))
+                    escrever("\n")
+                    resumo["presencas"] += len(bloco["datas"])
+                    nova.posicoes_frequencia[usuario.id_matricula] = bloco["inicio"] + len(bloco["datas"])
+
+        resumo["segundos"] = round(time.perf_counter() - inicio_exportacao, 4)
+        resumo["marca"] = nova
+        return resumo
+
+
+class CarregadorJSONL:
+    def __init__(self, repositorio=None):
+        if repositorio is None:
+            from src.database.RepositorioGeral import RepositorioGeral
+            repositorio = RepositorioGeral()
+        self.repositorio = repositorio
+        self._tratadores = {
+            "municipio": self._carregar_municipio,
+            "escola": self._carregar_escola,
+            "turma": self._carregar_turma,
+            "usuario": self._carregar_usuario,
+            "demanda": self._carregar_demanda,
+            "remocao": self._carregar_remocao,
+            "diario": self._carregar_diario,
+            "frequencia": self._carregar_frequencia,
+            "avaliacoes": self._carregar_avaliacoes
+        }
+
+    def carregar(self, caminho):
+        """Aplica os registros do arquivo ao repositório. Retorna a contagem por tipo de registro."""
+        contagem = {}
+        with _abrir(caminho, "r") as arquivo:
+            for numero, linha in enumerate(arquivo, 1):
+                if not linha.strip():
+                    continue
+                dados = json.loads(linha)
+                tratador = self._tratadores.get(dados.get("registro"))
+                if tratador is None:
+                    raise ValueError(f"Erro: Registro desconhecido na linha {numero}: {dados.get('registro')!r}")
+                tratador(dados)
+                contagem[dados["registro"]] = contagem.get(dados["registro"], 0) + 1
+        return contagem
+
+    # ---------
+    # ENTIDADES
+    # ---------
+
+    def _carregar_municipio(self, dados):
+        from src.models.municipio import Municipio
+
+        municipio = self.repositorio.buscar_municipio(dados["id_municipio"])
+        if municipio is not None:
+            municipio.nome = dados["nome"]
+            municipio.estado = dados["estado"]
+            municipio.verba_disponivel_municipio = dados["verba_disponivel_municipio"]
+            return
+        municipio = Municipio(dados["nome"], dados["id_municipio"], dados["estado"], dados["verba_disponivel_municipio"])
+        self.repositorio.adicionar_municipio(municipio)
+
+    def _carregar_escola(self, dados):
+        from src.models.escola import Escola
+
+        escola = self.repositorio.buscar_escola(dados["id_escola"])
+        if escola is not None:
+            # o gestor_atual é religado pelo registro do Gestor, que vem depois
+            escola.nome = dados["nome"]
+            escola.endereco = dados["endereco"]
+            escola.verba_disponivel_escola = dados["verba_disponivel_escola"]
+            return
+        escola = Escola(dados["nome"], dados["endereco"], dados["id_escola"], None,
+                        dados["verba_disponivel_escola"], dados["id_municipio"])
+        self.repositorio.adicionar_escola(escola)
+        municipio = self.repositorio.buscar_municipio(dados["id_municipio"])
+        if municipio is not None:
+            municipio.cadastrar_escola(escola)
+
+    def _carregar_turma(self, dados):
+        from src.models.turma import Turma
+
+        turma = self.repositorio.buscar_turma(dados["id_turma"])
+        if turma is not None:
+            turma.nome = dados["nome_truma"]
+            turma.ano_letivo = dados["ano_letivo"]
+            return
+        turma = Turma(dados["id_turma"], dados["nome_truma"], dados["ano_letivo"], dados["id_escola"])
+        self.repositorio.adicionar_turma(turma)
+        escola = self.repositorio.buscar_escola(dados["id_escola"])
+        if escola is not None:
+            escola.adicionar_turma(turma)
+
+    def _carregar_usuario(self, dados):
+        existente = self.repositorio.buscar_usuario_por_cpf(dados["cpf"])
+        tipo = dados["tipo"]
+        if existente is not None and existente.__class__.__name__ != tipo:
+            raise ValueError(f"Erro: O CPF {dados['cpf']} já pertence a um {existente.__class__.__name__}, não a um {tipo}.")
+        if tipo == "Aluno":
+            usuario = existente or self._novo_aluno(dados)
+            if existente is not None:
+                self._transferir_aluno(usuario, dados.get("id_turma"))
+                for disciplina in usuario.notas.keys() - dados.get("notas", {}).keys():
+                    usuario.remover_nota(disciplina)
+            for disciplina, nota in dados.get("notas", {}).items():
+                usuario.registrar_nota(disciplina, nota)
+        elif tipo == "Professor":
+            usuario = existente or self._novo_professor(dados)
+            if existente is not None:
+                usuario.escola_associada = self._escola_ou_id(dados["id_escola"])
+                usuario.salario = dados["salario"]
+                usuario.titulacao = dados["titulacao"]
+                usuario.area_atuacao = dados["area_atuacao"]
+            self._vincular_turmas(usuario, dados.get("turmas_vinculadas", []))
+        elif tipo == "Gestor":
+            usuario = existente or self._novo_gestor(dados)
+            usuario.verba_escolar_total = dados["verba_escolar_total"]
+            self._assumir_escola(usuario, dados["id_escola"])
+        elif tipo == "Secretario":
+            usuario = existente or self._novo_secretario(dados)
+            usuario.departamento = dados["departamento"]
+            with usuario.trava_verba():
+                usuario._verba_municipal_total = dados["verba_municipal_total"]
+        else:
+            raise ValueError(f"Erro: Tipo de usuário desconhecido: {tipo!r}")
+        if existente is not None:
+            self._atualizar_dados_base(usuario, dados)
+        usuario.status = dados["status"]
+
+    @staticmethod
+    def _dados_base(dados):
+        return (dados["nome"], dados["cpf"], dados["email"], dados["senha"], dados["telefone"],
+                dados["data_nascimento"])
+
+    def _atualizar_dados_base(self, usuario, dados):
+        usuario.nome = dados["nome"]
+        usuario.senha = dados["senha"]
+        usuario.telefone = dados["telefone"]
+        usuario.data_nascimento = dados["data_nascimento"]
+        self.repositorio.atualizar_email(usuario, dados["email"])
+
+    def _escola_ou_id(self, id_escola):
+        escola = self.repositorio.buscar_escola(id_escola) if id_escola else None
+        return escola if escola is not None else id_escola
+
+    def _transferir_aluno(self, aluno, id_turma):
+        """Religa o aluno à turma do registro, desfazendo a matrícula na turma anterior"""
+        atual = aluno.turma_associada
+        id_atual = atual.id_turma if hasattr(atual, "id_turma") else atual
+        if id_atual == id_turma:
+            return
+        if hasattr(atual, "remover_aluno"):
+            atual.remover_aluno(aluno)
+        turma = self.repositorio.buscar_turma(id_turma) if id_turma else None
+        if turma is not None:
+            turma.adicionar_aluno(aluno)
+        else:
+            aluno.turma_associada = id_turma
+
+    def _vincular_turmas(self, professor, ids_turmas):
+        """Deixa o professor vinculado exatamente às turmas do registro"""
+        ids_turmas = set(ids_turmas)
+        for turma in list(professor.turmas_associadas):
+            id_turma = turma.id_turma if hasattr(turma, "id_turma") else turma
+            if id_turma in ids_turmas:
+                continue
+            if hasattr(turma, "remover_professor"):
+                turma.remover_professor(professor)
+            else:
+                professor.turmas_associadas.remove(turma)
+        for id_turma in ids_turmas:
+            turma = self.repositorio.buscar_turma(id_turma)
+            if turma is not None:
+                turma.adicionar_professor(professor)
+
+    def _assumir_escola(self, gestor, id_escola):
+        """Torna o gestor o gestor_atual da escola do registro, liberando a escola anterior"""
+        escola = self.repositorio.buscar_escola(id_escola)
+        if escola is None:
+            raise ValueError(f"Erro: Escola {id_escola} não encontrada para o gestor {gestor.cpf}.")
+        anterior = gestor.escola_associada
+        if anterior is not escola and anterior.gestor_atual is gestor:
+            anterior.gestor_atual = None
+        gestor.escola_associada = escola
+        escola.gestor_atual = gestor
+
+    def _novo_aluno(self, dados):
+        from src.models.aluno import Aluno
+
+        aluno = Aluno(*self._dados_base(dados), dados["id_matricula"], status=dados["status"])
+        self.repositorio.adicionar_usuario(aluno)
+        turma = self.repositorio.buscar_turma(dados["id_turma"]) if dados.get("id_turma") else None
+        if turma is not None:
+            turma.adicionar_aluno(aluno)
+        return aluno
+
+    def _novo_professor(self, dados):
+        from src.models.professor import Professor
+
+        professor = Professor(*self._dados_base(dados), dados["registro_funcional"],
+                              self._escola_ou_id(dados["id_escola"]), dados["titulacao"],
+                              dados["area_atuacao"], dados["salario"], status=dados["status"])
+        self.repositorio.adicionar_usuario(professor)
+        return professor
+
+    def _novo_gestor(self, dados):
+        from src.models.gestor import Gestor
+
+        escola = self.repositorio.buscar_escola(dados["id_escola"])
+        if escola is None:
+            raise ValueError(f"Erro: Escola {dados['id_escola']} não encontrada para o gestor {dados['cpf']}.")
+        gestor = Gestor(*self._dados_base(dados), escola, dados["verba_escolar_total"], status=dados["status"])
+        self.repositorio.adicionar_usuario(gestor)
+        return gestor
+
+    def _novo_secretario(self, dados):
+        from src.models.secretario import Secretario
+
+        municipio = self.repositorio.buscar_municipio(dados["id_municipio"]) or dados["id_municipio"]
+        secretario = Secretario(*self._dados_base(dados), municipio, dados["verba_municipal_total"],
+                                dados["departamento"], status=dados["status"])
+        self.repositorio.adicionar_usuario(secretario)
+        return secretario
+
+    def _carregar_demanda(self, dados):
+        from src.models.demanda_infraestrutura import DemandaInfraestrutura
+        from src.models.demanda_pedagogica import DemandaPedagogica
+
+        demanda = self.repositorio.buscar_demanda(dados["id_demanda"])
+        if demanda is None:
+            solicitante = dados["solicitante"]
+            if isinstance(solicitante, str):
+                solicitante = self.repositorio.buscar_usuario_por_cpf(solicitante) or solicitante
+            if dados["tipo"] == "DemandaInfraestrutura":
+                demanda = DemandaInfraestrutura(dados["id_demanda"], dados["descricao"], dados["prioridade"],
+                                                solicitante, dados["custo_estimado"], dados["localizacao_demanda"])
+            else:
+                turma = (self.repositorio.buscar_turma(dados["id_turma"]) if dados["id_turma"] else None) \
+                    or dados["id_turma"]
+                demanda = DemandaPedagogica(dados["id_demanda"], dados["descricao"], dados["prioridade"], solicitante,
+                                            dados["total_alunos"], dados["alunos_abaixo_media"],
+                                            dados["frequencia_turma"], dados["alunos_presentes"], turma,
+                                            dados["indice_lacuna"], dados.get("referencia_mensal"))
+            demanda._criado_em = datetime.fromisoformat(dados["criado_em"])
+            demanda._Demanda__status = dados["status"]
+            if dados.get("id_municipio") is not None:
+                demanda.vincular_municipio(dados["id_municipio"])
+            self.repositorio.adicionar_demanda(demanda, dados.get("id_municipio"))
+        else:
+            # o status é restaurado sem passar por atualizar_status (sem novo evento de auditoria)
+            demanda._Demanda__status = dados["status"]
+            self.repositorio.reindexar_demanda(demanda)
+            if "indice_lacuna" in dados:
+                demanda._DemandaPedagogica__indice_lacuna = dados["indice_lacuna"]
+
+    def _carregar_remocao(self, dados):
+        if dados["tipo"] == "demanda":
+            self.repositorio.remover_demanda(dados["id_demanda"])
+
+    # ------
+    # SÉRIES
+    # ------
+
+    @staticmethod
+    def _sobreposicao(id_entidade, inicio, posicao_final, vazio):
+        """Quantos registros do bloco já estão carregados (ou arquivados); bloco após uma lacuna só é
+        aceito em série vazia."""
+        if inicio > posicao_final and not vazio:
+            raise ValueError(f"Erro: Lacuna entre os registros carregados de {id_entidade} e o bloco na posição {inicio}.")
+        return max(0, posicao_final - inicio)
+
+    def _carregar_diario(self, dados):
+        turma = self.repositorio.buscar_turma(dados["id_turma"])
+        if turma is None:
+            raise ValueError(f"Erro: Turma {dados['id_turma']} não encontrada para o diário.")
+        vazio = turma.total_aulas == 0
+        posicao_final = turma.posicao_inicial_diario + turma.total_aulas
+        if vazio:
+            catalogo = obter_catalogo()
+            if catalogo is not None:
+                posicao_final = max(posicao_final, catalogo.aulas_arquivadas(turma.id_turma))
+        pular = self._sobreposicao(turma.id_turma, dados["inicio"], posicao_final, vazio)
+        aulas = list(zip(_decodificar_datas(dados["datas"]), dados["conteudos"]))[pular:]
+        if aulas:
+            turma.restaurar_diario(aulas, dados["inicio"] + pular if vazio else None)
+
+    def _carregar_frequencia(self, dados):
+        aluno = self.repositorio.buscar_aluno(dados["id_matricula"])
+        if aluno is None:
+            raise ValueError(f"Erro: Aluno {dados['id_matricula']} não encontrado para a frequência.")
+        historico = aluno._historico_frequencia
+        vazio = historico is None or len(historico) == 0
+        posicao_final = historico.posicao_inicial + len(historico) if historico is not None else 0
+        if vazio:
+            catalogo = obter_catalogo()
+            if catalogo is not None:
+                posicao_final = max(posicao_final, catalogo.registros_arquivados(aluno.id_matricula))
+        pular = self._sobreposicao(aluno.id_matricula, dados["inicio"], posicao_final, vazio)
+        registros = list(zip(_decodificar_datas(dados["datas"]), (p == "1" for p in dados["presencas"])))[pular:]
+        if not registros:
+            return
+        if vazio:
+            aluno.presenca.iniciar_em(dados["inicio"] + pular)
+        aluno.registrar_presencas_em_lote(registros)
+
+    def _carregar_avaliacoes(self, dados):
+        turma = self.repositorio.buscar_turma(dados["id_turma"])
+        if turma is None:
+            raise ValueError(f"Erro: Turma {dados['id_turma']} não encontrada para as avaliações.")
+        motor = self.repositorio.motor_notas
+        disciplina = dados["disciplina"]
+        pular = self._sobreposicao(f"{turma.id_turma}/{disciplina}", dados["inicio"],
+                                   motor.total_avaliacoes(turma.id_turma, disciplina), False)
+        avaliacoes = list(zip(dados["alunos"], dados["notas"]))[pular:]
+        if avaliacoes:
+            escola = self.repositorio.buscar_escola(turma.id_escola)
+            motor.restaurar(turma, disciplina, avaliacoes, escola.id_municipio if escola is not None else None)
@@ -1,20 +1,26 @@
 from src.models.usuario import Usuario
+from src.models.historico_frequencia import HistoricoFrequencia
+from src.utils import validadores
 from datetime import date
-import re
+from fractions import Fraction
 """
 Representa a entidade Aluno conforme o diagrama UML.
 Herda atributos base de Usuario e gerencia sua vida acadêmica.
+Usa __slots__ (sem __dict__ por instância) e só aloca as notas e o histórico de
+frequência no primeiro registro, reduzindo a memória de redes com muitos alunos.
 """
 
 class Aluno(Usuario):
+    __slots__ = ("_id_matricula", "_turma_associada", "_notas", "_historico_frequencia")
+
     def __init__(self, nome, cpf, email, senha, telefone, data_nascimento,
                  id_matricula, turma_associada=None, status=True):
         super().__init__(nome, cpf, email, senha, telefone, data_nascimento, status)
 
         self.id_matricula = id_matricula
         self.turma_associada = turma_associada 
-        self._notas = {}
-        self._historico_frequencia = [] 
+        self._notas = None
+        self._historico_frequencia = None
 
     # -----------------
     # GETTERS E SETTERS
@@ -30,11 +36,9 @@ class Aluno(Usuario):
         if not isinstance(valor, str):
             raise TypeError("Erro: O id da matrícula deve ser uma string!")
         
-        matricula_limpa = valor.strip().upper()
-
-        padrao_matricula = r'^MAT-\d{4}-\d{4}$'
+        matricula_limpa = validadores.normalizar_matricula(valor)
 
-        if not re.match(padrao_matricula, matricula_limpa):
+        if matricula_limpa is None:
             raise ValueError("Erro: Matrícula inválida! Use o padrão MAT-ANO-0000 (Ex: MAT-2026-0001).")
         
         else:
@@ -59,25 +63,52 @@ class Aluno(Usuario):
     #implementado por Levi para integração com o src/services/avaliador_frequencia.py (RN02)    
     @property
     def presenca(self):
+        """Histórico de frequência do aluno, alocado no primeiro acesso."""
+        if self._historico_frequencia is None:
+            self._historico_frequencia = HistoricoFrequencia(self)
         return self._historico_frequencia
 
+    @property
+    def notas(self):
+        """Notas lançadas por disciplina (cópia; use registrar_nota para alterar)."""
+        return dict(self._notas) if self._notas else {}
+
+    def registrar_nota(self, disciplina, nota):
+        if self._notas is None:
+            self._notas = {}
+        self._notas[disciplina] = nota
+
+    def remover_nota(self, disciplina):
+        if self._notas:
+            self._notas.pop(disciplina, None)
+
+
+    @property
+    def percentual_frequencia(self):
+        """Frequência percentual exata (Fraction, sem arredondar), somada nas médias de escola e município."""
+        turma = self.turma_associada
+        if not turma or not hasattr(turma, 'total_aulas') or turma.total_aulas == 0:
+            return Fraction(100)
+        if self._historico_frequencia is None:
+            return Fraction(0)
+        return Fraction(self._historico_frequencia.contar_presencas() * 100, turma.total_aulas)
 
-    #requer refatoração, ass:Levi 
     @property
     def frequencia(self):
         """
         Calcula a frequência baseada no total de aulas da TURMA.
+        Usa os contadores mantidos no registro de aulas e presenças (O(1)).
         """
-        from src.models.turma import Turma
-        
-        if not self.turma_associada or not hasattr(self.turma_associada, '_diario_de_classe'):
+        if not self.turma_associada or not hasattr(self.turma_associada, 'total_aulas'):
             return 100.0
-        total_aulas_turma = len(self.turma_associada._diario_de_classe)
+        total_aulas_turma = self.turma_associada.total_aulas
         
         if total_aulas_turma == 0:
             return 100.0
 
-        presencas = sum(1 for registro in self._historico_frequencia if registro.get('presenca') is True)
+        if self._historico_frequencia is None:
+            return 0.0
+        presencas = self._historico_frequencia.contar_presencas()
         
         percentual = (presencas / total_aulas_turma) * 100
         return round(percentual, 2)
@@ -157,24 +188,34 @@ class Aluno(Usuario):
         if not isinstance(presente, bool):
             raise TypeError("O status de presença deve ser True ou False.")
         
-        self._historico_frequencia.append({
-            "data": data,
-            "aluno": self.nome,
-            "presenca": presente
-        })
+        self.presenca.registrar(data, presente)
+        if hasattr(self.turma_associada, 'contabilizar_presencas'):
+            self.turma_associada.contabilizar_presencas(((data, presente),))
+
+    def registrar_presencas_em_lote(self, registros):
+        """Alimenta o histórico com vários pares (data, presente) de uma vez."""
+        registros = list(registros)
+        if not registros:
+            return
+        self.presenca.registrar_em_lote(registros)
+        if hasattr(self.turma_associada, 'contabilizar_presencas'):
+            self.turma_associada.contabilizar_presencas(registros)
 
     def baixar_material(self):
         pass
     
-    def to_dict(self):
+    def to_dict(self, incluir_historico=True):
+        """Sem incluir_historico, omite o histórico e o percentual de frequência (ex.: serialização
+        por referência, em que a frequência é gravada à parte)."""
         dados = super().to_dict()
         id_t = self.turma_associada.id_turma if hasattr(self.turma_associada, 'id_turma') else self.turma_associada
         
         dados.update({
             "id_matricula": self.id_matricula,
-            "id_turma": id_t,
-            "percentual_frequencia": self.frequencia,
-            "historico_frequencia": self._historico_frequencia,
-            "notas": self._notas 
+            "id_turma": id_t
         })
+        if incluir_historico:
+            dados["percentual_frequencia"] = self.frequencia
+            dados["historico_frequencia"] = list(self._historico_frequencia) if self._historico_frequencia is not None else []
+        dados["notas"] = self.notas
         return dados
\ No newline at end of file
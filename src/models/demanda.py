@@ -1,32 +1,49 @@
 from abc import ABC, abstractmethod
 from datetime import datetime 
 
+from src.core.auditoria import obter_registro
+from src.core.notificador import obter_notificador
+from src.core.saida import obter_logger
+
+logger = obter_logger(__name__)
+
 class AuditMixin: 
     """
-    Mixin criado para o rastreamento de dados de criação e alteração
+    Mixin criado para o rastreamento de dados de criação e alteração.
+    Os eventos são enviados ao registro de auditoria (src.core.auditoria).
     """
+    __slots__ = ("_criado_em", "_alterado_por")
+
     def __init__(self):
         self._criado_em = datetime.now()
         self._alterado_por = None 
 
+    def _id_auditoria(self):
+        return getattr(self, 'id_demanda', id(self))
+
     def atualizar(self, usuario_que_alterou):
         """Método que serve para registrar quem mexeu por último"""
         self._alterado_por = usuario_que_alterou
+        status = getattr(self, 'status', None)
+        obter_registro().registrar(self.__class__.__name__, self._id_auditoria(), "ALTERACAO",
+                                   usuario_que_alterou, status, status)
 
-        agora = datetime.now()
-        data_formatada = agora.strftime("%d/%m/%Y %H:%M:%S")
-        
-        print(f"---LOG DE AUDITORIA---"
-              f"Usuário: {usuario_que_alterou.nome}"
-              f"Data e Hora da alteração: {data_formatada}"
-              f"--------------------------------------------"
-        )
+    def registrar_mudanca_status(self, status_anterior, status_novo, usuario=None):
+        """Registra no log de auditoria a transição de status, atribuída ao usuário que a fez"""
+        obter_registro().registrar(self.__class__.__name__, self._id_auditoria(), "STATUS",
+                                   usuario, status_anterior, status_novo)
 
 
 class Demanda(ABC, AuditMixin):
     """
     Classe base seguindo os nomes definidos no UML.
+    Os atributos ficam em __slots__; os nomes privados continuam acessíveis como _Demanda__status.
     """
+    __slots__ = ("__id_demanda", "__descricao", "__status", "__prioridade", "__solicitante", "_id_municipio",
+                 "_ouvintes_status")
+    # status em que a demanda não recebe mais tratamento; qualquer outro conta como em aberto
+    STATUS_FINAIS = ("REGULAR", "CONCLUIDO", "CONCLUÍDO", "CANCELADO")
+
     def __init__(self, id_demanda, descricao, prioridade, solicitante):
         AuditMixin.__init__(self)
         ABC.__init__(self)
@@ -36,11 +53,20 @@ class Demanda(ABC, AuditMixin):
         self.__status = "ABERTO"           
         self.__prioridade = prioridade.upper() 
         self.__solicitante = solicitante   
+        self._id_municipio = None
+        self._ouvintes_status = None
 
     @property
     def id_municipio(self):
-        """Busca o id_municipio através do objeto solicitante (RN01)"""
-        return self.__solicitante.id_municipio 
+        """Busca o id_municipio através do objeto solicitante (RN01).
+        Demandas geradas pelo sistema usam o município vinculado por vincular_municipio."""
+        if self._id_municipio is not None:
+            return self._id_municipio
+        return getattr(self.__solicitante, 'id_municipio', None)
+
+    def vincular_municipio(self, id_municipio):
+        """Vincula o município à demanda quando ele não pode ser obtido pelo solicitante"""
+        self._id_municipio = id_municipio
     
     @property
     def solicitante(self):
@@ -56,18 +82,91 @@ class Demanda(ABC, AuditMixin):
     def descricao(self):
         """Acesso apenas para leitura da descrição conforme UML"""
         return self.__descricao
+
+    @property
+    def status(self):
+        """Acesso apenas para leitura do status (alterado via atualizar_status)"""
+        return self.__status
+
+    @property
+    def prioridade(self):
+        """Acesso apenas para leitura da prioridade"""
+        return self.__prioridade
+
+    @property
+    def em_aberto(self):
+        """A demanda ainda está em tratamento (status fora de STATUS_FINAIS)"""
+        return self.__status not in self.STATUS_FINAIS
     
     def emitir_notificacao_critica(self):
         """Gatilho para urgência baseado no nome do atributo do UML (prioridade)"""
         if self.__prioridade == "CRÍTICO":
-            print("ALERTA!: Notificando Gestor e Secretário!"
-            f"Problema detectado: {self.__descricao}")
+            logger.warning("ALERTA!: Notificando Gestor e Secretário!"
+                           "Problema detectado: %s", self.__descricao)
+            obter_notificador().notificar(self)
 
     @abstractmethod
     def processar_solicitacao(self, usuario):
         pass
 
-    def atualizar_status(self, novo_status):
-        """Método para alteração do status privado (usado pelas filhas)"""
+    def to_dict(self):
+        """Retorna os dados da demanda em formato de dicionário."""
+        solicitante = self.__solicitante
+        return {
+            "tipo": self.__class__.__name__,
+            "id_demanda": self.__id_demanda,
+            "descricao": self.__descricao,
+            "status": self.__status,
+            "prioridade": self.__prioridade,
+            "solicitante": solicitante.cpf if hasattr(solicitante, 'cpf') else solicitante,
+            "criado_em": self._criado_em.isoformat()
+        }
+
+    def _nomes_slots(self):
+        """Atributos declarados em __slots__ ao longo da hierarquia, com os nomes privados já expandidos"""
+        for classe in type(self).__mro__:
+            slots = classe.__dict__.get("__slots__", ())
+            for nome in (slots,) if isinstance(slots, str) else slots:
+                if nome in ("__dict__", "__weakref__"):
+                    continue
+                if nome.startswith("__") and not nome.endswith("__"):
+                    nome = f"_{classe.__name__.lstrip('_')}{nome}"
+                yield nome
+
+    def __getstate__(self):
+        """Cópias (ex.: envio a um pool de processos) não levam os ouvintes de status"""
+        slots = {nome: getattr(self, nome) for nome in self._nomes_slots()
+                 if nome != "_ouvintes_status" and hasattr(self, nome)}
+        return getattr(self, "__dict__", None), slots
+
+    def __setstate__(self, estado):
+        atributos, slots = estado
+        if atributos:
+            self.__dict__.update(atributos)
+        for nome, valor in slots.items():
+            setattr(self, nome, valor)
+        self._ouvintes_status = None
+
+    def adicionar_ouvinte_status(self, funcao):
+        """Registra uma função chamada como funcao(demanda, status_anterior) a cada mudança de status
+        (ex.: índices por status do repositório e da fila)."""
+        if self._ouvintes_status is None:
+            self._ouvintes_status = []
+        self._ouvintes_status.append(funcao)
+
+    def remover_ouvinte_status(self, funcao):
+        if self._ouvintes_status and funcao in self._ouvintes_status:
+            self._ouvintes_status.remove(funcao)
+
+    def atualizar_status(self, novo_status, usuario=None):
+        """Método para alteração do status privado (usado pelas filhas).
+        O usuário informado é quem fez a alteração: fica no evento de auditoria e em _alterado_por."""
+        status_anterior = self.__status
         self.__status = novo_status
-        print(f"Status alterado para: {self.__status}")
\ No newline at end of file
+        if usuario is not None:
+            self._alterado_por = usuario
+        self.registrar_mudanca_status(status_anterior, novo_status, usuario)
+        logger.info("Status alterado para: %s", novo_status)
+        if self._ouvintes_status and status_anterior != novo_status:
+            for funcao in list(self._ouvintes_status):
+                funcao(self, status_anterior)
\ No newline at end of file
@@ -1,11 +1,16 @@
+from src.core.saida import obter_logger
 from src.models.demanda import Demanda
 
+logger = obter_logger(__name__)
+
 class DemandaInfraestrutura(Demanda):
     """
     Essa docstring tem a função de ordenar as demandas de estruturas, passando por um 
     processo de solicitação que validam as informações, nível de importância e coleta os 
     dados dos envolvidos. 
     """
+    __slots__ = ("__custo_estimado", "__localizacao_demanda")
+
     def __init__(self, id_demanda, descricao, prioridade, solicitante, custo_estimado, localizacao_demanda):
         super().__init__(id_demanda, descricao, prioridade, solicitante)
         self.__custo_estimado = custo_estimado
@@ -13,14 +18,22 @@ class DemandaInfraestrutura(Demanda):
 
     def processar_solicitacao(self, usuario):
         if self.id_municipio != usuario.id_municipio: 
-            print(f"Acesso negado! o usuário {usuario.nome} não pertence a esse município") 
+            logger.warning("Acesso negado! o usuário %s não pertence a esse município", usuario.nome)
             return 
         if self.__custo_estimado > 100_000: 
-            print(f"O custo estimado é maior do que o disponível, a obra entrará em processo de licitação")
-            self.atualizar_status ("EM LICITAÇÃO")
+            logger.info("O custo estimado é maior do que o disponível, a obra entrará em processo de licitação")
+            self.atualizar_status("EM LICITAÇÃO", usuario)
         else: 
-            print(f"O custo para esta obra foi aprovado, entrando em execução")
-            self.atualizar_status("EM ANDAMENTO")
+            logger.info("O custo para esta obra foi aprovado, entrando em execução")
+            self.atualizar_status("EM ANDAMENTO", usuario)
 
         self.emitir_notificacao_critica()
-        self.atualizar(usuario)
\ No newline at end of file
+        self.atualizar(usuario)
+
+    def to_dict(self):
+        dados = super().to_dict()
+        dados.update({
+            "custo_estimado": self.__custo_estimado,
+            "localizacao_demanda": self.__localizacao_demanda
+        })
+        return dados
\ No newline at end of file
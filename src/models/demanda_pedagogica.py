@@ -1,25 +1,42 @@
-from src.models.demanda import Demanda 
+from src.core.saida import obter_logger
+from src.models.demanda import Demanda
+
+logger = obter_logger(__name__)
 
 class DemandaPedagogica(Demanda):
     """
     Essa classe tem a função de calcular as demandas pedagógicas como a necessidade de realizar
     mais aulas pela lacuna de conteúdo
     """
+    __slots__ = ("__total_alunos", "__alunos_abaixo_media", "__frequencia_turma", "__indice_lacuna",
+                 "__alunos_presentes", "__turma_alvo", "__referencia_mensal")
+
     def __init__(self, id_demanda, descricao, prioridade, solicitante, 
-                 total_alunos, alunos_abaixo_media, frequencia_turma, alunos_presentes, turma_alvo):
+                 total_alunos, alunos_abaixo_media, frequencia_turma, alunos_presentes, turma_alvo,
+                 indice_lacuna=0.0, referencia_mensal=None):
         super().__init__(id_demanda, descricao, prioridade, solicitante)
         
         self.__total_alunos = total_alunos
         self.__alunos_abaixo_media = alunos_abaixo_media
         self.__frequencia_turma = frequencia_turma
-        self.__indice_lacuna = 0.0
+        self.__indice_lacuna = indice_lacuna
         self.__alunos_presentes = alunos_presentes
         self.__turma_alvo = turma_alvo
+        self.__referencia_mensal = tuple(referencia_mensal) if referencia_mensal is not None else None
 
     @property
     def indice_lacuna(self):
         return self.__indice_lacuna
 
+    @property
+    def turma_alvo(self):
+        return self.__turma_alvo
+
+    @property
+    def referencia_mensal(self):
+        """(ano, mês) avaliado pela RN02 que gerou a demanda; None nas demais"""
+        return self.__referencia_mensal
+
     @property
     def frequencia_atual(self):
         return self.__frequencia_turma
@@ -30,27 +47,42 @@ class DemandaPedagogica(Demanda):
             return False 
       
         self.__indice_lacuna = self.__alunos_abaixo_media / self.__total_alunos
-        self.__frequencia_turma = self.__alunos_presentes / self.__total_alunos
+        # demandas de lacuna (RN03) são criadas sem a contagem de presentes
+        if self.__alunos_presentes is not None:
+            self.__frequencia_turma = self.__alunos_presentes / self.__total_alunos
         
         regra_nota = self.__indice_lacuna >= 0.4 
-        regra_presenca = self.__frequencia_turma >= 0.75 
+        regra_presenca = self.__frequencia_turma is not None and self.__frequencia_turma >= 0.75 
 
         return regra_nota or regra_presenca
 
 
     def processar_solicitacao(self, usuario):
         if self.id_municipio != usuario.id_municipio: 
-            print("Acesso negado")
+            logger.warning("Acesso negado")
             return
         
         if self.validar_reforco(): 
-            print(f"STATUS DA SALA: {self.__turma_alvo.nome}  ")
-            print(f"Frequência: {self.__frequencia_turma*100:.1f}%")
-            print(f"Porcentagem lacuna de aprendizado: {self.__indice_lacuna*100:.1f}%")
+            logger.info("STATUS DA SALA: %s  ", self.__turma_alvo.nome)
+            if self.__frequencia_turma is not None:
+                logger.info("Frequência: %.1f%%", self.__frequencia_turma * 100)
+            logger.info("Porcentagem lacuna de aprendizado: %.1f%%", self.__indice_lacuna * 100)
 
-            self.atualizar_status("REFORÇO APROVADO")
+            self.atualizar_status("REFORÇO APROVADO", usuario)
 
         else: 
-            self.atualizar_status("REGULAR")
-
+            self.atualizar_status("REGULAR", usuario)
 
+    def to_dict(self):
+        dados = super().to_dict()
+        turma = self.__turma_alvo
+        dados.update({
+            "total_alunos": self.__total_alunos,
+            "alunos_abaixo_media": self.__alunos_abaixo_media,
+            "frequencia_turma": self.__frequencia_turma,
+            "alunos_presentes": self.__alunos_presentes,
+            "indice_lacuna": self.__indice_lacuna,
+            "referencia_mensal": list(self.__referencia_mensal) if self.__referencia_mensal else None,
+            "id_turma": turma.id_turma if hasattr(turma, 'id_turma') else turma
+        })
+        return dados
@@ -1,8 +1,10 @@
 from .turma import Turma
-from .aluno import Aluno
-from .gestor import Gestor
+from src.utils.colecao_indexada import ColecaoIndexada
 
 class Escola:
+    __slots__ = ("_nome", "_endereco", "_id_escola", "_gestor_atual", "_verba_disponivel_escola", "_id_municipio",
+                 "_turmas_existentes", "_professores_empregados", "_agregador")
+
     def __init__(self, nome, endereco, id_escola, gestor_atual, verba_disponivel_escola, id_municipio):
         self._nome = nome
         self._endereco = endereco
@@ -11,16 +13,29 @@ class Escola:
         self._verba_disponivel_escola = float(verba_disponivel_escola)
         self._id_municipio = id_municipio
         
-        self._turmas_existentes = []
+        self._turmas_existentes = ColecaoIndexada("id_turma")
         self._professores_empregados = []
+        self._agregador = None
     
     @property
     def nome(self):
         return self._nome
     
+    @nome.setter
+    def nome(self, valor):
+        if not valor or len(valor.strip()) == 0:
+            raise ValueError("O nome da escola não pode estar vazio.")
+        self._nome = valor
+
     @property
     def endereco(self):
         return self._endereco
+
+    @endereco.setter
+    def endereco(self, valor):
+        if not valor or len(valor.strip()) == 0:
+            raise ValueError("O endereço da escola não pode estar vazio.")
+        self._endereco = valor
     
     @property
     def id_escola(self):
@@ -29,6 +44,11 @@ class Escola:
     @property
     def gestor_atual(self):
         return self._gestor_atual
+
+    @gestor_atual.setter
+    def gestor_atual(self, valor):
+        # espera a instância da classe Gestor (ou None, escola sem gestor)
+        self._gestor_atual = valor
     
     @property
     def verba_disponivel_escola(self):
@@ -46,7 +66,11 @@ class Escola:
 
     def gerar_relatorio_frequencia(self):
         "Calcula a média de frequência de todos os alunos de todas as turmas. "
-        total_percentual = 0.0
+        if self._agregador is not None:
+            # Escola acompanhada por um AgregadorFrequencia: média já materializada (O(1))
+            return self._agregador.frequencia_escola(self._id_escola)
+        # soma exata das frequências (sem arredondar por aluno), como no AgregadorFrequencia
+        total_percentual = 0
         qtd_alunos = 0
         
         for turma in self._turmas_existentes:
@@ -54,14 +78,14 @@ class Escola:
             # Percorre os alunos daquela turma específica
             for aluno in turma.alunos_matriculados:
                 # Avisa ao editor que 'aluno' é um objeto da classe Aluno 
-                total_percentual += aluno.frequencia() 
+                total_percentual += aluno.percentual_frequencia
                 qtd_alunos += 1
         
         # Evita divisão por zero se não houver alunos
         if qtd_alunos == 0:
             return 0.0
         media_geral = total_percentual / qtd_alunos   
-        return round(media_geral,2)
+        return round(float(media_geral),2)
     
     def atualizar_locacao(self):
         "Verifica se todos os professores da escola estão alocados em pelo menos uma turma."
@@ -78,6 +102,8 @@ class Escola:
       "a relação é mantida apenas por esta lista na Escola."
       if turma not in self._turmas_existentes:
           self._turmas_existentes.append(turma)
+          if self._agregador is not None:
+              self._agregador.acompanhar_turma(turma, self._id_escola, self._id_municipio)
     
     def to_dict(self):
         return {
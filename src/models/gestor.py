@@ -43,6 +43,11 @@ class Gestor(Usuario):
         else:
             self.__verba_escolar_total = padrao
 
+    @property
+    def id_municipio(self):
+        """Município da escola administrada pelo Gestor (RN01)"""
+        return self.escola_associada.id_municipio
+
     #-------
     #METODOS
     #-------
@@ -92,21 +97,38 @@ class Gestor(Usuario):
             nova_demanda = DemandaInfraestrutura(**dados_solicitacao)
             valor_estimado = dados_solicitacao.get('custo_estimado')
             if valor_estimado > self.verba_escolar_total:
-                nova_demanda.atualizar_status("EM LICITAÇÃO")
+                nova_demanda.atualizar_status("EM LICITAÇÃO", self)
         elif tipo_demanda == DemandaPedagogica:
             nova_demanda = DemandaPedagogica(**dados_solicitacao)
 
         return nova_demanda
         
-    def administrar_solicitacoes(self, lista_demandas):
+    def administrar_solicitacoes(self, lista_demandas, limite=None):
+        """Processa as demandas recebidas. Com uma FilaDemandas, processa apenas as
+        `limite` demandas abertas de maior prioridade do município da escola."""
+        from src.services.fila_demandas import FilaDemandas
 
         if lista_demandas is None:
             raise ValueError("Erro: A lista de demandas não pode ser None!")
-        elif lista_demandas == []:
+
+        if isinstance(lista_demandas, FilaDemandas):
+            lista_demandas = lista_demandas.retirar_proximas(self.id_municipio, limite or len(lista_demandas))
+
+        if len(lista_demandas) == 0:
             print("Nenhuma demanda pendente.")
 
         for dado in lista_demandas:
             dado.processar_solicitacao(self)
+        return lista_demandas
             
     def gerenciar_escola(self):
-        pass
\ No newline at end of file
+        pass
+
+    def to_dict(self):
+        """Transforma dados do Gestor em dicionário."""
+        dados = super().to_dict()
+        dados.update({
+            "id_escola": self.escola_associada.id_escola,
+            "verba_escolar_total": self.verba_escolar_total
+        })
+        return dados
\ No newline at end of file
@@ -0,0 +1,213 @@
+from array import array
+from datetime import date
+
+from src.utils.serie_datas import SerieDatas
+
+"""
+Armazenamento colunar compacto do histórico de frequência de um aluno.
+As datas das aulas ficam como ordinais em um array('I') (4 bytes por registro) e as
+presenças em um bitset (1 bit por registro), no lugar de um dicionário por aula.
+Para manter a compatibilidade com o formato anterior, o histórico se comporta como
+uma lista somente leitura de dicionários {"data", "aluno", "presenca"}, montados sob
+demanda na leitura. Contadores de presença (total e por (ano, mês)) são mantidos a cada registro;
+nas consultas por intervalo de datas, a série de datas localiza o trecho em O(log n) e as presenças
+são contadas direto no bitset.
+Anos arquivados podem ser descartados da memória; as posições continuam globais (a partir de
+posicao_inicial), o que mantém a gravação incremental da persistência consistente; as consultas
+por mês e por período somam, de forma transparente, os anos guardados no arquivo anual (mmap).
+"""
+class HistoricoFrequencia:
+    __slots__ = ("_aluno", "_datas", "_presencas", "_total_presencas", "_presencas_por_mes")
+
+    # catálogo dos anos arquivados (CatalogoArquivos), injetado por usar_catalogo
+    _catalogo = None
+
+    def __init__(self, aluno=None):
+        self._aluno = aluno
+        self._datas = SerieDatas()
+        self._presencas = bytearray()
+        self._total_presencas = 0
+        self._presencas_por_mes = {}
+
+    def registrar(self, data: date, presente: bool):
+        """Acrescenta um registro (data da aula e presença) ao final do histórico."""
+        if not isinstance(data, date):
+            raise TypeError("Erro: A data da presença deve ser um objeto do tipo date.")
+
+        posicao = len(self._datas)
+        if posicao % 8 == 0:
+            self._presencas.append(0)
+        if presente:
+            self._presencas[posicao >> 3] |= 1 << (posicao & 7)
+            self._total_presencas += 1
+            chave = (data.year, data.month)
+            self._presencas_por_mes[chave] = self._presencas_por_mes.get(chave, 0) + 1
+        self._datas.append(data.toordinal())
+
+    def registrar_em_lote(self, registros):
+        """Acrescenta vários registros (data, presente) de uma vez, na ordem recebida.
+        Todos os registros são validados antes de qualquer escrita."""
+        registros = list(registros)
+        ordinais = array('I')
+        for data, presente in registros:
+            if not isinstance(data, date):
+                raise TypeError("Erro: A data da presença deve ser um objeto do tipo date.")
+            if not isinstance(presente, bool):
+                raise TypeError("O status de presença deve ser True ou False.")
+            ordinais.append(data.toordinal())
+
+        posicao = len(self._datas)
+        bytes_necessarios = (posicao + len(registros) + 7) // 8 - len(self._presencas)
+        if bytes_necessarios > 0:
+            self._presencas.extend(bytes(bytes_necessarios))
+
+        presencas = self._presencas
+        presencas_por_mes = self._presencas_por_mes
+        for data, presente in registros:
+            if presente:
+                presencas[posicao >> 3] |= 1 << (posicao & 7)
+                chave = (data.year, data.month)
+                presencas_por_mes[chave] = presencas_por_mes.get(chave, 0) + 1
+                self._total_presencas += 1
+            posicao += 1
+        self._datas.extend(ordinais)
+
+    def data(self, posicao):
+        """Data do registro na posição informada."""
+        return date.fromordinal(self._datas[posicao])
+
+    def presente(self, posicao):
+        """Presença do registro na posição informada."""
+        if posicao < 0:
+            posicao += len(self._datas)
+        if not 0 <= posicao < len(self._datas):
+            raise IndexError("Erro: Posição fora do histórico de frequência.")
+        return bool(self._presencas[posicao >> 3] & (1 << (posicao & 7)))
+
+    @property
+    def posicao_inicial(self):
+        """Posição global do primeiro registro em memória (registros descartados antes dele)."""
+        return self._datas.descartados
+
+    @classmethod
+    def usar_catalogo(cls, catalogo):
+        """Define o catálogo cujos anos arquivados são somados às consultas (None: apenas a memória)."""
+        cls._catalogo = catalogo
+
+    def iniciar_em(self, posicao):
+        """Define a posição global do primeiro registro de um histórico vazio (carga sem os anos arquivados)."""
+        self._datas.iniciar_em(posicao)
+
+    def registros_compactos(self, inicio=0):
+        """Gera (ordinal da data, presente) a partir da posição global informada, sem montar dicionários."""
+        base = self._datas.descartados
+        if inicio < base:
+            raise ValueError("Erro: Registros de frequência descartados da memória antes de serem persistidos.")
+        for posicao in range(inicio - base, len(self._datas)):
+            yield self._datas[posicao], bool(self._presencas[posicao >> 3] & (1 << (posicao & 7)))
+
+    def dados_compactos(self):
+        """(ordinais, bitset) do trecho em memória, sem cópia: array('I') com as datas na ordem de
+        registro e bytearray com a presença do registro i no bit i % 8 do byte i // 8."""
+        return self._datas.ordinais, self._presencas
+
+    def contar_presencas(self):
+        """Total de presenças do histórico."""
+        return self._total_presencas
+
+    def _ano_padrao(self):
+        turma = getattr(self._aluno, "turma_associada", None)
+        return getattr(turma, "ano_letivo", None)
+
+    def presencas_mes(self, mes, ano=None):
+        """Presenças no mês do ano informado (padrão: ano letivo da turma do aluno).
+        Sem ano e sem turma, soma o mês de todos os anos do histórico."""
+        if ano is None:
+            ano = self._ano_padrao()
+        catalogo = self._catalogo
+        if ano is not None:
+            presencas = self._presencas_por_mes.get((ano, mes), 0)
+            if catalogo is not None and ano in catalogo.anos and self._aluno is not None:
+                presencas += catalogo.presencas_mes(self._aluno.id_matricula, mes, ano)
+            return presencas
+        presencas = sum(qtd for (_, m), qtd in self._presencas_por_mes.items() if m == mes)
+        if catalogo is not None and self._aluno is not None:
+            presencas += sum(catalogo.presencas_mes(self._aluno.id_matricula, mes, ano) for ano in catalogo.anos)
+        return presencas
+
+    def _contar_periodo(self, inicio, fim):
+        """(registros, presencas) no período: memória e anos arquivados."""
+        registros, presencas = self._datas.contar(inicio, fim, self._presencas)
+        catalogo = self._catalogo
+        if catalogo is not None and self._aluno is not None:
+            arquivados = catalogo.contar_presencas(self._aluno.id_matricula, inicio, fim)
+            registros += arquivados[0]
+            presencas += arquivados[1]
+        return registros, presencas
+
+    def registros_no_periodo(self, inicio, fim):
+        """Quantidade de registros com data entre inicio e fim (inclusive), em O(log n)."""
+        return self._contar_periodo(inicio, fim)[0]
+
+    def presencas_no_periodo(self, inicio, fim):
+        """Presenças com data entre inicio e fim (inclusive): busca binária nas datas e contagem de bits."""
+        return self._contar_periodo(inicio, fim)[1]
+
+    def frequencia_no_periodo(self, inicio, fim):
+        """Fração de presenças entre os registros do período, ou None se não houver registros."""
+        registros, presencas = self._contar_periodo(inicio, fim)
+        return presencas / registros if registros else None
+
+    def descartar_ate(self, ano):
+        """Remove da memória o trecho inicial do histórico com datas até o fim do ano informado
+        (anos já arquivados/persistidos). Retorna a quantidade de registros descartados."""
+        quantidade = self._datas.prefixo_ate(date(ano, 12, 31).toordinal())
+        if quantidade == 0:
+            return 0
+
+        for posicao in range(quantidade):
+            if self._presencas[posicao >> 3] & (1 << (posicao & 7)):
+                data = date.fromordinal(self._datas[posicao])
+                chave = (data.year, data.month)
+                self._presencas_por_mes[chave] -= 1
+                if not self._presencas_por_mes[chave]:
+                    del self._presencas_por_mes[chave]
+                self._total_presencas -= 1
+
+        restantes = len(self._datas) - quantidade
+        presencas = bytearray((restantes + 7) // 8)
+        for nova, antiga in enumerate(range(quantidade, len(self._datas))):
+            if self._presencas[antiga >> 3] & (1 << (antiga & 7)):
+                presencas[nova >> 3] |= 1 << (nova & 7)
+        self._presencas = presencas
+        self._datas.descartar_prefixo(quantidade)
+        return quantidade
+
+    def _registro(self, posicao):
+        return {
+            "data": self.data(posicao),
+            "aluno": getattr(self._aluno, "nome", None),
+            "presenca": self.presente(posicao)
+        }
+
+    def __len__(self):
+        return len(self._datas)
+
+    def __getitem__(self, posicao):
+        if isinstance(posicao, slice):
+            return [self._registro(i) for i in range(*posicao.indices(len(self._datas)))]
+        if posicao < 0:
+            posicao += len(self._datas)
+        if not 0 <= posicao < len(self._datas):
+            raise IndexError("Erro: Posição fora do histórico de frequência.")
+        return self._registro(posicao)
+
+    def __iter__(self):
+        for posicao in range(len(self._datas)):
+            yield self._registro(posicao)
+
+    def __bool__(self):
+        return len(self._datas) > 0
+
+    def __repr__(self):
+        return f"HistoricoFrequencia({len(self._datas)} registros)"
@@ -1,18 +1,31 @@
 
 from .escola import Escola
+from src.utils.colecao_indexada import ColecaoIndexada
+from src.core.saida import obter_logger
+
+logger = obter_logger(__name__)
 
 class Municipio:
+    __slots__ = ("_nome", "_id_municipio", "_estado", "_verba_disponivel_municipio", "_escolas_situadas", "_agregador")
+
     def __init__(self, nome, id_municipio, estado, verba_disponivel_municipio):
         self._nome = nome
         self._id_municipio = id_municipio
         self.estado = estado  # Aciona o setter para validação
         self._verba_disponivel_municipio = float(verba_disponivel_municipio)
         
-        self._escolas_situadas = []  
+        self._escolas_situadas = ColecaoIndexada("id_escola")
+        self._agregador = None
     
     @property
     def nome(self):
         return self._nome
+
+    @nome.setter
+    def nome(self, valor):
+        if not valor or len(valor.strip()) == 0:
+            raise ValueError("O nome do município não pode estar vazio.")
+        self._nome = valor
     
     @property
     def id_municipio(self):
@@ -47,10 +60,28 @@ class Municipio:
         # Verificamos se o que está vindo é realmente um objeto
         if escola not in self._escolas_situadas:
             self._escolas_situadas.append(escola)
-            print(f"Escola '{escola.nome}' cadastrada no município {self._nome}.")
+            logger.info("Escola '%s' cadastrada no município %s.", escola.nome, self._nome)
+            if self._agregador is not None:
+                self._agregador.acompanhar_escola(escola)
             return True
         return False
     
+    def gerar_relatorio_frequencia(self):
+        "Calcula a média de frequência de todos os alunos de todas as escolas do município."
+        if self._agregador is not None:
+            return self._agregador.frequencia_municipio(self._id_municipio)
+        # soma exata das frequências (sem arredondar por aluno), como no AgregadorFrequencia
+        total_percentual = 0
+        qtd_alunos = 0
+        for escola in self._escolas_situadas:
+            for turma in escola._turmas_existentes:
+                for aluno in turma.alunos_matriculados:
+                    total_percentual += aluno.percentual_frequencia
+                    qtd_alunos += 1
+        if qtd_alunos == 0:
+            return 0.0
+        return round(float(total_percentual / qtd_alunos), 2)
+
     def calcular_investimento_total(self):
         "Calcula a verba do município somada à verba de todas as escolas situadas."
         verba_escolas = sum(escola.verba_disponivel_escola for escola in self._escolas_situadas)
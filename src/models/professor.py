@@ -1,12 +1,19 @@
 from src.models.usuario import Usuario
+from src.utils.colecao_indexada import ColecaoIndexada
+from src.utils import validadores
 from datetime import date
-import re
+from src.core.saida import obter_logger
+
+logger = obter_logger(__name__)
 
 """
 Representa a entidade Professor conforme o diagrama UML.
 Herda atributos base de Usuario e adiciona dados funcionais e acadêmicos.
 """
 class Professor(Usuario):
+    __slots__ = ("_registro_funcional", "_escola_associada", "_titulacao", "_area_atuacao", "_salario",
+                 "turmas_associadas")
+
     def __init__(self, nome, cpf, email, senha, telefone, data_nascimento,
                  registro_funcional, escola_associada, titulacao, area_atuacao, 
                  salario, status=True):
@@ -16,7 +23,7 @@ class Professor(Usuario):
         self.titulacao = titulacao
         self.area_atuacao = area_atuacao
         self.salario = salario
-        self.turmas_associadas = []
+        self.turmas_associadas = ColecaoIndexada("id_turma")
 
     #-----------------
     #GETTERS E SETTERS
@@ -32,14 +39,12 @@ class Professor(Usuario):
         if not isinstance(valor, str):
             raise TypeError("Erro: Registro Funcional deve ser uma string!")
         
-        valor = valor.strip().upper()
-
-        padrao_rf = r'^RF-\d{4}-\d{4}$'
+        registro_limpo = validadores.normalizar_registro_funcional(valor)
 
-        if not re.match(padrao_rf, valor):
+        if registro_limpo is None:
             raise ValueError("Erro: RF inválido! Use o padrão RF-ANO-SEQUENCIAL (Ex: RF-2026-0001).")
         
-        self._registro_funcional = valor
+        self._registro_funcional = registro_limpo
 
     @property
     def escola_associada(self):
@@ -55,6 +60,11 @@ class Professor(Usuario):
         else:
             raise TypeError("Erro: escola_associada deve ser um objeto da classe Escola.")
         
+    @property
+    def id_municipio(self):
+        """Município da escola do professor, quando a escola é um objeto Escola (RN01)."""
+        return getattr(self._escola_associada, 'id_municipio', None)
+
     @property
     def titulacao(self):
         """Retorna o grau acadêmico do professor."""
@@ -123,15 +133,16 @@ class Professor(Usuario):
         RN02: Registra a presença dos alunos com verificação de permissão.
         """
         if turma not in self.turmas_associadas:
-            print(f"❌ Erro de Permissão: O professor {self.nome} não pode realizar chamada na turma {getattr(turma, 'nome', 'desconhecida')} (não vinculada).")
+            logger.error("❌ Erro de Permissão: O professor %s não pode realizar chamada na turma %s (não vinculada).",
+                         self.nome, getattr(turma, 'nome', 'desconhecida'))
             return
 
         if not hasattr(turma, 'alunos_matriculados'):
-            print("❌ Erro: Objeto turma inválido ou sem lista de alunos.")
+            logger.error("❌ Erro: Objeto turma inválido ou sem lista de alunos.")
             return
 
         if not lista_presencas:
-            print("⚠️ Aviso: Nenhuma presença enviada para registro.")
+            logger.warning("⚠️ Aviso: Nenhuma presença enviada para registro.")
             return
 
         for registro in lista_presencas:
@@ -142,7 +153,81 @@ class Professor(Usuario):
                 aluno.registrar_presenca(data, status)
         
         turma.registrar_aula(self, data, f"Chamada realizada pelo Prof. {self.nome}")
-        print(f"✅ Chamada concluída para a Turma {turma.nome} na data {data}.")
+        logger.info("✅ Chamada concluída para a Turma %s na data %s.", turma.nome, data)
+
+    def realizar_chamada_em_lote(self, chamadas):
+        """
+        RN02: Registra várias chamadas de uma vez (ex.: importação de um semestre de diários).
+        Recebe um iterável de tuplas (turma, data, lista_presencas), no mesmo formato de
+        realizar_chamada. A permissão é verificada em O(1) pela coleção indexada de turmas,
+        as presenças são gravadas em lote no histórico de cada aluno e as aulas em lote no diário de cada
+        turma. Chamadas inválidas são rejeitadas por inteiro, sem gravação parcial.
+        Retorna um resumo da operação em vez de imprimir no console.
+        """
+        conteudo = f"Chamada realizada pelo Prof. {self.nome}"
+        chamadas_por_turma = {}
+        resumo = {
+            "chamadas_registradas": 0,
+            "presencas_registradas": 0,
+            "chamadas_rejeitadas": []
+        }
+
+        def rejeitar(turma, data, motivo):
+            resumo["chamadas_rejeitadas"].append({
+                "turma": getattr(turma, 'id_turma', None),
+                "data": data,
+                "motivo": motivo
+            })
+
+        for turma, data, lista_presencas in chamadas:
+            motivo = None
+            if turma not in self.turmas_associadas:
+                motivo = "Professor não vinculado à turma"
+            elif not hasattr(turma, 'alunos_matriculados'):
+                motivo = "Objeto turma inválido ou sem lista de alunos"
+            elif self not in getattr(turma, '_professores_regentes', ()):
+                motivo = "Professor não é regente da turma"
+            elif not isinstance(data, date):
+                motivo = "A data deve ser um objeto do tipo date"
+            elif not lista_presencas:
+                motivo = "Nenhuma presença enviada para registro"
+            elif not all(isinstance(r, dict) for r in lista_presencas):
+                motivo = "Registro de presença inválido: use dicionários com 'aluno' e 'presente'"
+            elif not all(isinstance(r.get("presente"), bool) for r in lista_presencas):
+                motivo = "O status de presença deve ser True ou False"
+
+            if motivo:
+                rejeitar(turma, data, motivo)
+                continue
+            chamadas_por_turma.setdefault(turma, []).append((data, lista_presencas))
+
+        # As aulas são gravadas primeiro: presenças só entram para chamadas cujas aulas foram aceitas
+        presencas_por_aluno = {}
+        for turma, chamadas_turma in chamadas_por_turma.items():
+            registradas = turma.registrar_aulas_em_lote(self, [(data, conteudo) for data, _ in chamadas_turma])
+            if not registradas:
+                for data, _ in chamadas_turma:
+                    rejeitar(turma, data, "Aulas recusadas pelo diário da turma")
+                continue
+            resumo["chamadas_registradas"] += registradas
+
+            for data, lista_presencas in chamadas_turma:
+                for registro in lista_presencas:
+                    aluno = registro.get("aluno")
+                    if aluno is None:
+                        continue
+                    registros_aluno = presencas_por_aluno.get(aluno)
+                    if registros_aluno is None:
+                        if not hasattr(aluno, 'registrar_presencas_em_lote'):
+                            continue
+                        registros_aluno = presencas_por_aluno[aluno] = []
+                    registros_aluno.append((data, registro["presente"]))
+                    resumo["presencas_registradas"] += 1
+
+        for aluno, registros in presencas_por_aluno.items():
+            aluno.registrar_presencas_em_lote(registros)
+
+        return resumo
 
     def postar_conteudo(self, turma, data: str, conteudo: str):
         """
@@ -161,12 +246,20 @@ class Professor(Usuario):
             print(f"❌ Erro de Permissão: O professor {self.nome} não leciona para a turma {aluno.turma_associada.nome if hasattr(aluno.turma_associada, 'nome') else 'desconhecida'}.")
             return
 
-        if not isinstance(nota, (int, float)) or not (0 <= nota <= 10):
+        if isinstance(nota, bool) or not isinstance(nota, (int, float)) or not (0 <= nota <= 10):
             print("❌ Erro: A nota deve ser entre 0 e 10.")
             return
 
-        if hasattr(aluno, '_notas'):
-            aluno._notas[disciplina] = nota
+        if not isinstance(disciplina, str) or not disciplina.strip():
+            print("❌ Erro: Informe a disciplina da nota.")
+            return
+
+        if hasattr(aluno, 'registrar_nota'):
+            # RN03: o motor de notas guarda todas as avaliações e mantém os agregados da turma
+            from src.services.motor_notas import obter_motor_notas
+            if hasattr(aluno.turma_associada, 'id_turma'):
+                obter_motor_notas().lancar(aluno.turma_associada, aluno, disciplina, nota, self.id_municipio)
+            aluno.registrar_nota(disciplina, nota)
             print(f"⭐ Nota {nota} lançada para {aluno.nome} em {disciplina}.")
 
     def enviar_material(self, turma, titulo: str, link_ou_conteudo: str):
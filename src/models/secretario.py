@@ -1,3 +1,5 @@
+import threading
+
 from src.models.usuario import Usuario
 from src.models.municipio import Municipio
 from src.models.escola import Escola
@@ -5,6 +7,12 @@ from src.models.demanda_infraestrutura import DemandaInfraestrutura
 from src.models.demanda_pedagogica import DemandaPedagogica
 
 class Secretario(Usuario):
+    # uma trava por município, compartilhada entre instâncias, para que os débitos
+    # da verba municipal sejam atômicos entre threads; ela não é compartilhada entre
+    # processos (no pool de processos a atomicidade vem do particionamento por município)
+    _travas_verba = {}
+    _trava_registro = threading.Lock()
+
     def __init__(self, nome, cpf, email, senha, telefone, data_nascimento,
                  municipio_responsavel, verba_municipal_total, departamento, status=True):
         super().__init__(nome, cpf, email, senha, telefone, data_nascimento, status)
@@ -26,6 +34,11 @@ class Secretario(Usuario):
     def verba_municipal_total(self):
         return self._verba_municipal_total
     
+    @property
+    def id_municipio(self):
+        """Município sob responsabilidade do Secretário (RN01)"""
+        return getattr(self._municipio_responsavel, 'id_municipio', self._municipio_responsavel)
+
     @property
     def departamento(self):
         return self._departamento
@@ -73,7 +86,7 @@ class Secretario(Usuario):
         from src.models.gestor import Gestor
         novo_gestor = None
 
-        if escola_alvo.municipio != self.municipio_responsavel:
+        if escola_alvo.id_municipio != self.id_municipio:
 
             raise PermissionError(f"Erro: O secretário não tem permissão para cadastrar gestores "
                                  f"fora do município de {self.municipio_responsavel.nome}.")
@@ -86,34 +99,58 @@ class Secretario(Usuario):
     def enviar_mensagem(self):
         pass
 
+    def trava_verba(self):
+        """Trava que serializa as alterações na verba do município do Secretário"""
+        with Secretario._trava_registro:
+            return Secretario._travas_verba.setdefault(self.id_municipio, threading.Lock())
+
     def gerenciar_verba(self, demanda):
         if not isinstance(demanda, DemandaInfraestrutura):
             return self.verba_municipal_total
         
         custo = getattr(demanda, '_DemandaInfraestrutura__custo_estimado', 0)
 
-        if custo > 100000 or custo > self._verba_municipal_total:
-            demanda.atualizar_status("EM LICITAÇÃO")
+        with self.trava_verba():
+            if custo > 100000 or custo > self._verba_municipal_total:
+                demanda.atualizar_status("EM LICITAÇÃO", self)
 
-        else:
-            self._verba_municipal_total -= custo
-            demanda.atualizar_status("EM ANDAMENTO")
+            else:
+                self._verba_municipal_total -= custo
+                demanda.atualizar_status("EM ANDAMENTO", self)
 
-        return self.verba_municipal_total
+            return self.verba_municipal_total
+
+    def administrar_solicitacoes(self, lista_demandas, limite=None):
+        """Processa as demandas do município. Com uma FilaDemandas, retira apenas as
+        `limite` demandas abertas de maior prioridade, sem percorrer o acúmulo inteiro."""
+        from src.services.fila_demandas import FilaDemandas
 
-    def administrar_solicitacoes(self, lista_demandas):
-        demandas_municipais = [
-            dados for dados in lista_demandas
-            if dados.solicitante.escola_associada.municipio == self.municipio_responsavel
-        ]       
+        if isinstance(lista_demandas, FilaDemandas):
+            demandas_municipais = lista_demandas.retirar_proximas(self.id_municipio, limite or len(lista_demandas))
+        else:
+            demandas_municipais = [
+                dados for dados in lista_demandas
+                if dados.id_municipio == self.id_municipio
+            ]
 
         if not demandas_municipais:
             return []
         
         for demanda in demandas_municipais:
-            demanda.processar_solicitacoes(self)
+            demanda.processar_solicitacao(self)
             
         return demandas_municipais
     
     def gerenciar_unidades(self, lista_escolas):
-        pass
\ No newline at end of file
+        pass
+
+    def to_dict(self):
+        """Transforma dados do Secretário em dicionário."""
+        dados = super().to_dict()
+        id_mun = self.municipio_responsavel.id_municipio if hasattr(self.municipio_responsavel, 'id_municipio') else self.municipio_responsavel
+        dados.update({
+            "id_municipio": id_mun,
+            "verba_municipal_total": self.verba_municipal_total,
+            "departamento": self.departamento
+        })
+        return dados
\ No newline at end of file
@@ -1,17 +1,35 @@
 from datetime import date
 from .professor import Professor
 from .aluno import Aluno
+from src.utils.colecao_indexada import ColecaoIndexada
+from src.utils.serie_datas import SerieDatas
+from src.core.saida import obter_logger
+
+logger = obter_logger(__name__)
 
 class Turma:
+    __slots__ = ("_id_turma", "_nome", "_ano_letivo", "_id_escola", "_professores_regentes", "_alunos_matriculados",
+                 "_diario_de_classe", "_aulas_por_mes", "_versoes_por_mes", "_datas_aulas", "_presencas_alunos",
+                 "_presencas_alunos_por_mes", "_ouvintes")
+
+    # catálogo dos anos arquivados (CatalogoArquivos), injetado por usar_catalogo
+    _catalogo = None
+
     def __init__(self, id_turma, nome, ano_letivo, id_escola):
         self._id_turma = id_turma
         self._nome = nome
         self.ano_letivo = ano_letivo # Usa o setter para validar no momento da criação
         self._id_escola = id_escola
         
-        self._professores_regentes = []
-        self._alunos_matriculados = []
+        self._professores_regentes = ColecaoIndexada("registro_funcional")
+        self._alunos_matriculados = ColecaoIndexada("id_matricula")
         self._diario_de_classe = []
+        self._aulas_por_mes = {}
+        self._versoes_por_mes = {}
+        self._datas_aulas = SerieDatas()
+        self._presencas_alunos = 0
+        self._presencas_alunos_por_mes = {}
+        self._ouvintes = []
 
     @property
     def nome(self):
@@ -56,6 +74,40 @@ class Turma:
           self._alunos_matriculados.append(aluno)
           # Lógica de negócio: Sincroniza o atributo no objeto Aluno
           aluno.turma_associada = self
+          self._incorporar_presencas(aluno)
+          self._notificar()
+
+    def adicionar_alunos_em_lote(self, alunos):
+        """Matricula vários alunos de uma vez, ignorando os já matriculados.
+        Retorna a quantidade de novos alunos."""
+        novos = 0
+        for aluno in alunos:
+            if self._alunos_matriculados.append(aluno):
+                aluno.turma_associada = self
+                self._incorporar_presencas(aluno)
+                novos += 1
+        if novos:
+            self._notificar()
+        return novos
+
+    def remover_aluno(self, aluno: Aluno):
+        """Desfaz a matrícula (ex.: transferência), retirando dos contadores as presenças do aluno.
+        Retorna False se o aluno não estava matriculado."""
+        if aluno not in self._alunos_matriculados:
+            return False
+        self._alunos_matriculados.remove(aluno)
+        if aluno.turma_associada is self:
+            aluno.turma_associada = None
+        historico = aluno._historico_frequencia
+        if historico is not None:
+            self._presencas_alunos -= historico.contar_presencas()
+            por_mes = self._presencas_alunos_por_mes
+            for chave, qtd in historico._presencas_por_mes.items():
+                por_mes[chave] -= qtd
+                if not por_mes[chave]:
+                    del por_mes[chave]
+        self._notificar()
+        return True
 
     def adicionar_professor(self, professor: Professor):
        "Cumpre a associação do diagrama: Turma -> list[Professor]."
@@ -66,6 +118,142 @@ class Turma:
            if self not in professor.turmas_associadas:
               professor.turmas_associadas.append(self) 
 
+    def remover_professor(self, professor: Professor):
+        "Desfaz o vínculo do professor com a turma, dos dois lados da associação."
+        if professor in self._professores_regentes:
+            self._professores_regentes.remove(professor)
+        if self in professor.turmas_associadas:
+            professor.turmas_associadas.remove(self)
+
+    @property
+    def total_aulas(self):
+        return len(self._diario_de_classe)
+
+    def aulas_no_mes(self, mes, ano=None):
+        "Aulas registradas no mês do ano informado (padrão: ano letivo da turma)."
+        if ano is None:
+            ano = self._ano_letivo
+        aulas = self._aulas_por_mes.get((ano, mes), 0)
+        catalogo = self._catalogo
+        if catalogo is not None and ano in catalogo.anos:
+            aulas += catalogo.aulas_no_mes(self._id_turma, mes, ano)
+        return aulas
+
+    def aulas_no_periodo(self, inicio, fim):
+        "Aulas com data entre inicio e fim (inclusive), por busca binária nas datas do diário e no arquivo anual."
+        aulas = self._datas_aulas.contar(inicio, fim)[0]
+        catalogo = self._catalogo
+        if catalogo is not None:
+            aulas += catalogo.contar_aulas(self._id_turma, inicio, fim)
+        return aulas
+
+    @classmethod
+    def usar_catalogo(cls, catalogo):
+        "Define o catálogo cujas aulas arquivadas são somadas às consultas (None: apenas a memória)."
+        cls._catalogo = catalogo
+
+    @property
+    def posicao_inicial_diario(self):
+        "Posição global da primeira aula mantida em memória (aulas de anos descartados antes dela)."
+        return self._datas_aulas.descartados
+
+    def descartar_ate(self, ano):
+        """Remove da memória o trecho inicial do diário com aulas até o fim do ano informado,
+        e o histórico dos alunos no mesmo período. Retorna a quantidade de aulas descartadas."""
+        quantidade = self._datas_aulas.prefixo_ate(date(ano, 12, 31).toordinal())
+        for aula in self._diario_de_classe[:quantidade]:
+            chave = (aula["data"].year, aula["data"].month)
+            self._aulas_por_mes[chave] -= 1
+            if not self._aulas_por_mes[chave]:
+                del self._aulas_por_mes[chave]
+        del self._diario_de_classe[:quantidade]
+        self._datas_aulas.descartar_prefixo(quantidade)
+        for aluno in self._alunos_matriculados:
+            if aluno._historico_frequencia is not None:
+                aluno._historico_frequencia.descartar_ate(ano)
+        self.recalcular_contadores()
+        return quantidade
+
+    def marcar_alteracao(self, ano, mes):
+        "Incrementa a versão dos dados de frequência do mês (nova aula ou presença)."
+        chave = (ano, mes)
+        self._versoes_por_mes[chave] = self._versoes_por_mes.get(chave, 0) + 1
+        if self._ouvintes:
+            self._notificar({chave})
+
+    # ---------------------------------
+    # CONTADORES DE PRESENÇA E OUVINTES
+    # ---------------------------------
+
+    def adicionar_ouvinte(self, funcao):
+        """Registra uma função chamada como funcao(turma, meses) quando aulas, presenças ou matrículas
+        mudam; meses é o conjunto de (ano, mes) afetados, ou None quando a turma toda mudou."""
+        self._ouvintes.append(funcao)
+
+    def remover_ouvinte(self, funcao):
+        self._ouvintes.remove(funcao)
+
+    def _notificar(self, meses=None):
+        for funcao in self._ouvintes:
+            funcao(self, meses)
+
+    @property
+    def presencas_alunos(self):
+        "Total de presenças registradas pelos alunos matriculados."
+        return self._presencas_alunos
+
+    def presencas_alunos_no_mes(self, mes, ano=None):
+        "Presenças registradas pelos alunos matriculados no mês (padrão: ano letivo da turma)."
+        if ano is None:
+            ano = self._ano_letivo
+        return self._presencas_alunos_por_mes.get((ano, mes), 0)
+
+    @property
+    def meses_registrados(self):
+        "Meses (ano, mes) com aulas ou presenças registradas."
+        return set(self._aulas_por_mes) | set(self._presencas_alunos_por_mes)
+
+    def _incorporar_presencas(self, aluno):
+        "Soma aos contadores as presenças que o aluno recém-matriculado já possui."
+        historico = aluno._historico_frequencia
+        if historico is None:
+            return
+        self._presencas_alunos += historico.contar_presencas()
+        por_mes = self._presencas_alunos_por_mes
+        for chave, qtd in historico._presencas_por_mes.items():
+            por_mes[chave] = por_mes.get(chave, 0) + qtd
+
+    def contabilizar_presencas(self, registros):
+        "Atualiza versões e contadores com registros (data, presente) já gravados no histórico de um aluno."
+        meses = set()
+        por_mes = self._presencas_alunos_por_mes
+        for data, presente in registros:
+            chave = (data.year, data.month)
+            meses.add(chave)
+            if presente:
+                self._presencas_alunos += 1
+                por_mes[chave] = por_mes.get(chave, 0) + 1
+        for chave in meses:
+            self._versoes_por_mes[chave] = self._versoes_por_mes.get(chave, 0) + 1
+        if meses and self._ouvintes:
+            self._notificar(meses)
+
+    def recalcular_contadores(self):
+        "Refaz os contadores de presença a partir do histórico dos alunos matriculados."
+        self._presencas_alunos = 0
+        self._presencas_alunos_por_mes = {}
+        for aluno in self._alunos_matriculados:
+            self._incorporar_presencas(aluno)
+        self._notificar()
+
+    def versao_mes(self, ano, mes):
+        "Versão dos dados de frequência do mês; muda a cada aula ou presença registrada."
+        return self._versoes_por_mes.get((ano, mes), 0)
+
+    @property
+    def versoes_por_mes(self):
+        return self._versoes_por_mes
+
     # Métodos de Negócio definidos no UML
     def obter_quadro_horario(self):
 
@@ -79,29 +267,59 @@ class Turma:
         "Valida o professor e armazena os dados básicos da aula."
         # Validação de Segurança
         if professor not in self._professores_regentes:
-            print(f"Erro: O professor {professor.nome} não leciona nesta turma.")
+            logger.error("Erro: O professor %s não leciona nesta turma.", professor.nome)
             return False
         
         # Validação de Tipo: Garante que 'data' seja um objeto date técnico
         if not isinstance(data, date):
-            print("Erro: O campo data deve ser um objeto do tipo date (ex: date.today()).")
+            logger.error("Erro: O campo data deve ser um objeto do tipo date (ex: date.today()).")
             return False
 
         # Validação de Conteúdo (Garante que não seja vazio)
         if not conteudo or len(conteudo.strip()) < 5:
-            print(" Erro: Conteúdo insuficiente para registro.")
+            logger.error(" Erro: Conteúdo insuficiente para registro.")
             return False
         
-        nova_aula = {
+        self._anexar_aula(data, conteudo)
+        logger.info(" Aula registrada com sucesso na Turma %s (%s).", self._id_turma, data)
+        return True
+    
+    def registrar_aulas_em_lote(self, professor, aulas):
+        """Registra várias aulas (data, conteudo) de uma vez, validando o professor uma única vez.
+        Retorna a quantidade de aulas registradas; aulas com data ou conteúdo inválidos são ignoradas."""
+        if professor not in self._professores_regentes:
+            return 0
+
+        registradas = 0
+        for data, conteudo in aulas:
+            if not isinstance(data, date) or not conteudo or len(conteudo.strip()) < 5:
+                continue
+            self._anexar_aula(data, conteudo)
+            registradas += 1
+        return registradas
+
+    def restaurar_diario(self, aulas, posicao_inicial=None):
+        """Recarrega no diário aulas (data, conteudo) já validadas, ex.: vindas da persistência.
+        Em um diário vazio, posicao_inicial indica a posição global da primeira aula recarregada."""
+        if posicao_inicial:
+            self._datas_aulas.iniciar_em(posicao_inicial)
+        for data, conteudo in aulas:
+            self._anexar_aula(data, conteudo)
+
+    def _anexar_aula(self, data, conteudo):
+        "Anexa a aula ao diário e atualiza os contadores mensais."
+        self._diario_de_classe.append({
             "data": data,
             "conteudo": conteudo.strip(),
             "id_turma": self._id_turma
-        }
-        
-        self._diario_de_classe.append(nova_aula)
-        print(f" Aula registrada com sucesso na Turma {self._id_turma} ({data}).")
-        return True
-    
+        })
+        self._datas_aulas.append(data.toordinal())
+        chave = (data.year, data.month)
+        self._aulas_por_mes[chave] = self._aulas_por_mes.get(chave, 0) + 1
+        self._versoes_por_mes[chave] = self._versoes_por_mes.get(chave, 0) + 1
+        if self._ouvintes:
+            self._notificar({chave})
+
     def to_dict(self):
         "Converte os dados da turma para um dicionário."
         return {
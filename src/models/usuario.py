@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-import re
 from datetime import datetime
+from src.utils import validadores
 
 """
 Representa a entidade base para todos os usuários do sistema StudyForge. 
@@ -9,6 +9,8 @@ a todos os perfis (Professor, Aluno, Gestor e Secretario). Não deve ser
 instanciada diretamente.
 """
 class Usuario(ABC):
+    __slots__ = ("_id", "_nome", "_cpf", "_email", "_senha", "_telefone", "_data_nascimento", "_status")
+
     def __init__(self, nome, cpf, email, senha, telefone, data_nascimento, status=True):
         self._id = None 
         self.nome = nome
@@ -35,12 +37,12 @@ class Usuario(ABC):
     def nome(self, valor):
         if not isinstance(valor, str):
             raise TypeError("Erro: Nome deve ser uma string!")
-        padrao_nome = r'^[A-Za-zÀ-ÖØ-öø-ÿ\s]+$'
+        nome_formatado = validadores.normalizar_nome(valor)
 
-        if not re.match(padrao_nome, valor):
+        if nome_formatado is None:
             raise ValueError("Erro: Nome inválido! Use apenas letras.")
         else:
-            self._nome = valor.strip().title()
+            self._nome = nome_formatado
             
     @property
     def cpf(self):
@@ -51,9 +53,9 @@ class Usuario(ABC):
         if not isinstance(valor, str):
             raise TypeError("Erro: O CPF deve ser uma string!")
         
-        cpf_limpo = re.sub(r'\D', '', valor)
+        cpf_limpo = validadores.normalizar_cpf(valor)
 
-        if len(cpf_limpo) != 11:
+        if cpf_limpo is None:
             raise ValueError("Erro: O CPF deve conter exatamente 11 dígitos numéricos!")
         self._cpf = cpf_limpo
 
@@ -66,13 +68,13 @@ class Usuario(ABC):
         if not isinstance(valor, str):
             raise TypeError("Erro: O email deve ser uma string!")
 
-        padrao = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+        email_formatado = validadores.normalizar_email(valor)
 
-        if not re.match(padrao, valor):
+        if email_formatado is None:
             raise ValueError("Erro: Formato de email inválido!")
         
         else:
-            self._email = valor.lower().strip()
+            self._email = email_formatado
 
     @property
     def senha(self):
@@ -104,7 +106,7 @@ class Usuario(ABC):
         if not isinstance(valor, str):
             raise TypeError("Erro: O telefone deve ser uma string!")
         
-        tel_limpo = valor.replace("(", "").replace(")", "").replace("-", "").replace(" ", "").replace("-", "")
+        tel_limpo = validadores.limpar_telefone(valor)
 
         if not tel_limpo.isdigit():
             raise ValueError("Erro: O telefone deve conter apenas números!")
@@ -0,0 +1,185 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.configuracoes import Configuracoes
+from src.core.demanda_factory import DemandaFactory
+from src.core.saida import obter_logger
+from src.services.motor_frequencia import MotorFrequencia
+
+"""
+Agendador da verificação mensal da RN02.
+Cada turma mantém um contador de versão por (ano, mês), incrementado por Turma.registrar_aula
+(e demais caminhos que anexam aulas), por Aluno.registrar_presenca e por Turma.marcar_alteracao,
+que avisam os ouvintes da turma. O agendador, ouvinte das turmas acompanhadas, guarda os
+(turma, ano, mês) alterados em um conjunto de pendências e, a cada execução, reavalia apenas os
+que têm versão diferente da avaliada por último, sem percorrer os meses das demais turmas.
+Uma turma não recebe outra demanda pedagógica enquanto houver uma em aberto para o mesmo mês
+gerada pelo agendador ou, no repositório, uma demanda da RN02 em aberto com a mesma referência
+(turma, ano, mês), lida pelo índice por status; todas as avaliações de uma execução usam o
+mesmo instantâneo de configuração. Com `trabalhadores`, as avaliações rodam em um pool de threads.
+"""
+
+logger = obter_logger(__name__)
+
+
+class AgendadorRN02:
+    def __init__(self, repositorio=None, trabalhadores=None):
+        self.repositorio = repositorio
+        self.trabalhadores = trabalhadores
+        self.configuracoes = Configuracoes()
+        self.motor = MotorFrequencia(self.configuracoes.FREQUENCIA_MINIMA)
+
+        self._turmas = {}
+        self._municipio_da_turma = {}
+        self._versoes_avaliadas = {}
+        self._demandas_abertas = {}
+        self._alterados = set()
+        self._trava = threading.Lock()
+        self._trava_alterados = threading.Lock()
+
+    # --------
+    # CADASTRO
+    # --------
+
+    def acompanhar_turma(self, turma, id_municipio=None):
+        """Inclui a turma na verificação periódica; os meses já registrados ficam pendentes"""
+        self._municipio_da_turma[turma.id_turma] = id_municipio
+        if self._turmas.get(turma.id_turma) is turma:
+            return
+        self._turmas[turma.id_turma] = turma
+        turma.adicionar_ouvinte(self._turma_alterada)
+        self._turma_alterada(turma, None)
+
+    def deixar_de_acompanhar(self, turma):
+        if self._turmas.pop(turma.id_turma, None) is None:
+            return
+        turma.remover_ouvinte(self._turma_alterada)
+        with self._trava_alterados:
+            self._alterados = {chave for chave in self._alterados if chave[0] != turma.id_turma}
+
+    def acompanhar_escola(self, escola):
+        for turma in escola._turmas_existentes:
+            self.acompanhar_turma(turma, escola.id_municipio)
+
+    def acompanhar_municipio(self, municipio):
+        for escola in municipio.escolas_situadas:
+            self.acompanhar_escola(escola)
+
+    def registrar_demanda_aberta(self, turma, ano, mes, demanda):
+        """Informa uma demanda pedagógica já existente para a turma no mês (ex.: carregada do repositório)"""
+        self._demandas_abertas[(turma.id_turma, ano, mes)] = demanda
+
+    # ----------
+    # PENDÊNCIAS
+    # ----------
+
+    def _turma_alterada(self, turma, meses):
+        """Ouvinte da turma: marca como pendentes os meses afetados (todos, quando meses é None)"""
+        if meses is None:
+            meses = list(turma.versoes_por_mes)
+        with self._trava_alterados:
+            self._alterados.update((turma.id_turma, ano, mes) for ano, mes in meses)
+
+    def _selecionar(self, ano, mes, retirar):
+        """(turma, ano, mes, versao) pendentes no filtro; com retirar, saem do conjunto de alterados"""
+        pendentes = []
+        with self._trava_alterados:
+            selecionados = [chave for chave in self._alterados
+                            if (ano is None or chave[1] == ano) and (mes is None or chave[2] == mes)]
+            if retirar:
+                self._alterados.difference_update(selecionados)
+        for chave in sorted(selecionados):
+            id_turma, ano_mes, mes_turma = chave
+            turma = self._turmas.get(id_turma)
+            if turma is None:
+                continue
+            versao = turma.versao_mes(ano_mes, mes_turma)
+            if self._versoes_avaliadas.get(chave) != versao:
+                pendentes.append((turma, ano_mes, mes_turma, versao))
+        return pendentes
+
+    def pendentes(self, ano=None, mes=None):
+        """Lista (turma, ano, mes, versao) com dados novos desde a última avaliação"""
+        return self._selecionar(ano, mes, retirar=False)
+
+    def _demanda_aberta(self, chave):
+        demanda = self._demandas_abertas.get(chave)
+        if demanda is not None and not demanda.em_aberto:
+            del self._demandas_abertas[chave]
+            return None
+        return demanda
+
+    def _meses_com_demanda_no_repositorio(self):
+        """(id_turma, ano, mes) com demanda da RN02 em aberto no repositório"""
+        chaves = set()
+        if self.repositorio is None:
+            return chaves
+        for demanda in self.repositorio.demandas_em_aberto():
+            referencia = getattr(demanda, "referencia_mensal", None)
+            turma = getattr(demanda, "turma_alvo", None)
+            if referencia is not None and hasattr(turma, "id_turma"):
+                chaves.add((turma.id_turma, *referencia))
+        return chaves
+
+    # --------
+    # EXECUÇÃO
+    # --------
+
+    def _avaliar(self, turma, ano, mes, config):
+        """Executado nos trabalhadores: retorna (media_mensal, alunos_abaixo_media) ou None sem dados."""
+        try:
+            return self.motor.resumo_mensal(turma, mes, ano, frequencia_minima=config.FREQUENCIA_MINIMA)
+        except ValueError:
+            return None
+
+    def executar(self, ano=None, mes=None):
+        """Reavalia os (turma, ano, mês) alterados e retorna o resumo com as demandas geradas"""
+        with self._trava:
+            config_global = self.configuracoes.instantaneo()
+            resumo = {"avaliadas": 0, "sem_dados": 0, "duplicadas_ignoradas": 0, "demandas": []}
+            pendentes = self._selecionar(ano, mes, retirar=True)
+            if not pendentes:
+                return resumo
+
+            configs = [config_global.para_municipio(self._municipio_da_turma.get(turma.id_turma))
+                       for turma, _, _, _ in pendentes]
+            argumentos = ([turma for turma, _, _, _ in pendentes], [ano_p for _, ano_p, _, _ in pendentes],
+                          [mes_p for _, _, mes_p, _ in pendentes], configs)
+            if self.trabalhadores:
+                with ThreadPoolExecutor(max_workers=self.trabalhadores) as executor:
+                    resultados = list(executor.map(self._avaliar, *argumentos))
+            else:
+                resultados = list(map(self._avaliar, *argumentos))
+            no_repositorio = None
+
+            for (turma, ano_p, mes_p, versao), config, resultado in zip(pendentes, configs, resultados):
+                chave = (turma.id_turma, ano_p, mes_p)
+                self._versoes_avaliadas[chave] = versao
+                if resultado is None:
+                    resumo["sem_dados"] += 1
+                    continue
+                resumo["avaliadas"] += 1
+
+                media_mensal, alunos_abaixo_media = resultado
+                if media_mensal >= config.FREQUENCIA_MINIMA:
+                    continue
+                if no_repositorio is None:
+                    no_repositorio = self._meses_com_demanda_no_repositorio()
+                if self._demanda_aberta(chave) is not None or chave in no_repositorio:
+                    resumo["duplicadas_ignoradas"] += 1
+                    continue
+
+                logger.info("Média de presença mensal da turma %s em %02d/%s: %s\n Gerando demanda pedagógica...",
+                            turma.id_turma, mes_p, ano_p, media_mensal)
+                demanda = DemandaFactory.criar_demanda("PEDAGOGICA", "SISTEMA", None, turma=turma,
+                                                       media_mensal=media_mensal,
+                                                       alunos_abaixo_media=alunos_abaixo_media,
+                                                       referencia_mensal=(ano_p, mes_p), config=config)
+                id_municipio = self._municipio_da_turma.get(turma.id_turma)
+                if id_municipio is not None:
+                    demanda.vincular_municipio(id_municipio)
+                if self.repositorio is not None:
+                    self.repositorio.adicionar_demanda(demanda, id_municipio)
+                self._demandas_abertas[chave] = demanda
+                resumo["demandas"].append(demanda)
+            return resumo
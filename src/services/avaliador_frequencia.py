@@ -1,43 +1,52 @@
 from src.core.configuracoes import Configuracoes
 from src.core.demanda_factory import DemandaFactory
+from src.services.motor_frequencia import MotorFrequencia
+from src.core.saida import obter_logger
+
+logger = obter_logger(__name__)
+
 class AvaliadorFrequencia:
     def __init__(self):
         config = Configuracoes()
-        self.frequencia_minima = config.FREQUENCIA_MINIMA
+        self._config = config.instantaneo()
+        self.motor = MotorFrequencia(self._config.FREQUENCIA_MINIMA)
+        config.assinar(self._atualizar_configuracao)
+
+    def _atualizar_configuracao(self, instantaneo):
+        """Invalida os limites em cache quando um novo instantâneo é publicado"""
+        if instantaneo.versao > self._config.versao:
+            self._config = instantaneo
+            self.motor.frequencia_minima = instantaneo.FREQUENCIA_MINIMA
+
+    @property
+    def frequencia_minima(self):
+        return self._config.FREQUENCIA_MINIMA
 
     """Método para cálculo da quantidade de aulas em um mês de uma turma,
     permitindo saber a presença individual e coletiva mensal."""
-    def aulas_mes_turma(self, turma, mes):
-        total_aulas_mes = 0
-        for aula in turma._diario_de_classe:
-            if aula["data"].month == mes:
-                total_aulas_mes += 1
-
-        return total_aulas_mes
+    def aulas_mes_turma(self, turma, mes, ano=None):
+        return turma.aulas_no_mes(mes, ano)
     
 
-    """Calcula a quantidade de presenças no mês de um aluno"""
-    def presencas_mes_aluno(self, aluno, mes):
-        total_presencas_mes_aluno = 0
-        for presenca in aluno.presenca:
-            if presenca["data"].month == mes and presenca["presenca"] is True:
-                total_presencas_mes_aluno += 1
-
-        return total_presencas_mes_aluno
+    """Calcula a quantidade de presenças no mês de um aluno (padrão: ano letivo da turma do aluno)"""
+    def presencas_mes_aluno(self, aluno, mes, ano=None):
+        return aluno.presenca.presencas_mes(mes, ano)
 
-    def media_presenca_mensal_aluno(self, aluno, turma, mes):
-        aulas_mes_turma = self.aulas_mes_turma(turma,mes)
+    def media_presenca_mensal_aluno(self, aluno, turma, mes, ano=None):
+        if ano is None:
+            ano = turma.ano_letivo
+        aulas_mes_turma = self.aulas_mes_turma(turma, mes, ano)
         if aulas_mes_turma != 0:
-            return (self.presencas_mes_aluno(aluno, mes)) / aulas_mes_turma
+            return (self.presencas_mes_aluno(aluno, mes, ano)) / aulas_mes_turma
         else:
             raise ValueError ("Não existem aulas registradas")
 
     """Calcula presença média da turma em um mês"""
-    def media_presenca_mensal_turma(self, turma, mes):
+    def media_presenca_mensal_turma(self, turma, mes, ano=None):
         total_alunos = len(turma._alunos_matriculados)
         somatorio_media_alunos = 0
         for aluno in turma._alunos_matriculados:
-           somatorio_media_alunos += self.media_presenca_mensal_aluno(aluno, turma, mes)
+           somatorio_media_alunos += self.media_presenca_mensal_aluno(aluno, turma, mes, ano)
         
         if total_alunos != 0:
             return somatorio_media_alunos / total_alunos
@@ -45,20 +54,24 @@ class AvaliadorFrequencia:
             raise ValueError ("Não existem alunos registradas")
 
     """Calcula a quantidade de alunos que ficaram com presença abaixo da mínima em um mês"""
-    def qtd_alunos_abaixo_media_frequencia(self, turma, mes):
+    def qtd_alunos_abaixo_media_frequencia(self, turma, mes, ano=None):
         qtd_media_abaixo = 0
         for aluno in turma._alunos_matriculados:
-            if self.media_presenca_mensal_aluno(aluno, turma, mes) < self.frequencia_minima:
+            if self.media_presenca_mensal_aluno(aluno, turma, mes, ano) < self.frequencia_minima:
                 qtd_media_abaixo +=1
         return qtd_media_abaixo
             
     """Valida a RN02, verificando a media de frequencia mensal da turma e 
     gerando uma demanda automaticamente caso esteja abaixo do limite"""   
-    def verificar_media_frequencia_mensal(self, turma, mes):
-        media_mensal = self.media_presenca_mensal_turma(turma, mes)
-        if media_mensal < self.frequencia_minima:
-            print(f"Média de presença mensal da turma {media_mensal}\n Gerando demanda pedagógica...")
-            alunos_abaixo_media = self.qtd_alunos_abaixo_media_frequencia(turma, mes)
+    def verificar_media_frequencia_mensal(self, turma, mes, id_municipio=None, ano=None):
+        config = self._config.para_municipio(id_municipio)
+        if ano is None:
+            ano = turma.ano_letivo
+        media_mensal, alunos_abaixo_media = self.motor.resumo_mensal(
+            turma, mes, ano, frequencia_minima=config.FREQUENCIA_MINIMA)
+        if media_mensal < config.FREQUENCIA_MINIMA:
+            logger.info("Média de presença mensal da turma %s\n Gerando demanda pedagógica...", media_mensal)
             demanda_evasao = DemandaFactory.criar_demanda("PEDAGOGICA", "SISTEMA", None,turma=turma, 
-                                               media_mensal=media_mensal, alunos_abaixo_media=alunos_abaixo_media)
+                                               media_mensal=media_mensal, alunos_abaixo_media=alunos_abaixo_media,
+                                               referencia_mensal=(ano, mes), config=config)
             return demanda_evasao
\ No newline at end of file
@@ -0,0 +1,161 @@
+import threading
+
+from src.core.configuracoes import Configuracoes
+from src.core.demanda_factory import DemandaFactory
+from src.core.saida import obter_logger
+from src.services.motor_notas import obter_motor_notas
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+Avaliação contínua da RN03 (lacuna de aprendizagem) a partir das notas.
+O motor de notas mantém, por turma, a quantidade de alunos com média abaixo de MEDIA_MINIMA;
+o avaliador lê esses contadores em O(1) e calcula o índice de lacuna de todas as turmas
+acompanhadas em uma única passada vetorizada (NumPy, quando instalado; senão, em Python puro),
+comparando com INDICE_LACUNA_MINIMO de cada município. Só são reavaliadas as turmas cujas notas,
+matrículas ou configuração mudaram desde a última execução. Uma demanda pedagógica é criada pela
+DemandaFactory apenas quando a turma cruza o limite (estava abaixo e passou a atingi-lo) e não
+tem demanda de lacuna ainda aberta (status fora de Demanda.STATUS_FINAIS, inclusive "EM ANDAMENTO"
+e "REFORÇO APROVADO"); ao voltar para baixo do limite, a turma pode gerar outra.
+"""
+
+logger = obter_logger(__name__)
+
+
+class AvaliadorLacunas:
+    def __init__(self, motor_notas=None, repositorio=None):
+        self.motor_notas = motor_notas if motor_notas is not None else obter_motor_notas()
+        self.repositorio = repositorio
+        configuracoes = Configuracoes()
+        self._config = configuracoes.instantaneo()
+        configuracoes.assinar(self._atualizar_configuracao)
+
+        self._turmas = {}
+        self._municipio_da_turma = {}
+        self._estados_avaliados = {}
+        self._em_lacuna = set()
+        self._demandas_abertas = {}
+        self._trava = threading.Lock()
+
+    def _atualizar_configuracao(self, instantaneo):
+        """Com um novo instantâneo, todas as turmas voltam a ser reavaliadas na próxima execução"""
+        if instantaneo.versao > self._config.versao:
+            self._config = instantaneo
+
+    @property
+    def indice_lacuna_minimo(self):
+        return self._config.INDICE_LACUNA_MINIMO
+
+    # --------
+    # CADASTRO
+    # --------
+
+    def acompanhar_turma(self, turma, id_municipio=None):
+        """Inclui a turma na avaliação contínua"""
+        self._turmas[turma.id_turma] = turma
+        self._municipio_da_turma[turma.id_turma] = id_municipio
+
+    def acompanhar_escola(self, escola):
+        for turma in escola._turmas_existentes:
+            self.acompanhar_turma(turma, escola.id_municipio)
+
+    def acompanhar_municipio(self, municipio):
+        for escola in municipio.escolas_situadas:
+            self.acompanhar_escola(escola)
+
+    def registrar_demanda_aberta(self, turma, demanda):
+        """Informa uma demanda de lacuna já existente para a turma (ex.: carregada do repositório)"""
+        self._demandas_abertas[turma.id_turma] = demanda
+        self._em_lacuna.add(turma.id_turma)
+
+    def _demanda_aberta(self, id_turma):
+        demanda = self._demandas_abertas.get(id_turma)
+        if demanda is not None and not demanda.em_aberto:
+            del self._demandas_abertas[id_turma]
+            return None
+        return demanda
+
+    # ----------
+    # PENDÊNCIAS
+    # ----------
+
+    def _estado(self, turma, config):
+        return self.motor_notas.versao(turma.id_turma), len(turma._alunos_matriculados), config.versao
+
+    def pendentes(self, turmas=None):
+        """Lista as turmas com notas, matrículas ou configuração alteradas desde a última avaliação"""
+        turmas = self._turmas.values() if turmas is None else turmas
+        return [turma for turma in turmas
+                if self._estados_avaliados.get(turma.id_turma) != self._estado(turma, self._config)]
+
+    # --------
+    # EXECUÇÃO
+    # --------
+
+    @staticmethod
+    def _detectar(abaixo, totais, limites):
+        """Passada vetorizada: (índices de lacuna, lacuna detectada) de todas as turmas; índice None sem alunos."""
+        if np is not None:
+            abaixo = np.asarray(abaixo, dtype=float)
+            totais = np.asarray(totais, dtype=float)
+            com_alunos = totais > 0
+            indices = np.divide(abaixo, totais, out=np.zeros_like(abaixo), where=com_alunos)
+            detectadas = com_alunos & (indices >= np.asarray(limites, dtype=float))
+            return ([float(i) if c else None for i, c in zip(indices.tolist(), com_alunos.tolist())],
+                    detectadas.tolist())
+        indices = [a / t if t else None for a, t in zip(abaixo, totais)]
+        return indices, [i is not None and i >= limite for i, limite in zip(indices, limites)]
+
+    def executar(self, turmas=None):
+        """Reavalia as turmas alteradas (padrão: todas as acompanhadas) e retorna o resumo com as demandas geradas"""
+        with self._trava:
+            config_global = self._config
+            resumo = {"avaliadas": 0, "sem_dados": 0, "duplicadas_ignoradas": 0, "demandas": []}
+            pendentes = self.pendentes(turmas)
+            if not pendentes:
+                return resumo
+
+            configs = [config_global.para_municipio(self._municipio_da_turma.get(turma.id_turma))
+                       for turma in pendentes]
+            abaixo = [self.motor_notas.alunos_abaixo_media(turma.id_turma) for turma in pendentes]
+            totais = [len(turma._alunos_matriculados) for turma in pendentes]
+            indices, detectadas = self._detectar(abaixo, totais, [c.INDICE_LACUNA_MINIMO for c in configs])
+
+            for turma, config, qtd_abaixo, total, indice, detectada in zip(
+                    pendentes, configs, abaixo, totais, indices, detectadas):
+                id_turma = turma.id_turma
+                self._estados_avaliados[id_turma] = self._estado(turma, config_global)
+                if indice is None or not self.motor_notas.disciplinas(id_turma):
+                    resumo["sem_dados"] += 1
+                    continue
+                resumo["avaliadas"] += 1
+
+                if not detectada:
+                    self._em_lacuna.discard(id_turma)
+                    continue
+                if id_turma in self._em_lacuna or self._demanda_aberta(id_turma) is not None:
+                    resumo["duplicadas_ignoradas"] += 1
+                    continue
+
+                logger.info("Índice de lacuna da turma %s: %s\n Gerando demanda pedagógica...", id_turma, indice)
+                demanda = DemandaFactory.criar_demanda("PEDAGOGICA", "SISTEMA", None, turma=turma,
+                                                       indice_lacuna=indice, alunos_abaixo_media=qtd_abaixo,
+                                                       config=config)
+                id_municipio = self._municipio_da_turma.get(id_turma)
+                if id_municipio is not None:
+                    demanda.vincular_municipio(id_municipio)
+                if self.repositorio is not None:
+                    self.repositorio.adicionar_demanda(demanda, id_municipio)
+                self._em_lacuna.add(id_turma)
+                self._demandas_abertas[id_turma] = demanda
+                resumo["demandas"].append(demanda)
+            return resumo
+
+    def avaliar_municipio(self, municipio):
+        """Acompanha e avalia, em uma única passada, todas as turmas do município"""
+        self.acompanhar_municipio(municipio)
+        turmas = [turma for escola in municipio.escolas_situadas for turma in escola._turmas_existentes]
+        return self.executar(turmas)
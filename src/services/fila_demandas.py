@@ -0,0 +1,116 @@
+import heapq
+import threading
+from itertools import count
+
+"""
+Fila de demandas por município e status, com heap de prioridade.
+Cada par (id_municipio, status) tem seu próprio heap, ordenado pela prioridade
+(MAXIMA > ALTA > NORMAL) e, em seguida, pela idade da demanda (AuditMixin._criado_em).
+Retirar as k demandas do topo custa O(k log n), sem reordenar o acúmulo inteiro.
+Mudanças de status feitas fora da fila chegam por um ouvinte registrado na demanda, que a
+empilha no heap do novo status; a entrada antiga é descartada quando chega ao topo do heap
+anterior. Uma trava protege heaps e posições, pois o ouvinte pode ser chamado por várias threads
+ao mesmo tempo (ex.: ProcessadorDemandas com pool de threads).
+"""
+class FilaDemandas:
+    PESOS_PRIORIDADE = {"MAXIMA": 0, "CRÍTICO": 0, "ALTA": 1, "NORMAL": 2}
+
+    def __init__(self, repositorio=None):
+        self.repositorio = repositorio
+        self._heaps = {}
+        self._posicoes = {}
+        self._sequencia = count()
+        # reentrante: o ouvinte de status pode ser chamado com a trava já obtida pela própria fila
+        self._trava = threading.RLock()
+
+    def _peso(self, demanda):
+        return self.PESOS_PRIORIDADE.get(demanda.prioridade, len(self.PESOS_PRIORIDADE))
+
+    def _municipio(self, demanda):
+        if self.repositorio is not None:
+            return self.repositorio.resolver_municipio_demanda(demanda)
+        return demanda.id_municipio
+
+    def _empilhar(self, demanda, id_municipio, status):
+        sequencia = next(self._sequencia)
+        entrada = (self._peso(demanda), demanda._criado_em, sequencia, demanda)
+        heapq.heappush(self._heaps.setdefault((id_municipio, status), []), entrada)
+        self._posicoes[demanda.id_demanda] = (id_municipio, status, sequencia)
+
+    def adicionar(self, demanda, id_municipio=None):
+        """Enfileira a demanda no heap do seu município e status atual"""
+        if id_municipio is None:
+            id_municipio = self._municipio(demanda)
+        with self._trava:
+            if demanda.id_demanda in self._posicoes:
+                raise ValueError(f"Erro: Demanda {demanda.id_demanda} já está na fila!")
+            self._empilhar(demanda, id_municipio, demanda.status)
+            demanda.adicionar_ouvinte_status(self._status_alterado)
+
+    def _status_alterado(self, demanda, status_anterior):
+        """Ouvinte de Demanda.atualizar_status: move a demanda para o heap do novo status"""
+        with self._trava:
+            posicao = self._posicoes.get(demanda.id_demanda)
+            if posicao is not None and posicao[1] != demanda.status:
+                self._empilhar(demanda, posicao[0], demanda.status)
+
+    def adicionar_varias(self, demandas):
+        for demanda in demandas:
+            self.adicionar(demanda)
+
+    def atualizar_status(self, demanda, novo_status, usuario=None):
+        """Altera o status de uma demanda da fila; o ouvinte a move para o heap correspondente."""
+        if demanda.id_demanda not in self._posicoes:
+            raise ValueError(f"Erro: Demanda {demanda.id_demanda} não está na fila!")
+        demanda.atualizar_status(novo_status, usuario)
+
+    def _limpar_topo(self, chave):
+        """Remove do topo entradas obsoletas (demanda retirada ou com status alterado)."""
+        heap = self._heaps.get(chave)
+        while heap:
+            _, _, sequencia, demanda = heap[0]
+            vigente = self._posicoes.get(demanda.id_demanda, (None, None, None))[2] == sequencia
+            if vigente and demanda.status == chave[1]:
+                return heap
+            heapq.heappop(heap)
+            if vigente:
+                # o status mudou fora da fila: a demanda passa para o heap do novo status
+                self._empilhar(demanda, chave[0], demanda.status)
+        return heap
+
+    def retirar_proximas(self, id_municipio, k=1, status="ABERTO"):
+        """Remove e retorna até k demandas de maior prioridade do município no status informado"""
+        chave = (id_municipio, status.upper())
+        retiradas = []
+        with self._trava:
+            while len(retiradas) < k:
+                heap = self._limpar_topo(chave)
+                if not heap:
+                    break
+                demanda = heapq.heappop(heap)[3]
+                del self._posicoes[demanda.id_demanda]
+                demanda.remover_ouvinte_status(self._status_alterado)
+                retiradas.append(demanda)
+        return retiradas
+
+    def proxima(self, id_municipio, status="ABERTO"):
+        """Retorna, sem remover, a demanda de maior prioridade do município no status informado"""
+        with self._trava:
+            heap = self._limpar_topo((id_municipio, status.upper()))
+            return heap[0][3] if heap else None
+
+    def remover(self, demanda):
+        """Retira a demanda da fila; a entrada no heap é descartada ao chegar ao topo"""
+        with self._trava:
+            demanda.remover_ouvinte_status(self._status_alterado)
+            return self._posicoes.pop(demanda.id_demanda, None) is not None
+
+    def __contains__(self, demanda):
+        return demanda.id_demanda in self._posicoes
+
+    def __len__(self):
+        return len(self._posicoes)
+
+    def municipios(self):
+        with self._trava:
+            return {posicao[0] for posicao in self._posicoes.values()}
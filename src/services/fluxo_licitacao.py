@@ -1,6 +1,15 @@
 from src.core.configuracoes import Configuracoes
 
 class FluxoLicitacao():
-    def __init__(self);
+    def __init__(self):
         config = Configuracoes()
-        self.limite_custo_demanda = config.LIMITE_CUSTO_DEMANDA
\ No newline at end of file
+        self._config = config.instantaneo()
+        config.assinar(self._atualizar_configuracao)
+
+    def _atualizar_configuracao(self, instantaneo):
+        if instantaneo.versao > self._config.versao:
+            self._config = instantaneo
+
+    @property
+    def limite_custo_demanda(self):
+        return self._config.LIMITE_CUSTO_DEMANDA
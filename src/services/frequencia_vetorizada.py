@@ -0,0 +1,220 @@
+from datetime import date
+
+from src.core.configuracoes import Configuracoes
+from src.core.demanda_factory import DemandaFactory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+Backend opcional (NumPy) para varreduras da RN02 em um município inteiro.
+Por padrão, os resultados são os mesmos de AvaliadorFrequencia: a taxa de cada aluno é a razão
+entre as presenças do mês e as aulas do mês da turma, lidas dos contadores mensais e empilhadas,
+para todas as turmas da escola, em arranjos sobre os quais médias e alunos abaixo da frequência
+mínima saem de reduções vetorizadas (bincount).
+Com somente_aulas_do_diario=True, a frequência de cada turma é empacotada em uma matriz booleana
+aluno × aula do mês, montada direto do armazenamento compacto do histórico (ordinais e bitset);
+nesse modo, presenças em datas sem aula no diário da turma não entram na taxa e o k-ésimo
+registro de uma data ocupa a k-ésima aula dela (excedentes são ignorados).
+"""
+class AvaliadorFrequenciaVetorizado:
+    def __init__(self, somente_aulas_do_diario=False):
+        if np is None:
+            raise ImportError("Erro: O backend vetorizado de frequência requer o pacote numpy instalado.")
+        self.configuracoes = Configuracoes()
+        self.somente_aulas_do_diario = somente_aulas_do_diario
+
+    @staticmethod
+    def _no_periodo(data, mes, ano):
+        return data.month == mes and data.year == ano
+
+    @staticmethod
+    def _ano(turma, ano):
+        """Ano consultado: o informado ou, por padrão, o ano letivo da turma."""
+        return turma.ano_letivo if ano is None else ano
+
+    def _aulas_por_data(self, turma, mes, ano=None):
+        """Quantidade de aulas do diário da turma por data (ordinal) no mês."""
+        ano = self._ano(turma, ano)
+        aulas = {}
+        for aula in turma._diario_de_classe:
+            data = aula["data"]
+            if self._no_periodo(data, mes, ano):
+                ordinal = data.toordinal()
+                aulas[ordinal] = aulas.get(ordinal, 0) + 1
+        return aulas
+
+    @staticmethod
+    def _colunas(aulas_por_data):
+        """Uma coluna por aula: (data, k) para a k-ésima aula de cada data."""
+        colunas = {}
+        proxima = 0
+        for ordinal in sorted(aulas_por_data):
+            colunas[ordinal] = (proxima, aulas_por_data[ordinal])
+            proxima += aulas_por_data[ordinal]
+        return colunas, proxima
+
+    @staticmethod
+    def _registros_do_mes(aluno, mes, ano):
+        """(ordinais, presentes) dos registros do aluno no mês, lidos direto do array de datas e do bitset."""
+        historico = aluno._historico_frequencia
+        if historico is None or not len(historico):
+            return np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=bool)
+        ordinais, bitset = historico.dados_compactos()
+        quantidade = len(ordinais)
+        ordinais = np.frombuffer(ordinais, dtype=np.uint32, count=quantidade)
+        presentes = np.unpackbits(np.frombuffer(bitset, dtype=np.uint8),
+                                  bitorder="little")[:quantidade].astype(bool)
+        inicio = date(ano, mes, 1).toordinal()
+        fim = date(ano + mes // 12, mes % 12 + 1, 1).toordinal()
+        no_mes = (ordinais >= inicio) & (ordinais < fim)
+        return ordinais[no_mes], presentes[no_mes]
+
+    def _preencher_presencas(self, matriz, linha, aluno, colunas, mes, ano):
+        """Marca as presenças do aluno; o k-ésimo registro de uma data ocupa a k-ésima aula dela."""
+        if not colunas:
+            return
+        ordinais, presentes = self._registros_do_mes(aluno, mes, ano)
+        if not len(ordinais):
+            return
+        ordem = np.argsort(ordinais, kind="stable")
+        ordinais, presentes = ordinais[ordem], presentes[ordem]
+        # k: posição do registro entre os registros da mesma data
+        _, primeiros, contagens = np.unique(ordinais, return_index=True, return_counts=True)
+        k = np.arange(len(ordinais)) - np.repeat(primeiros, contagens)
+
+        datas_aula = np.fromiter(sorted(colunas), dtype=np.int64, count=len(colunas))
+        inicios = np.array([colunas[o][0] for o in datas_aula.tolist()], dtype=np.int64)
+        qtds = np.array([colunas[o][1] for o in datas_aula.tolist()], dtype=np.int64)
+        posicoes = np.minimum(np.searchsorted(datas_aula, ordinais), len(datas_aula) - 1)
+        validos = presentes & (datas_aula[posicoes] == ordinais) & (k < qtds[posicoes])
+        matriz[linha, inicios[posicoes[validos]] + k[validos]] = True
+
+    def matriz_turma(self, turma, mes, ano=None):
+        """Retorna a matriz booleana alunos × aulas do mês da turma."""
+        colunas, total_aulas = self._colunas(self._aulas_por_data(turma, mes, ano))
+
+        alunos = turma._alunos_matriculados
+        matriz = np.zeros((len(alunos), total_aulas), dtype=bool)
+        for i, aluno in enumerate(alunos):
+            self._preencher_presencas(matriz, i, aluno, colunas, mes, self._ano(turma, ano))
+        return matriz
+
+    def taxas_mensais_turma(self, turma, mes, ano=None):
+        """Taxa de presença mensal de cada aluno da turma."""
+        if not self.somente_aulas_do_diario:
+            ano = self._ano(turma, ano)
+            aulas = turma.aulas_no_mes(mes, ano)
+            if aulas == 0:
+                raise ValueError ("Não existem aulas registradas")
+            return np.array([aluno._historico_frequencia.presencas_mes(mes, ano)
+                             if aluno._historico_frequencia is not None else 0
+                             for aluno in turma._alunos_matriculados], dtype=float) / aulas
+        matriz = self.matriz_turma(turma, mes, ano)
+        if matriz.shape[1] == 0:
+            raise ValueError ("Não existem aulas registradas")
+        return matriz.sum(axis=1) / matriz.shape[1]
+
+    def matriz_escola(self, escola, mes, ano=None):
+        """Empilha as turmas da escola em um único arranjo.
+        Retorna (matriz, aulas, turma_por_aluno, turmas): matriz é alunos × aulas, com
+        as colunas formadas pela união das aulas de todas as turmas; aulas é a máscara
+        turmas × colunas indicando as aulas de cada turma; turma_por_aluno indica a
+        linha de aulas correspondente a cada aluno."""
+        turmas = list(escola._turmas_existentes)
+        aulas_turmas = [self._aulas_por_data(turma, mes, ano) for turma in turmas]
+
+        aulas_por_data = {}
+        for aulas_turma in aulas_turmas:
+            for ordinal, qtd in aulas_turma.items():
+                aulas_por_data[ordinal] = max(qtd, aulas_por_data.get(ordinal, 0))
+        colunas, total_colunas = self._colunas(aulas_por_data)
+
+        aulas = np.zeros((len(turmas), total_colunas), dtype=bool)
+        for t, aulas_turma in enumerate(aulas_turmas):
+            for ordinal, qtd in aulas_turma.items():
+                inicio = colunas[ordinal][0]
+                aulas[t, inicio:inicio + qtd] = True
+
+        qtd_alunos = [len(turma._alunos_matriculados) for turma in turmas]
+        turma_por_aluno = np.repeat(np.arange(len(turmas)), qtd_alunos)
+        matriz = np.zeros((len(turma_por_aluno), total_colunas), dtype=bool)
+
+        linha = 0
+        for turma, aulas_turma in zip(turmas, aulas_turmas):
+            colunas_turma = {ordinal: (colunas[ordinal][0], qtd) for ordinal, qtd in aulas_turma.items()}
+            for aluno in turma._alunos_matriculados:
+                self._preencher_presencas(matriz, linha, aluno, colunas_turma, mes, self._ano(turma, ano))
+                linha += 1
+
+        return matriz, aulas, turma_por_aluno, turmas
+
+    @property
+    def frequencia_minima(self):
+        return self.configuracoes.FREQUENCIA_MINIMA
+
+    def _contadores_escola(self, escola, mes, ano=None):
+        """Presenças do mês de cada aluno e aulas do mês de cada turma, pelos contadores mensais
+        (mesmos valores usados por AvaliadorFrequencia). Retorna (presencas, aulas, turma_por_aluno, turmas)."""
+        turmas = list(escola._turmas_existentes)
+        aulas = np.array([turma.aulas_no_mes(mes, self._ano(turma, ano)) for turma in turmas], dtype=float)
+        qtd_alunos = [len(turma._alunos_matriculados) for turma in turmas]
+        turma_por_aluno = np.repeat(np.arange(len(turmas)), qtd_alunos)
+        presencas = np.fromiter(
+            (aluno._historico_frequencia.presencas_mes(mes, self._ano(turma, ano))
+             if aluno._historico_frequencia is not None else 0
+             for turma in turmas for aluno in turma._alunos_matriculados),
+            dtype=float, count=len(turma_por_aluno))
+        return presencas, aulas, turma_por_aluno, turmas
+
+    def resumo_escola(self, escola, mes, ano=None, frequencia_minima=None):
+        """Calcula, de forma vetorizada, o resumo mensal de cada turma da escola.
+        Retorna uma lista de (turma, media_mensal, alunos_abaixo_media) apenas para
+        turmas com alunos e aulas no período."""
+        if frequencia_minima is None:
+            frequencia_minima = self.frequencia_minima
+        if self.somente_aulas_do_diario:
+            matriz, aulas, turma_por_aluno, turmas = self.matriz_escola(escola, mes, ano)
+            presencas = matriz.sum(axis=1)
+            total_aulas_turma = aulas.sum(axis=1)
+        else:
+            presencas, total_aulas_turma, turma_por_aluno, turmas = self._contadores_escola(escola, mes, ano)
+        if not turmas:
+            return []
+
+        qtd_alunos_turma = np.bincount(turma_por_aluno, minlength=len(turmas))
+        aulas_aluno = total_aulas_turma[turma_por_aluno]
+        taxas = np.divide(presencas, aulas_aluno, out=np.zeros(len(presencas)), where=aulas_aluno > 0)
+
+        somatorio_taxas = np.bincount(turma_por_aluno, weights=taxas, minlength=len(turmas))
+        abaixo_media = np.bincount(turma_por_aluno, weights=taxas < frequencia_minima,
+                                   minlength=len(turmas))
+
+        avaliaveis = (qtd_alunos_turma > 0) & (total_aulas_turma > 0)
+        medias = np.divide(somatorio_taxas, qtd_alunos_turma, out=np.zeros(len(turmas)), where=avaliaveis)
+
+        return [(turmas[t], float(medias[t]), int(abaixo_media[t])) for t in np.flatnonzero(avaliaveis)]
+
+    def verificar_escola(self, escola, mes, ano=None, config=None):
+        """Aplica a RN02 a todas as turmas da escola e retorna as demandas geradas.
+        Todo o lote usa um único instantâneo de configuração, com as sobrescritas do município."""
+        config = (config or self.configuracoes.instantaneo()).para_municipio(escola.id_municipio)
+        demandas = []
+        for turma, media_mensal, alunos_abaixo_media in self.resumo_escola(escola, mes, ano,
+                                                                           config.FREQUENCIA_MINIMA):
+            if media_mensal < config.FREQUENCIA_MINIMA:
+                demandas.append(DemandaFactory.criar_demanda("PEDAGOGICA", "SISTEMA", None, turma=turma,
+                                                             media_mensal=media_mensal,
+                                                             alunos_abaixo_media=alunos_abaixo_media,
+                                                             config=config))
+        return demandas
+
+    def verificar_municipio(self, municipio, mes, ano=None):
+        """Aplica a RN02 a todas as turmas de todas as escolas do município."""
+        config = self.configuracoes.instantaneo()
+        demandas = []
+        for escola in municipio.escolas_situadas:
+            demandas.extend(self.verificar_escola(escola, mes, ano, config))
+        return demandas
@@ -0,0 +1,207 @@
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from src.models.aluno import Aluno
+from src.models.professor import Professor
+from src.utils.validadores import validar_cpfs, normalizar_cpf
+
+"""
+Importação em massa de alunos e professores a partir de arquivos CSV ou JSONL.
+O arquivo é lido em streaming e dividido em lotes (pipeline de geradores); cada lote é
+validado em um pool de trabalhadores, construindo os objetos com as mesmas regras dos
+setters de Usuario, Aluno e Professor. No máximo 2 × trabalhadores lotes ficam em trânsito,
+de modo que o pico de memória não depende do tamanho do arquivo. Alunos e professores com
+id_turma são vinculados às turmas (professores apenas em turmas da escola do gestor) e as
+linhas rejeitadas são reportadas com o motivo.
+A validação é CPU-bound em Python puro: por padrão, arquivos a partir de LIMIAR_PROCESSOS bytes
+usam um pool de processos (threads não validam em paralelo por causa do GIL) e os menores, um
+pool de threads, que evita o custo de iniciar processos; o pool usado é informado no resumo.
+"""
+
+CAMPOS_USUARIO = ("nome", "cpf", "email", "senha", "telefone", "data_nascimento")
+CAMPOS_ALUNO = CAMPOS_USUARIO + ("id_matricula",)
+CAMPOS_PROFESSOR = CAMPOS_USUARIO + ("registro_funcional", "titulacao", "area_atuacao", "salario")
+
+
+def _normalizar_status(valor):
+    if isinstance(valor, bool) or valor is None:
+        return True if valor is None else valor
+    return str(valor).strip().lower() not in ("false", "0", "inativo", "nao", "não")
+
+
+def _construir_usuario(tipo, linha):
+    """Constrói um Aluno ou Professor a partir de uma linha do arquivo."""
+    if tipo == "ALUNO":
+        dados = {campo: linha[campo] for campo in CAMPOS_ALUNO}
+        dados["status"] = _normalizar_status(linha.get("status"))
+        return Aluno(**dados)
+
+    if tipo == "PROFESSOR":
+        dados = {campo: linha[campo] for campo in CAMPOS_PROFESSOR}
+        salario = dados["salario"]
+        dados["salario"] = float(salario) if isinstance(salario, str) else salario
+        dados["status"] = _normalizar_status(linha.get("status"))
+        # a escola é atribuída no processo principal, a partir do gestor responsável
+        dados["escola_associada"] = linha.get("id_escola") or "PENDENTE"
+        return Professor(**dados)
+
+    raise ValueError(f"Erro: Tipo de usuário inválido: {tipo!r} (use ALUNO ou PROFESSOR).")
+
+
+def _validar_lote(tipo_padrao, lote, verificar_digitos_cpf=False):
+    """Executado nos trabalhadores: retorna (numero_linha, usuario, id_turma, motivo) por linha.
+    Com verificar_digitos_cpf, os dígitos verificadores da coluna de CPFs do lote são
+    conferidos de uma só vez antes da construção dos objetos."""
+    cpfs_validos = [True] * len(lote)
+    if verificar_digitos_cpf:
+        cpfs = [linha.get("cpf") if linha else None for _, linha, _ in lote]
+        # valores ausentes ou fora do padrão seguem para os setters, que informam o motivo
+        cpfs_validos = [normalizado is not None or not isinstance(cpf, str) or normalizar_cpf(cpf) is None
+                        for cpf, normalizado in zip(cpfs, validar_cpfs(cpfs))]
+
+    resultados = []
+    for (numero, linha, erro_leitura), cpf_valido in zip(lote, cpfs_validos):
+        if erro_leitura:
+            resultados.append((numero, None, None, erro_leitura))
+            continue
+        if not cpf_valido:
+            resultados.append((numero, None, None, "Erro: CPF inválido (dígitos verificadores não conferem)!"))
+            continue
+        try:
+            tipo = str(linha.get("tipo") or tipo_padrao or "").strip().upper()
+            usuario = _construir_usuario(tipo, linha)
+            resultados.append((numero, usuario, linha.get("id_turma") or None, None))
+        except KeyError as e:
+            resultados.append((numero, None, None, f"Erro: Campo obrigatório ausente: {e.args[0]}"))
+        except (ValueError, TypeError) as e:
+            resultados.append((numero, None, None, str(e)))
+    return resultados
+
+
+class ImportadorEmMassa:
+    LIMIAR_PROCESSOS = 5 * 1024 * 1024
+
+    def __init__(self, gestor, repositorio=None, tamanho_lote=1000, trabalhadores=4, usar_processos=None,
+                 verificar_digitos_cpf=False):
+        self.gestor = gestor
+        self.verificar_digitos_cpf = verificar_digitos_cpf
+        self.repositorio = repositorio
+        self.tamanho_lote = tamanho_lote
+        self.trabalhadores = trabalhadores
+        self.usar_processos = usar_processos
+
+    # -------
+    # LEITURA
+    # -------
+
+    @staticmethod
+    def ler_linhas(caminho):
+        """Gera (numero_linha, dicionario, erro_leitura) lendo o arquivo sob demanda."""
+        with open(caminho, encoding="utf-8", newline="") as arquivo:
+            if caminho.lower().endswith(".jsonl"):
+                for numero, texto in enumerate(arquivo, start=1):
+                    if not texto.strip():
+                        continue
+                    try:
+                        linha = json.loads(texto)
+                    except json.JSONDecodeError as e:
+                        yield numero, None, f"Erro: JSON inválido: {e.msg}"
+                        continue
+                    if not isinstance(linha, dict):
+                        yield numero, None, "Erro: Cada linha JSONL deve conter um objeto."
+                        continue
+                    yield numero, linha, None
+            else:
+                leitor = csv.DictReader(arquivo)
+                for linha in leitor:
+                    yield leitor.line_num, linha, None
+
+    def _lotes(self, linhas):
+        lote = []
+        for linha in linhas:
+            lote.append(linha)
+            if len(lote) >= self.tamanho_lote:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+
+    # -----------
+    # IMPORTAÇÃO
+    # -----------
+
+    def _buscar_turma(self, id_turma, turmas):
+        turma = turmas.get(id_turma)
+        if turma is None and self.repositorio is not None:
+            turma = self.repositorio.buscar_turma(id_turma)
+            if turma is not None:
+                turmas[id_turma] = turma
+        return turma
+
+    def _incorporar(self, resultados, turmas, resumo):
+        """Executado no processo principal: registra, vincula e contabiliza um lote validado."""
+        alunos_por_turma = {}
+        professores_por_turma = {}
+        for numero, usuario, id_turma, motivo in resultados:
+            if motivo is None and id_turma is not None:
+                turma = self._buscar_turma(id_turma, turmas)
+                if turma is None:
+                    motivo = f"Erro: Turma {id_turma} não encontrada."
+                elif isinstance(usuario, Professor) and turma.id_escola != self.gestor.escola_associada.id_escola:
+                    motivo = f"Erro: Turma {id_turma} não pertence à escola do gestor."
+
+            if motivo is None and self.repositorio is not None:
+                try:
+                    self.repositorio.adicionar_usuario(usuario)
+                except ValueError as e:
+                    motivo = str(e)
+
+            if motivo is not None:
+                resumo["rejeitados"].append({"linha": numero, "motivo": motivo})
+                continue
+
+            if isinstance(usuario, Professor):
+                usuario.escola_associada = self.gestor.escola_associada
+                if id_turma is not None:
+                    professores_por_turma.setdefault(id_turma, []).append(usuario)
+            elif id_turma is not None:
+                alunos_por_turma.setdefault(id_turma, []).append(usuario)
+            resumo["importados"] += 1
+
+        for id_turma, alunos in alunos_por_turma.items():
+            turmas[id_turma].adicionar_alunos_em_lote(alunos)
+        for id_turma, professores in professores_por_turma.items():
+            for professor in professores:
+                turmas[id_turma].adicionar_professor(professor)
+
+    def importar(self, caminho, tipo=None, turmas=None):
+        """Importa o arquivo e retorna o resumo da operação.
+        tipo define ALUNO ou PROFESSOR quando o arquivo não tem a coluna "tipo";
+        turmas é um dicionário opcional id_turma -> Turma usado antes do repositório."""
+        turmas = dict(turmas or {})
+        usar_processos = self.usar_processos
+        if usar_processos is None:
+            usar_processos = os.path.getsize(caminho) >= self.LIMIAR_PROCESSOS
+        resumo = {"linhas_lidas": 0, "importados": 0, "rejeitados": [],
+                  "pool": "processos" if usar_processos else "threads"}
+        inicio = time.perf_counter()
+
+        pool = ProcessPoolExecutor if usar_processos else ThreadPoolExecutor
+        with pool(max_workers=self.trabalhadores) as executor:
+            em_transito = deque()
+            for lote in self._lotes(self.ler_linhas(caminho)):
+                resumo["linhas_lidas"] += len(lote)
+                em_transito.append(executor.submit(_validar_lote, tipo, lote, self.verificar_digitos_cpf))
+                if len(em_transito) >= 2 * self.trabalhadores:
+                    self._incorporar(em_transito.popleft().result(), turmas, resumo)
+            while em_transito:
+                self._incorporar(em_transito.popleft().result(), turmas, resumo)
+
+        segundos = time.perf_counter() - inicio
+        resumo["segundos"] = round(segundos, 4)
+        resumo["linhas_por_segundo"] = round(resumo["linhas_lidas"] / segundos, 1) if segundos > 0 else 0.0
+        return resumo
@@ -0,0 +1,69 @@
+"""
+Motor de frequência de passagem única (RN02).
+Reúne, em uma única passagem pela turma, a contagem de aulas por (ano, mês) e os
+contadores de presença de cada aluno por (ano, mês), mantidos incrementalmente por
+Turma.registrar_aula e Aluno.registrar_presenca. A média da turma e a quantidade de
+alunos abaixo da frequência mínima são calculadas juntas a partir desses contadores;
+em um ano arquivado, as contagens do catálogo de arquivos da turma são somadas a eles.
+"""
+# contador compartilhado dos alunos ainda sem histórico (o histórico não é alocado só para a leitura)
+_SEM_REGISTROS = {}
+
+
+class MotorFrequencia:
+    def __init__(self, frequencia_minima):
+        self.frequencia_minima = frequencia_minima
+
+    def indexar_turma(self, turma):
+        """Reúne os contadores mensais da turma e de cada aluno em uma passagem."""
+        aulas_por_mes = turma._aulas_por_mes
+        historicos = (aluno._historico_frequencia for aluno in turma._alunos_matriculados)
+        presencas_por_aluno = [historico._presencas_por_mes if historico is not None else _SEM_REGISTROS
+                               for historico in historicos]
+        return aulas_por_mes, presencas_por_aluno
+
+    @staticmethod
+    def _contar_mes(contador, mes, ano):
+        return contador.get((ano, mes), 0)
+
+    def resumo_mensal(self, turma, mes, ano=None, indice=None, frequencia_minima=None):
+        """Retorna (media_mensal, alunos_abaixo_media) da turma no mês.
+        Sem ano informado, considera o ano letivo da turma. Um índice já construído por
+        indexar_turma pode ser reaproveitado para avaliar vários meses, e
+        frequencia_minima permite usar o limite do instantâneo de configuração do lote."""
+        if frequencia_minima is None:
+            frequencia_minima = self.frequencia_minima
+        if ano is None:
+            ano = turma.ano_letivo
+        if indice is None:
+            indice = self.indexar_turma(turma)
+        aulas_por_mes, presencas_por_aluno = indice
+
+        total_alunos = len(presencas_por_aluno)
+        if total_alunos == 0:
+            raise ValueError ("Não existem alunos registradas")
+
+        # ano arquivado: soma as contagens do catálogo, como Turma.aulas_no_mes e HistoricoFrequencia.presencas_mes
+        catalogo = turma._catalogo
+        arquivado = catalogo is not None and ano in catalogo.anos
+        aulas_mes = self._contar_mes(aulas_por_mes, mes, ano)
+        if arquivado:
+            aulas_mes += catalogo.aulas_no_mes(turma.id_turma, mes, ano)
+        if aulas_mes == 0:
+            raise ValueError ("Não existem aulas registradas")
+
+        if arquivado:
+            presencas_arquivadas = [catalogo.presencas_mes(aluno.id_matricula, mes, ano)
+                                    for aluno in turma._alunos_matriculados]
+        else:
+            presencas_arquivadas = [0] * total_alunos
+
+        somatorio_media_alunos = 0
+        alunos_abaixo_media = 0
+        for presencas_por_mes, arquivadas in zip(presencas_por_aluno, presencas_arquivadas):
+            media_aluno = (self._contar_mes(presencas_por_mes, mes, ano) + arquivadas) / aulas_mes
+            somatorio_media_alunos += media_aluno
+            if media_aluno < frequencia_minima:
+                alunos_abaixo_media += 1
+
+        return somatorio_media_alunos / total_alunos, alunos_abaixo_media
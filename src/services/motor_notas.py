@@ -0,0 +1,312 @@
+from array import array
+
+from src.core.configuracoes import Configuracoes
+
+"""
+Motor de notas (boletim) com agregados incrementais para a RN03.
+As avaliações de cada (turma, disciplina) ficam em um caderno compacto: arrays paralelos com a
+posição do aluno e a nota em centésimos (inteiros de 2 bytes), além da soma e da quantidade de
+notas de cada aluno. A cada lançamento, a média do aluno é recalculada a partir dessa soma
+(exata) e a média da disciplina e a quantidade de alunos abaixo de MEDIA_MINIMA são ajustadas
+pela diferença entre a média antiga e a nova, em O(1). Na turma, a média geral de cada aluno é
+a média das suas médias por disciplina, com os mesmos agregados. O índice de lacuna (alunos
+abaixo da média / alunos matriculados) e a comparação com INDICE_LACUNA_MINIMO saem desses
+contadores em O(1), sem percorrer os alunos. Uma nova MEDIA_MINIMA (novo instantâneo de
+configuração) refaz apenas as contagens de alunos abaixo da média. As avaliações são gravadas
+pela persistência (avaliacoes) e relançadas com restaurar quando a turma é recarregada.
+"""
+
+NOTA_MAXIMA = 10
+
+
+def _centesimos(nota):
+    if isinstance(nota, bool) or not isinstance(nota, (int, float)) or not 0 <= nota <= NOTA_MAXIMA:
+        raise ValueError(f"Erro: A nota deve ser um número entre 0 e {NOTA_MAXIMA}.")
+    return round(nota * 100)
+
+
+class CadernoNotas:
+    """Avaliações de uma disciplina em uma turma."""
+    def __init__(self, id_turma, disciplina):
+        self.id_turma = id_turma
+        self.disciplina = disciplina
+        self._posicoes = {}
+        self._alunos = []
+        self._avaliacao_aluno = array('I')
+        self._avaliacao_nota = array('H')
+        self._soma = array('I')
+        self._quantidade = array('H')
+        self.soma_medias = 0.0
+        self.alunos_com_nota = 0
+        self.abaixo = 0
+
+    def _posicao(self, id_matricula):
+        posicao = self._posicoes.get(id_matricula)
+        if posicao is None:
+            posicao = self._posicoes[id_matricula] = len(self._alunos)
+            self._alunos.append(id_matricula)
+            self._soma.append(0)
+            self._quantidade.append(0)
+        return posicao
+
+    def media_aluno(self, id_matricula):
+        posicao = self._posicoes.get(id_matricula)
+        if posicao is None or not self._quantidade[posicao]:
+            return None
+        return self._soma[posicao] / self._quantidade[posicao] / 100
+
+    def lancar(self, id_matricula, centesimos, media_minima):
+        """Registra a avaliação e retorna (media_anterior, media_nova) do aluno."""
+        posicao = self._posicao(id_matricula)
+        anterior = self.media_aluno(id_matricula)
+        self._avaliacao_aluno.append(posicao)
+        self._avaliacao_nota.append(centesimos)
+        self._soma[posicao] += centesimos
+        self._quantidade[posicao] += 1
+        nova = self._soma[posicao] / self._quantidade[posicao] / 100
+
+        if anterior is None:
+            self.alunos_com_nota += 1
+            self.soma_medias += nova
+        else:
+            self.soma_medias += nova - anterior
+            self.abaixo -= anterior < media_minima
+        self.abaixo += nova < media_minima
+        return anterior, nova
+
+    def notas_aluno(self, id_matricula):
+        posicao = self._posicoes.get(id_matricula)
+        if posicao is None:
+            return []
+        return [nota / 100 for aluno, nota in zip(self._avaliacao_aluno, self._avaliacao_nota) if aluno == posicao]
+
+    def avaliacoes_desde(self, inicio=0):
+        """Gera (id_matricula, nota) das avaliações na ordem de lançamento, a partir da posição informada."""
+        for posicao in range(inicio, len(self._avaliacao_nota)):
+            yield self._alunos[self._avaliacao_aluno[posicao]], self._avaliacao_nota[posicao] / 100
+
+    @property
+    def avaliacoes(self):
+        return len(self._avaliacao_nota)
+
+    @property
+    def media(self):
+        return self.soma_medias / self.alunos_com_nota if self.alunos_com_nota else None
+
+    def recontar(self, media_minima):
+        self.abaixo = sum(1 for soma, qtd in zip(self._soma, self._quantidade) if qtd and soma / qtd / 100 < media_minima)
+
+
+class BoletimTurma:
+    """Cadernos de uma turma e os agregados da média geral dos alunos."""
+    def __init__(self, turma, id_municipio=None):
+        self.turma = turma
+        self.id_municipio = id_municipio
+        self.cadernos = {}
+        self._medias_gerais = {}
+        self.soma_medias = 0.0
+        self.abaixo = 0
+        self.versao = 0
+
+    def media_geral_aluno(self, id_matricula):
+        medias = [media for media in (caderno.media_aluno(id_matricula) for caderno in self.cadernos.values())
+                  if media is not None]
+        return sum(medias) / len(medias) if medias else None
+
+    def atualizar_aluno(self, id_matricula, media_minima):
+        """Recalcula a média geral do aluno (média das suas médias por disciplina) e os agregados da turma."""
+        anterior = self._medias_gerais.get(id_matricula)
+        nova = self.media_geral_aluno(id_matricula)
+        self._medias_gerais[id_matricula] = nova
+        if anterior is not None:
+            self.soma_medias -= anterior
+            self.abaixo -= anterior < media_minima
+        if nova is not None:
+            self.soma_medias += nova
+            self.abaixo += nova < media_minima
+        self.versao += 1
+
+    @property
+    def alunos_com_nota(self):
+        return len(self._medias_gerais)
+
+    @property
+    def media(self):
+        return self.soma_medias / len(self._medias_gerais) if self._medias_gerais else None
+
+    def recontar(self, media_minima):
+        for caderno in self.cadernos.values():
+            caderno.recontar(media_minima)
+        self.abaixo = sum(1 for media in self._medias_gerais.values() if media < media_minima)
+        self.versao += 1
+
+
+class MotorNotas:
+    def __init__(self):
+        configuracoes = Configuracoes()
+        self._config = configuracoes.instantaneo()
+        self._boletins = {}
+        configuracoes.assinar(self._atualizar_configuracao)
+
+    def _atualizar_configuracao(self, instantaneo):
+        """Com um novo instantâneo, refaz as contagens das turmas cuja MEDIA_MINIMA mudou"""
+        if instantaneo.versao <= self._config.versao:
+            return
+        anterior, self._config = self._config, instantaneo
+        for boletim in self._boletins.values():
+            media_minima = instantaneo.para_municipio(boletim.id_municipio).MEDIA_MINIMA
+            if media_minima != anterior.para_municipio(boletim.id_municipio).MEDIA_MINIMA:
+                boletim.recontar(media_minima)
+
+    def _media_minima(self, boletim):
+        return self._config.para_municipio(boletim.id_municipio).MEDIA_MINIMA
+
+    def _boletim(self, turma, id_municipio=None):
+        boletim = self._boletins.get(turma.id_turma)
+        if boletim is None:
+            boletim = self._boletins[turma.id_turma] = BoletimTurma(turma, id_municipio)
+        elif boletim.id_municipio is None and id_municipio is not None:
+            boletim.id_municipio = id_municipio
+            boletim.recontar(self._media_minima(boletim))
+        return boletim
+
+    # -----------
+    # LANÇAMENTOS
+    # -----------
+
+    def lancar(self, turma, aluno, disciplina, nota, id_municipio=None):
+        """Registra uma avaliação do aluno na disciplina. Retorna a nova média do aluno na disciplina."""
+        return self.lancar_em_lote(turma, disciplina, [(aluno, nota)], id_municipio)[aluno.id_matricula]
+
+    def lancar_em_lote(self, turma, disciplina, notas, id_municipio=None):
+        """Registra várias avaliações (aluno, nota) de uma disciplina, validando todas antes de gravar.
+        Retorna {id_matricula: nova média na disciplina}."""
+        return self._lancar(turma, disciplina, [(aluno.id_matricula, nota) for aluno, nota in notas], id_municipio)
+
+    def restaurar(self, turma, disciplina, avaliacoes, id_municipio=None):
+        """Relança, na ordem original, avaliações (id_matricula, nota) já gravadas (ex.: vindas da
+        persistência ao recarregar a turma). Retorna a quantidade restaurada."""
+        avaliacoes = list(avaliacoes)
+        self._lancar(turma, disciplina, avaliacoes, id_municipio)
+        return len(avaliacoes)
+
+    def _lancar(self, turma, disciplina, avaliacoes, id_municipio):
+        if not isinstance(disciplina, str) or not disciplina.strip():
+            raise ValueError("Erro: Informe a disciplina da avaliação.")
+        avaliacoes = [(id_matricula, _centesimos(nota)) for id_matricula, nota in avaliacoes]
+        boletim = self._boletim(turma, id_municipio)
+        caderno = boletim.cadernos.get(disciplina)
+        if caderno is None:
+            caderno = boletim.cadernos[disciplina] = CadernoNotas(turma.id_turma, disciplina)
+
+        media_minima = self._media_minima(boletim)
+        medias = {}
+        for id_matricula, centesimos in avaliacoes:
+            _, medias[id_matricula] = caderno.lancar(id_matricula, centesimos, media_minima)
+        for id_matricula in medias:
+            boletim.atualizar_aluno(id_matricula, media_minima)
+        return medias
+
+    # --------
+    # CONSULTA
+    # --------
+
+    def turmas(self):
+        return list(self._boletins)
+
+    def disciplinas(self, id_turma):
+        boletim = self._boletins.get(id_turma)
+        return list(boletim.cadernos) if boletim is not None else []
+
+    def versao(self, id_turma):
+        """Muda a cada lançamento ou recontagem da turma (para reavaliações incrementais)"""
+        boletim = self._boletins.get(id_turma)
+        return boletim.versao if boletim is not None else 0
+
+    def _caderno(self, id_turma, disciplina):
+        boletim = self._boletins.get(id_turma)
+        return boletim.cadernos.get(disciplina) if boletim is not None else None
+
+    def total_avaliacoes(self, id_turma, disciplina):
+        caderno = self._caderno(id_turma, disciplina)
+        return caderno.avaliacoes if caderno is not None else 0
+
+    def avaliacoes(self, id_turma, disciplina, inicio=0):
+        """Gera (id_matricula, nota) das avaliações da disciplina na turma, na ordem de lançamento,
+        a partir da posição informada (usado na persistência incremental)"""
+        caderno = self._caderno(id_turma, disciplina)
+        return caderno.avaliacoes_desde(inicio) if caderno is not None else iter(())
+
+    def notas_aluno(self, id_turma, disciplina, id_matricula):
+        caderno = self._caderno(id_turma, disciplina)
+        return caderno.notas_aluno(id_matricula) if caderno is not None else []
+
+    def media_aluno(self, id_turma, id_matricula, disciplina=None):
+        """Média do aluno na disciplina ou, sem disciplina, a média das suas médias por disciplina"""
+        boletim = self._boletins.get(id_turma)
+        if boletim is None:
+            return None
+        if disciplina is None:
+            return boletim._medias_gerais.get(id_matricula)
+        caderno = boletim.cadernos.get(disciplina)
+        return caderno.media_aluno(id_matricula) if caderno is not None else None
+
+    def media(self, id_turma, disciplina=None):
+        """Média da turma (das médias dos alunos) na disciplina ou no geral; None sem notas"""
+        boletim = self._boletins.get(id_turma)
+        if boletim is None:
+            return None
+        if disciplina is None:
+            return boletim.media
+        caderno = boletim.cadernos.get(disciplina)
+        return caderno.media if caderno is not None else None
+
+    def alunos_abaixo_media(self, id_turma, disciplina=None):
+        """Alunos com média abaixo de MEDIA_MINIMA na disciplina ou no geral, em O(1)"""
+        boletim = self._boletins.get(id_turma)
+        if boletim is None:
+            return 0
+        if disciplina is None:
+            return boletim.abaixo
+        caderno = boletim.cadernos.get(disciplina)
+        return caderno.abaixo if caderno is not None else 0
+
+    def indice_lacuna(self, id_turma, disciplina=None):
+        """Alunos abaixo da média / alunos matriculados (RN03), em O(1); None sem turma ou alunos"""
+        boletim = self._boletins.get(id_turma)
+        if boletim is None:
+            return None
+        total = len(boletim.turma.alunos_matriculados)
+        return self.alunos_abaixo_media(id_turma, disciplina) / total if total else None
+
+    def verificar_lacuna(self, id_turma, disciplina=None, config=None):
+        """RN03: retorna (indice_lacuna, alunos_abaixo_media, total_alunos, lacuna_detectada), em O(1).
+        A lacuna é detectada quando o índice atinge INDICE_LACUNA_MINIMO do instantâneo informado
+        (padrão: o vigente, com as sobrescritas do município da turma)."""
+        boletim = self._boletins.get(id_turma)
+        if boletim is None:
+            return None, 0, 0, False
+        if config is None:
+            config = self._config.para_municipio(boletim.id_municipio)
+        total = len(boletim.turma.alunos_matriculados)
+        abaixo = self.alunos_abaixo_media(id_turma, disciplina)
+        indice = abaixo / total if total else None
+        return indice, abaixo, total, indice is not None and indice >= config.INDICE_LACUNA_MINIMO
+
+
+_motor_padrao = None
+
+
+def obter_motor_notas():
+    """Motor usado por Professor.lancar_nota (criado no primeiro uso)."""
+    global _motor_padrao
+    if _motor_padrao is None:
+        _motor_padrao = MotorNotas()
+    return _motor_padrao
+
+
+def configurar_motor_notas(motor):
+    """Substitui o motor de notas em uso. Retorna o novo motor."""
+    global _motor_padrao
+    _motor_padrao = motor
+    return motor
@@ -0,0 +1,148 @@
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from src.core.saida import modo_silencioso
+from src.models.demanda_infraestrutura import DemandaInfraestrutura
+
+"""
+Processamento em lote das demandas pendentes (fechamento do dia).
+As demandas são particionadas por id_municipio e cada partição é processada por um
+trabalhador do pool, na ordem em que as demandas foram recebidas; partições de municípios
+diferentes rodam em paralelo. Demandas de infraestrutura passam por Secretario.gerenciar_verba,
+cujos débitos são atômicos por município, e as pedagógicas por processar_solicitacao.
+As mensagens das demandas passam pelo logger e ficam suprimidas nas threads do lote (modo_silencioso
+em cada trabalhador e na sincronização), sem afetar o log das demais threads do processo;
+o resultado é uma tabela com uma linha por demanda, e uma falha em uma demanda fica registrada na
+coluna "erro" sem interromper as demais.
+Com usar_processos=True, cada trabalhador recebe cópias: as travas de verba do Secretario valem
+apenas dentro de um processo, e a atomicidade dos débitos vem do particionamento (um município
+inteiro por trabalhador). Ao final, o estado das cópias (status, índices e valores calculados) é
+aplicado aos objetos originais, mantendo as referências a turmas e usuários, e a verba gasta em
+cada partição é debitada do Secretario original sob a trava de verba, preservando os gastos feitos
+nele durante o lote.
+"""
+
+COLUNAS_RESULTADO = ("posicao", "id_demanda", "id_municipio", "tipo", "status_anterior",
+                     "status_final", "verba_restante", "erro")
+
+
+def _processar_demanda(demanda, secretario):
+    if isinstance(demanda, DemandaInfraestrutura):
+        secretario.gerenciar_verba(demanda)
+        demanda.emitir_notificacao_critica()
+        demanda.atualizar(secretario)
+    else:
+        demanda.processar_solicitacao(secretario)
+
+
+_TIPOS_DE_VALOR = (str, int, float, bool, type(None), datetime)
+
+
+def _estado_demanda(demanda):
+    """Campos de valor (não referências a outros objetos) da demanda, para devolver ao processo principal"""
+    _, slots = demanda.__getstate__()
+    return {nome: valor for nome, valor in slots.items() if isinstance(valor, _TIPOS_DE_VALOR)}
+
+
+def _processar_particao(id_municipio, itens, secretario, devolver_estado=False):
+    """Executado nos trabalhadores: processa em ordem as demandas (posicao, demanda) de um
+    município e retorna (linhas, verba_gasta, estados); estados só é preenchido com devolver_estado."""
+    with modo_silencioso():
+        return _processar_itens(id_municipio, itens, secretario, devolver_estado)
+
+
+def _processar_itens(id_municipio, itens, secretario, devolver_estado):
+    linhas = []
+    estados = []
+    verba_inicial = secretario.verba_municipal_total if secretario is not None else None
+    for posicao, demanda in itens:
+        linha = {
+            "posicao": posicao,
+            "id_demanda": demanda.id_demanda,
+            "id_municipio": id_municipio,
+            "tipo": demanda.__class__.__name__,
+            "status_anterior": demanda.status,
+            "status_final": demanda.status,
+            "verba_restante": None,
+            "erro": None
+        }
+        if secretario is None:
+            linha["erro"] = f"Erro: Nenhum secretário responsável pelo município {id_municipio}."
+        else:
+            try:
+                _processar_demanda(demanda, secretario)
+            except Exception as e:
+                linha["erro"] = f"{type(e).__name__}: {e}"
+            linha["status_final"] = demanda.status
+            linha["verba_restante"] = secretario.verba_municipal_total
+        linhas.append(linha)
+        if devolver_estado:
+            estados.append(_estado_demanda(demanda))
+    verba_gasta = verba_inicial - secretario.verba_municipal_total if secretario is not None else None
+    return linhas, verba_gasta, estados
+
+
+class ProcessadorDemandas:
+    def __init__(self, secretarios, repositorio=None, trabalhadores=4, usar_processos=False):
+        self.secretarios = {secretario.id_municipio: secretario for secretario in secretarios}
+        self.repositorio = repositorio
+        self.trabalhadores = trabalhadores
+        self.usar_processos = usar_processos
+
+    def _municipio(self, demanda):
+        if self.repositorio is not None:
+            return self.repositorio.resolver_municipio_demanda(demanda)
+        return demanda.id_municipio
+
+    def particionar(self, demandas):
+        """Agrupa as demandas por município, mantendo a ordem de chegada em cada grupo."""
+        particoes = {}
+        for posicao, demanda in enumerate(demandas):
+            particoes.setdefault(self._municipio(demanda), []).append((posicao, demanda))
+        return particoes
+
+    def _sincronizar(self, itens, linhas, estados, secretario, verba_gasta):
+        """Com processos, as alterações ocorrem em cópias: aplica o estado das cópias aos objetos originais.
+        O status passa por atualizar_status para que auditoria e ouvintes (fila, repositório) vejam a mudança."""
+        for (_, demanda), linha, estado in zip(itens, linhas, estados):
+            for nome, valor in estado.items():
+                if nome != "_Demanda__status":
+                    setattr(demanda, nome, valor)
+            if linha["status_final"] != demanda.status:
+                demanda.atualizar_status(linha["status_final"], secretario)
+            if secretario is not None and linha["erro"] is None:
+                demanda._alterado_por = secretario
+        if secretario is not None:
+            with secretario.trava_verba():
+                secretario._verba_municipal_total -= verba_gasta
+
+    def processar(self, demandas):
+        """Processa o lote e retorna o resumo com a tabela de resultados, na ordem de entrada."""
+        particoes = self.particionar(demandas)
+        inicio = time.perf_counter()
+        linhas = []
+
+        pool = ProcessPoolExecutor if self.usar_processos else ThreadPoolExecutor
+        with pool(max_workers=self.trabalhadores) as executor:
+            futuros = {
+                id_municipio: executor.submit(_processar_particao, id_municipio, itens,
+                                              self.secretarios.get(id_municipio), self.usar_processos)
+                for id_municipio, itens in particoes.items()
+            }
+            for id_municipio, futuro in futuros.items():
+                linhas_particao, verba_gasta, estados = futuro.result()
+                if self.usar_processos:
+                    with modo_silencioso():
+                        self._sincronizar(particoes[id_municipio], linhas_particao, estados,
+                                          self.secretarios.get(id_municipio), verba_gasta)
+                linhas.extend(linhas_particao)
+
+        linhas.sort(key=lambda linha: linha["posicao"])
+        return {
+            "processadas": sum(1 for linha in linhas if linha["erro"] is None),
+            "com_erro": sum(1 for linha in linhas if linha["erro"] is not None),
+            "municipios": len(particoes),
+            "segundos": round(time.perf_counter() - inicio, 4),
+            "resultados": linhas
+        }
@@ -0,0 +1,251 @@
+import threading
+from fractions import Fraction
+
+"""
+Agregados materializados de frequência por escola e por município.
+Cada turma acompanhada mantém, nos seus contadores, o total de aulas e o total de presenças
+dos alunos (por ano/mês e no geral) e avisa os ouvintes a cada aula, presença ou matrícula.
+O agregador guarda a contribuição de cada turma e, a cada aviso, troca apenas a contribuição
+antiga pela nova nos totais da escola e do município, de modo que os relatórios são lidos
+em O(1), sem percorrer turmas ou alunos.
+  - Frequência média (igual a Escola.gerar_relatorio_frequencia): soma exata (Fraction) das
+    frequências individuais dos alunos (Aluno.percentual_frequencia) dividida pela quantidade
+    de alunos e arredondada para duas casas só no final. Em uma turma, essa soma é
+    presenças * 100 / aulas (ou 100 por aluno quando ainda não há aulas).
+  - Frequência mensal: presenças no mês dividido pelas presenças esperadas (aulas do mês
+    multiplicadas pela quantidade de alunos da turma), somadas entre as turmas.
+reconstruir refaz os totais a partir dos contadores das turmas, e verificar_consistencia os
+compara com o cálculo completo sobre o histórico dos alunos.
+"""
+
+
+class AgregadorFrequencia:
+    def __init__(self):
+        # id_turma -> [turma, id_escola, id_municipio, soma_frequencias, alunos, {(ano, mes): (presencas, esperadas)}]
+        self._turmas = {}
+        self._escolas = {}
+        self._municipios = {}
+        self._mensal_escolas = {}
+        self._mensal_municipios = {}
+        self._trava = threading.RLock()
+
+    # --------
+    # CADASTRO
+    # --------
+
+    def acompanhar_turma(self, turma, id_escola=None, id_municipio=None):
+        """Inclui a turma nos totais da escola e do município informados"""
+        with self._trava:
+            if turma.id_turma in self._turmas:
+                return
+            if id_escola is None:
+                id_escola = turma.id_escola
+            self._escolas.setdefault(id_escola, [0, 0])
+            self._mensal_escolas.setdefault(id_escola, {})
+            if id_municipio is not None:
+                self._municipios.setdefault(id_municipio, [0, 0])
+                self._mensal_municipios.setdefault(id_municipio, {})
+            self._turmas[turma.id_turma] = [turma, id_escola, id_municipio, 0, 0, {}]
+            self._atualizar(turma, None)
+            turma.adicionar_ouvinte(self._atualizar)
+
+    def acompanhar_escola(self, escola):
+        """Acompanha as turmas da escola e as que forem adicionadas depois"""
+        with self._trava:
+            self._escolas.setdefault(escola.id_escola, [0, 0])
+            self._mensal_escolas.setdefault(escola.id_escola, {})
+            if escola.id_municipio is not None:
+                self._municipios.setdefault(escola.id_municipio, [0, 0])
+                self._mensal_municipios.setdefault(escola.id_municipio, {})
+            escola._agregador = self
+            for turma in escola._turmas_existentes:
+                self.acompanhar_turma(turma, escola.id_escola, escola.id_municipio)
+
+    def acompanhar_municipio(self, municipio):
+        """Acompanha as escolas do município e as que forem cadastradas depois"""
+        with self._trava:
+            self._municipios.setdefault(municipio.id_municipio, [0, 0])
+            self._mensal_municipios.setdefault(municipio.id_municipio, {})
+            municipio._agregador = self
+            for escola in municipio.escolas_situadas:
+                self.acompanhar_escola(escola)
+
+    def deixar_de_acompanhar(self, turma):
+        """Retira a contribuição da turma dos totais e remove o ouvinte"""
+        with self._trava:
+            estado = self._turmas.pop(turma.id_turma, None)
+            if estado is None:
+                return
+            turma.remover_ouvinte(self._atualizar)
+            _, id_escola, id_municipio, soma, alunos, mensal = estado
+            self._somar(id_escola, id_municipio, -soma, -alunos)
+            for chave, (presencas, esperadas) in mensal.items():
+                self._somar_mes(id_escola, id_municipio, chave, -presencas, -esperadas)
+
+    # -----------
+    # ATUALIZAÇÃO
+    # -----------
+
+    @staticmethod
+    def _contribuicao(turma):
+        alunos = len(turma.alunos_matriculados)
+        aulas = turma.total_aulas
+        if aulas == 0:
+            return Fraction(100 * alunos), alunos
+        return Fraction(turma.presencas_alunos * 100, aulas), alunos
+
+    @staticmethod
+    def _contribuicao_mes(turma, chave, alunos):
+        return turma._presencas_alunos_por_mes.get(chave, 0), turma._aulas_por_mes.get(chave, 0) * alunos
+
+    def _somar(self, id_escola, id_municipio, soma, alunos):
+        total = self._escolas[id_escola]
+        total[0] += soma
+        total[1] += alunos
+        if id_municipio is not None:
+            total = self._municipios[id_municipio]
+            total[0] += soma
+            total[1] += alunos
+
+    def _somar_mes(self, id_escola, id_municipio, chave, presencas, esperadas):
+        destinos = [self._mensal_escolas[id_escola]]
+        if id_municipio is not None:
+            destinos.append(self._mensal_municipios[id_municipio])
+        for mensal in destinos:
+            atual = mensal.get(chave, (0, 0))
+            novo = (atual[0] + presencas, atual[1] + esperadas)
+            if novo == (0, 0):
+                mensal.pop(chave, None)
+            else:
+                mensal[chave] = novo
+
+    def _atualizar(self, turma, meses):
+        """Ouvinte da turma: troca a contribuição antiga pela nova nos meses informados (None: todos)"""
+        with self._trava:
+            estado = self._turmas.get(turma.id_turma)
+            if estado is None:
+                return
+            _, id_escola, id_municipio, soma_antiga, alunos_antigos, mensal = estado
+            soma, alunos = self._contribuicao(turma)
+            self._somar(id_escola, id_municipio, soma - soma_antiga, alunos - alunos_antigos)
+            estado[3], estado[4] = soma, alunos
+
+            if meses is None:
+                meses = set(mensal) | turma.meses_registrados
+            for chave in meses:
+                presencas, esperadas = self._contribuicao_mes(turma, chave, alunos)
+                antigas = mensal.get(chave, (0, 0))
+                if (presencas, esperadas) == antigas:
+                    continue
+                self._somar_mes(id_escola, id_municipio, chave, presencas - antigas[0], esperadas - antigas[1])
+                if (presencas, esperadas) == (0, 0):
+                    mensal.pop(chave, None)
+                else:
+                    mensal[chave] = (presencas, esperadas)
+
+    def reconstruir(self):
+        """Refaz todos os totais a partir dos contadores das turmas (ex.: após alterações sem aviso)"""
+        with self._trava:
+            for total in list(self._escolas.values()) + list(self._municipios.values()):
+                total[0], total[1] = 0, 0
+            for mensal in list(self._mensal_escolas.values()) + list(self._mensal_municipios.values()):
+                mensal.clear()
+            for estado in self._turmas.values():
+                turma = estado[0]
+                estado[3], estado[4], estado[5] = 0, 0, {}
+                turma.recalcular_contadores()
+
+    # --------
+    # CONSULTA
+    # --------
+
+    @staticmethod
+    def _media(total):
+        soma, alunos = total
+        return round(float(soma / alunos), 2) if alunos else 0.0
+
+    @staticmethod
+    def _media_mensal(mensal, ano, mes):
+        presencas, esperadas = mensal.get((ano, mes), (0, 0))
+        return round(presencas / esperadas * 100, 2) if esperadas else None
+
+    def frequencia_escola(self, id_escola):
+        """Média das frequências dos alunos da escola (0.0 sem alunos)"""
+        return self._media(self._escolas.get(id_escola, (0, 0)))
+
+    def frequencia_municipio(self, id_municipio):
+        """Média das frequências dos alunos de todas as escolas do município (0.0 sem alunos)"""
+        return self._media(self._municipios.get(id_municipio, (0, 0)))
+
+    def frequencia_mensal_escola(self, id_escola, ano, mes):
+        """Percentual de presença da escola no mês; None se não houve aulas"""
+        return self._media_mensal(self._mensal_escolas.get(id_escola, {}), ano, mes)
+
+    def frequencia_mensal_municipio(self, id_municipio, ano, mes):
+        """Percentual de presença do município no mês; None se não houve aulas"""
+        return self._media_mensal(self._mensal_municipios.get(id_municipio, {}), ano, mes)
+
+    def alunos_escola(self, id_escola):
+        return self._escolas.get(id_escola, (0, 0))[1]
+
+    def alunos_municipio(self, id_municipio):
+        return self._municipios.get(id_municipio, (0, 0))[1]
+
+    def relatorio_escola(self, id_escola, ano=None, mes=None):
+        relatorio = {"id_escola": id_escola, "alunos": self.alunos_escola(id_escola),
+                     "frequencia_media": self.frequencia_escola(id_escola)}
+        if ano is not None and mes is not None:
+            relatorio["frequencia_mensal"] = self.frequencia_mensal_escola(id_escola, ano, mes)
+        return relatorio
+
+    def relatorio_municipio(self, id_municipio, ano=None, mes=None):
+        relatorio = {"id_municipio": id_municipio, "alunos": self.alunos_municipio(id_municipio),
+                     "frequencia_media": self.frequencia_municipio(id_municipio)}
+        if ano is not None and mes is not None:
+            relatorio["frequencia_mensal"] = self.frequencia_mensal_municipio(id_municipio, ano, mes)
+        return relatorio
+
+    # ------------
+    # CONSISTÊNCIA
+    # ------------
+
+    def verificar_consistencia(self):
+        """Recalcula tudo a partir do histórico dos alunos e retorna as divergências encontradas,
+        como (nivel, id, mantido, recalculado); lista vazia quando os agregados estão corretos."""
+        with self._trava:
+            escolas = {id_escola: [0, 0] for id_escola in self._escolas}
+            municipios = {id_municipio: [0, 0] for id_municipio in self._municipios}
+            mensal_escolas = {id_escola: {} for id_escola in self._mensal_escolas}
+            mensal_municipios = {id_municipio: {} for id_municipio in self._mensal_municipios}
+
+            for turma, id_escola, id_municipio, _, _, _ in self._turmas.values():
+                alunos = turma.alunos_matriculados
+                destinos = [(escolas[id_escola], mensal_escolas[id_escola])]
+                if id_municipio is not None:
+                    destinos.append((municipios[id_municipio], mensal_municipios[id_municipio]))
+                for total, mensal in destinos:
+                    for aluno in alunos:
+                        total[0] += aluno.percentual_frequencia
+                        total[1] += 1
+                        historico = aluno._historico_frequencia
+                        for chave, qtd in (historico._presencas_por_mes.items() if historico else ()):
+                            atual = mensal.get(chave, (0, 0))
+                            mensal[chave] = (atual[0] + qtd, atual[1])
+                    for chave, qtd in turma._aulas_por_mes.items():
+                        atual = mensal.get(chave, (0, 0))
+                        mensal[chave] = (atual[0], atual[1] + qtd * len(alunos))
+
+            divergencias = []
+            for nivel, mantidos, recalculados in (("escola", self._escolas, escolas),
+                                                  ("municipio", self._municipios, municipios)):
+                for identificador, (soma, alunos) in recalculados.items():
+                    mantido = mantidos[identificador]
+                    if mantido[1] != alunos or mantido[0] != soma:
+                        divergencias.append((nivel, identificador, tuple(mantido), (soma, alunos)))
+            for nivel, mantidos, recalculados in (("escola_mensal", self._mensal_escolas, mensal_escolas),
+                                                  ("municipio_mensal", self._mensal_municipios, mensal_municipios)):
+                for identificador, mensal in recalculados.items():
+                    mensal = {chave: valor for chave, valor in mensal.items() if valor != (0, 0)}
+                    if mantidos[identificador] != mensal:
+                        divergencias.append((nivel, identificador, dict(mantidos[identificador]), mensal))
+            return divergencias
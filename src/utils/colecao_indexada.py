@@ -0,0 +1,64 @@
+from collections.abc import Sequence
+
+"""
+Coleção ordenada por inserção e indexada pelo identificador dos itens.
+Substitui as listas de relacionamento (alunos da turma, turmas da escola, escolas do
+município, turmas do professor): a verificação de pertencimento e de duplicidade é feita
+pelo identificador em O(1), enquanto a leitura continua como a de uma lista (iteração,
+len, acesso por posição e fatias). Itens sem o atributo identificador são indexados pela
+identidade do objeto.
+"""
+class ColecaoIndexada(Sequence):
+    def __init__(self, atributo_chave, itens=()):
+        self._atributo_chave = atributo_chave
+        self._itens = {}
+        self._lista = None
+        for item in itens:
+            self.append(item)
+
+    def _chave(self, item):
+        chave = getattr(item, self._atributo_chave, None)
+        return chave if chave is not None else ("objeto", id(item))
+
+    def append(self, item):
+        """Adiciona o item ao final, caso ainda não exista. Retorna True se foi adicionado."""
+        chave = self._chave(item)
+        if chave in self._itens:
+            return False
+        self._itens[chave] = item
+        if self._lista is not None:
+            # mantém a lista de acesso por posição em dia, sem reconstruí-la a cada inclusão
+            self._lista.append(item)
+        return True
+
+    def extend(self, itens):
+        """Adiciona vários itens, ignorando os repetidos. Retorna a quantidade adicionada."""
+        return sum(1 for item in itens if self.append(item))
+
+    def remove(self, item):
+        chave = self._chave(item)
+        if chave not in self._itens:
+            raise ValueError("Erro: Item não pertence à coleção.")
+        del self._itens[chave]
+        self._lista = None
+
+    def buscar(self, chave):
+        """Retorna o item com o identificador informado, ou None."""
+        return self._itens.get(chave)
+
+    def __contains__(self, item):
+        return self._chave(item) in self._itens
+
+    def __iter__(self):
+        return iter(self._itens.values())
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __getitem__(self, posicao):
+        if self._lista is None:
+            self._lista = list(self._itens.values())
+        return self._lista[posicao]
+
+    def __repr__(self):
+        return f"ColecaoIndexada({list(self._itens.values())!r})"
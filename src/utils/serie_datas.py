@@ -0,0 +1,122 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+"""
+Série de datas (ordinais) para consultas por intervalo em O(log n).
+Guarda apenas as datas, em um array('I') (4 bytes por registro): a quantidade de registros entre
+duas datas sai de duas buscas binárias (bisect). Quando cada registro tem um peso 0/1 (ex.: a
+presença do aluno), o chamador informa o bitset correspondente e a soma dos pesos do intervalo é
+a contagem de bits do trecho, feita sobre os bytes em C, sem manter somas acumuladas por registro.
+Enquanto os registros chegam em ordem cronológica a própria série é usada; registros fora de
+ordem fazem com que um índice ordenado (com as somas acumuladas dos pesos, apenas nesse caso)
+seja montado na primeira consulta seguinte. Prefixos antigos podem ser descartados (anos
+arquivados), mantendo a contagem de registros descartados para preservar as posições globais.
+"""
+
+
+def contar_bits(bits, inicio, fim):
+    """Quantidade de bits ligados nas posições [inicio, fim) do bitset (bit i no byte i // 8)"""
+    if fim <= inicio:
+        return 0
+    valor = int.from_bytes(bits[inicio >> 3:((fim - 1) >> 3) + 1], "little") >> (inicio & 7)
+    return bin(valor & ((1 << (fim - inicio)) - 1)).count("1")
+
+
+class SerieDatas:
+    __slots__ = ("_datas", "_ordenada", "_indice_ordenado", "_descartados")
+
+    def __init__(self):
+        self._datas = array('I')
+        self._ordenada = True
+        self._indice_ordenado = None
+        self._descartados = 0
+
+    def append(self, ordinal):
+        if self._datas and ordinal < self._datas[-1]:
+            self._ordenada = False
+        self._indice_ordenado = None
+        self._datas.append(ordinal)
+
+    def extend(self, ordinais):
+        inicio = len(self._datas)
+        self._datas.extend(ordinais)
+        if self._ordenada:
+            datas = self._datas
+            self._ordenada = all(datas[i - 1] <= datas[i] for i in range(max(inicio, 1), len(datas)))
+        self._indice_ordenado = None
+
+    def __len__(self):
+        return len(self._datas)
+
+    def __getitem__(self, posicao):
+        return self._datas[posicao]
+
+    @property
+    def ordinais(self):
+        """Array('I') com os ordinais em memória, na ordem de registro (somente leitura)"""
+        return self._datas
+
+    @property
+    def descartados(self):
+        """Quantidade de registros descartados do início da série"""
+        return self._descartados
+
+    def iniciar_em(self, posicao):
+        """Define a posição global do primeiro registro de uma série ainda vazia"""
+        if self._datas:
+            raise ValueError("Erro: A posição inicial só pode ser definida em uma série vazia.")
+        self._descartados = posicao
+
+    def _indice(self, pesos):
+        """(datas ordenadas, somas acumuladas dos pesos ou None) de uma série fora de ordem"""
+        indice = self._indice_ordenado
+        if indice is None or (pesos is not None and indice[1] is None):
+            ordem = sorted(range(len(self._datas)), key=self._datas.__getitem__)
+            acumulados = None
+            if pesos is not None:
+                acumulados = array('I', [0])
+                for i in ordem:
+                    acumulados.append(acumulados[-1] + ((pesos[i >> 3] >> (i & 7)) & 1))
+            indice = self._indice_ordenado = (array('I', (self._datas[i] for i in ordem)), acumulados)
+        return indice
+
+    def contar(self, inicio, fim, pesos=None):
+        """Retorna (registros, soma_dos_pesos) com data entre inicio e fim, inclusive.
+        pesos é o bitset com o peso (0/1) de cada registro; sem ele, cada registro pesa 1."""
+        inicio = inicio.toordinal() if isinstance(inicio, date) else inicio
+        fim = fim.toordinal() if isinstance(fim, date) else fim
+        if self._ordenada:
+            datas, acumulados = self._datas, None
+        else:
+            datas, acumulados = self._indice(pesos)
+        esquerda = bisect_left(datas, inicio)
+        direita = bisect_right(datas, fim)
+        if direita <= esquerda:
+            return 0, 0
+        if pesos is None:
+            return direita - esquerda, direita - esquerda
+        if acumulados is None:
+            return direita - esquerda, contar_bits(pesos, esquerda, direita)
+        return direita - esquerda, acumulados[direita] - acumulados[esquerda]
+
+    def prefixo_ate(self, ordinal_limite):
+        """Tamanho do maior prefixo da série com datas até o ordinal informado"""
+        if self._ordenada:
+            return bisect_right(self._datas, ordinal_limite)
+        quantidade = 0
+        for ordinal in self._datas:
+            if ordinal > ordinal_limite:
+                break
+            quantidade += 1
+        return quantidade
+
+    def descartar_prefixo(self, quantidade):
+        """Remove os primeiros registros; os pesos (bitset) são ajustados pelo chamador"""
+        if quantidade <= 0:
+            return
+        self._datas = self._datas[quantidade:]
+        if not self._ordenada:
+            self._ordenada = all(a <= b for a, b in zip(self._datas, self._datas[1:]))
+        self._indice_ordenado = None
+        self._descartados += quantidade
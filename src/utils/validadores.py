@@ -0,0 +1,110 @@
+import re
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+"""
+Validações e normalizações dos dados de usuários, centralizadas para os setters de
+Usuario, Aluno e Professor e para cargas em massa. Os padrões são compilados uma única
+vez, as normalizações individuais ficam em cache (LRU) para valores repetidos e os
+validadores em lote processam colunas inteiras (listas de CPFs ou emails) de uma vez.
+As funções de normalização retornam o valor normalizado ou None quando é inválido;
+cabe ao chamador decidir a mensagem de erro.
+"""
+
+PADRAO_NOME = re.compile(r'^[A-Za-zÀ-ÖØ-öø-ÿ\s]+$')
+PADRAO_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PADRAO_MATRICULA = re.compile(r'^MAT-\d{4}-\d{4}$')
+PADRAO_REGISTRO_FUNCIONAL = re.compile(r'^RF-\d{4}-\d{4}$')
+NAO_DIGITOS = re.compile(r'\D')
+
+TAMANHO_CACHE = 4096
+
+_PESOS_DV1 = tuple(range(10, 1, -1))
+_PESOS_DV2 = tuple(range(11, 1, -1))
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def normalizar_nome(valor):
+    return valor.strip().title() if PADRAO_NOME.match(valor) else None
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def normalizar_cpf(valor):
+    cpf_limpo = NAO_DIGITOS.sub('', valor)
+    return cpf_limpo if len(cpf_limpo) == 11 else None
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def normalizar_email(valor):
+    return valor.lower().strip() if PADRAO_EMAIL.match(valor) else None
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def limpar_telefone(valor):
+    return valor.replace("(", "").replace(")", "").replace("-", "").replace(" ", "")
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def normalizar_matricula(valor):
+    matricula_limpa = valor.strip().upper()
+    return matricula_limpa if PADRAO_MATRICULA.match(matricula_limpa) else None
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def normalizar_registro_funcional(valor):
+    registro_limpo = valor.strip().upper()
+    return registro_limpo if PADRAO_REGISTRO_FUNCIONAL.match(registro_limpo) else None
+
+
+@lru_cache(maxsize=TAMANHO_CACHE)
+def cpf_digitos_validos(cpf):
+    """Confere os dois dígitos verificadores de um CPF já normalizado (11 dígitos)."""
+    if len(cpf) != 11 or not cpf.isdigit() or cpf == cpf[0] * 11:
+        return False
+    digitos = [int(d) for d in cpf]
+    dv1 = sum(d * p for d, p in zip(digitos, _PESOS_DV1)) * 10 % 11 % 10
+    dv2 = sum(d * p for d, p in zip(digitos, _PESOS_DV2)) * 10 % 11 % 10
+    return digitos[9] == dv1 and digitos[10] == dv2
+
+
+def _digitos_validos_em_lote(cpfs):
+    """Confere os dígitos verificadores de uma coluna de CPFs normalizados de uma só vez."""
+    if np is None:
+        return [cpf_digitos_validos(cpf) for cpf in cpfs]
+    texto = "".join(cpfs)
+    if not texto.isascii():
+        return [cpf_digitos_validos(cpf) for cpf in cpfs]
+
+    if not cpfs:
+        return []
+
+    matriz = (np.frombuffer(texto.encode("ascii"), dtype=np.uint8) - ord("0")).reshape(len(cpfs), 11)
+    matriz = matriz.astype(np.int64)
+    dv1 = matriz[:, :9] @ np.array(_PESOS_DV1) * 10 % 11 % 10
+    dv2 = matriz[:, :10] @ np.array(_PESOS_DV2) * 10 % 11 % 10
+    repetidos = (matriz == matriz[:, :1]).all(axis=1)
+    return ((matriz[:, 9] == dv1) & (matriz[:, 10] == dv2) & ~repetidos).tolist()
+
+
+def validar_cpfs(valores, verificar_digitos=True):
+    """Normaliza uma coluna de CPFs. Retorna, para cada valor, o CPF normalizado ou None
+    quando inválido (formato ou, se verificar_digitos, dígitos verificadores)."""
+    normalizados = [normalizar_cpf(v) if isinstance(v, str) else None for v in valores]
+    if not verificar_digitos:
+        return normalizados
+
+    posicoes = [i for i, cpf in enumerate(normalizados) if cpf is not None]
+    validos = _digitos_validos_em_lote([normalizados[i] for i in posicoes])
+    for i, valido in zip(posicoes, validos):
+        if not valido:
+            normalizados[i] = None
+    return normalizados
+
+
+def validar_emails(valores):
+    """Normaliza uma coluna de emails. Retorna o email normalizado ou None para cada valor."""
+    return [normalizar_email(v) if isinstance(v, str) else None for v in valores]
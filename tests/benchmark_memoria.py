@@ -0,0 +1,52 @@
+import sys
+import tracemalloc
+
+from src.models.aluno import Aluno
+from src.models.historico_frequencia import HistoricoFrequencia
+
+
+"""Benchmark de memória das entidades com __slots__: mede, com tracemalloc, quantos bytes
+cada Aluno ocupa ao carregar muitos alunos, comparando com o layout anterior (atributos
+em __dict__ e notas/histórico alocados já no construtor).
+Uso: python -m tests.benchmark_memoria [quantidade_de_alunos]"""
+
+
+class _AlunoLayoutAnterior:
+    """Mesmos atributos de Aluno, guardados em __dict__ como antes dos __slots__."""
+    def __init__(self, modelo):
+        for nome in ("_id", "_nome", "_cpf", "_email", "_senha", "_telefone", "_data_nascimento", "_status",
+                     "_id_matricula", "_turma_associada"):
+            setattr(self, nome, getattr(modelo, nome))
+        self._notas = {}
+        self._historico_frequencia = HistoricoFrequencia(self)
+
+
+def _aluno(i):
+    return Aluno("Levi Farias", f"{i:011d}", f"aluno{i}@escola.com", "LeviFarias2026", "88912345678",
+                 "10/05/2000", f"MAT-2026-{i % 10000:04d}")
+
+
+def medir(fabrica, quantidade):
+    """Retorna (bytes por instância, instâncias) mantidos vivos pela fábrica."""
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    instancias = [fabrica(i) for i in range(quantidade)]
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    return total / quantidade, instancias
+
+
+def executar_benchmark(quantidade=100_000):
+    print(f"📏 [StudyForge] Benchmark de memória com {quantidade} alunos\n")
+
+    por_aluno, _ = medir(_aluno, quantidade)
+    por_aluno_anterior, _ = medir(lambda i: _AlunoLayoutAnterior(_aluno(i)), quantidade)
+
+    print(f"Aluno (__slots__, contêineres sob demanda): {por_aluno:8.1f} bytes")
+    print(f"Aluno (layout anterior, __dict__):          {por_aluno_anterior:8.1f} bytes")
+    print(f"Economia: {1 - por_aluno / por_aluno_anterior:.1%} por aluno")
+    return por_aluno, por_aluno_anterior
+
+
+if __name__ == "__main__":
+    executar_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
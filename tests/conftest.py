@@ -0,0 +1,72 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.core.configuracoes import Configuracoes
+from src.models.aluno import Aluno
+from src.models.professor import Professor
+from src.models.turma import Turma
+from src.services.motor_notas import configurar_motor_notas
+
+"""Fábricas de entidades válidas e isolamento do estado global (configuração e instâncias padrão)
+usados pelos testes."""
+
+
+def criar_professor(i=1, escola="ESC"):
+    return Professor("Claudio Oliveira", f"{90000000000 + i:011d}", f"prof{i}@escola.com", "Professor123!",
+                     "88999887766", "01/01/1980", f"RF-2026-{i:04d}", escola, "Doutor", "Computacao", 5000.0)
+
+
+def criar_aluno(i=1):
+    return Aluno("Levi Farias", f"{i:011d}", f"aluno{i}@escola.com", "LeviFarias2026", "88912345678",
+                 "10/05/2000", f"MAT-2026-{i:04d}")
+
+
+def criar_turma(id_turma="T1", n_alunos=5, professor=None, ano_letivo=2026, i0=1, id_escola="ESC"):
+    """Turma com professor regente e alunos matriculados. Retorna (turma, professor, alunos)."""
+    turma = Turma(id_turma, "Turma Teste", ano_letivo, id_escola)
+    professor = professor or criar_professor(i0)
+    turma.adicionar_professor(professor)
+    alunos = [criar_aluno(i0 + i) for i in range(n_alunos)]
+    for aluno in alunos:
+        turma.adicionar_aluno(aluno)
+    return turma, professor, alunos
+
+
+def chamadas_aleatorias(turma, professor, alunos, n_aulas=20, semente=0, anos=(2026,)):
+    """Registra n_aulas chamadas em datas aleatórias (em ordem) com ~70% de presença."""
+    rnd = random.Random(semente)
+    datas = sorted(date(rnd.choice(anos), 1, 1) + timedelta(days=rnd.randrange(330)) for _ in range(n_aulas))
+    for data in datas:
+        professor.realizar_chamada(turma, data, [{"aluno": a, "presente": rnd.random() < 0.7} for a in alunos])
+    return datas
+
+
+def criar_municipio(i=1, verba=1_000_000):
+    """Município com uma escola e o secretário. Retorna (municipio, escola, secretario)."""
+    from src.models.escola import Escola
+    from src.models.municipio import Municipio
+    from src.models.secretario import Secretario
+    municipio = Municipio("Cidade", f"M{i}", "CE", verba)
+    escola = Escola("Escola", "Rua", f"E{i}", None, 50000, f"M{i}")
+    municipio.cadastrar_escola(escola)
+    secretario = Secretario("Rui Lima", f"{80000000000 + i:011d}", f"sec{i}@escola.com", "Secret123!",
+                            "88999887766", "01/01/1970", municipio, verba, "Educacao")
+    return municipio, escola, secretario
+
+
+@pytest.fixture(autouse=True)
+def configuracoes_padrao():
+    """Cada teste começa e termina com os parâmetros padrão."""
+    Configuracoes().resetar_padroes()
+    yield Configuracoes()
+    Configuracoes().resetar_padroes()
+
+
+@pytest.fixture(autouse=True)
+def motor_notas_padrao():
+    """Cada teste começa com um motor de notas padrão vazio."""
+    configurar_motor_notas(None)
+    yield
+    configurar_motor_notas(None)
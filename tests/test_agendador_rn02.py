@@ -0,0 +1,122 @@
+from datetime import date
+
+from src.core.demanda_factory import DemandaFactory
+from src.database.RepositorioGeral import RepositorioGeral
+from src.database.persistencia_sqlite import PersistenciaSQLite
+from src.services.agendador_rn02 import AgendadorRN02
+from tests.conftest import chamadas_aleatorias, criar_turma
+
+
+def chamada(turma, professor, alunos, data, presente):
+    professor.realizar_chamada(turma, data, [{"aluno": a, "presente": presente} for a in alunos])
+
+
+def turma_com_faltas(id_turma="T1", i0=1, meses=(3, 4)):
+    turma, professor, alunos = criar_turma(id_turma, n_alunos=4, i0=i0)
+    for mes in meses:
+        chamada(turma, professor, alunos, date(2026, mes, 2), False)
+    return turma, professor, alunos
+
+
+def test_apenas_meses_alterados_ficam_pendentes():
+    turma, professor, alunos = turma_com_faltas()
+    outra, _, _ = turma_com_faltas("T2", i0=10)
+    agendador = AgendadorRN02()
+    agendador.acompanhar_turma(turma, "M1")
+    agendador.acompanhar_turma(outra, "M1")
+
+    assert {(t.id_turma, a, m) for t, a, m, _ in agendador.pendentes()} == {
+        ("T1", 2026, 3), ("T1", 2026, 4), ("T2", 2026, 3), ("T2", 2026, 4)}
+    assert agendador.executar()["avaliadas"] == 4
+    assert agendador.pendentes() == [] and agendador.executar()["avaliadas"] == 0
+
+    chamada(turma, professor, alunos, date(2026, 4, 3), True)
+    outra.marcar_alteracao(2026, 5)
+    assert [(t.id_turma, a, m) for t, a, m, _ in agendador.pendentes()] == [("T1", 2026, 4), ("T2", 2026, 5)]
+    assert [(t.id_turma, a, m) for t, a, m, _ in agendador.pendentes(mes=5)] == [("T2", 2026, 5)]
+
+
+def test_demanda_em_andamento_continua_bloqueando_nova_demanda_do_mes():
+    turma, professor, alunos = turma_com_faltas(meses=(3,))
+    agendador = AgendadorRN02()
+    agendador.acompanhar_turma(turma, "M1")
+    [demanda] = agendador.executar()["demandas"]
+    assert demanda.id_municipio == "M1"
+
+    demanda.atualizar_status("EM ANDAMENTO")
+    chamada(turma, professor, alunos, date(2026, 3, 3), False)
+    assert agendador.executar()["duplicadas_ignoradas"] == 1
+
+    demanda.atualizar_status("CONCLUIDO")
+    chamada(turma, professor, alunos, date(2026, 3, 4), False)
+    assert len(agendador.executar()["demandas"]) == 1
+
+
+def test_demanda_aberta_no_repositorio_nao_e_duplicada():
+    repositorio = RepositorioGeral()
+    turma, _, _ = turma_com_faltas()
+    primeiro = AgendadorRN02(repositorio)
+    primeiro.acompanhar_turma(turma, "M1")
+    resumo = primeiro.executar()
+    assert len(resumo["demandas"]) == 2 and resumo["duplicadas_ignoradas"] == 0
+    assert sorted(d.referencia_mensal for d in repositorio.listar_demandas()) == [(2026, 3), (2026, 4)]
+
+    # outra instância (ex.: após reiniciar) consulta as demandas já cadastradas
+    novo = AgendadorRN02(repositorio)
+    novo.acompanhar_turma(turma, "M1")
+    resumo = novo.executar()
+    assert resumo["demandas"] == [] and resumo["duplicadas_ignoradas"] == 2
+
+
+def test_bloqueio_do_repositorio_vale_so_para_o_mesmo_mes_da_rn02(tmp_path):
+    repositorio = RepositorioGeral(PersistenciaSQLite(str(tmp_path / "rede.db")))
+    turma, professor, alunos = turma_com_faltas(meses=(3,))
+    primeiro = AgendadorRN02(repositorio)
+    primeiro.acompanhar_turma(turma, "M1")
+    [marco] = primeiro.executar()["demandas"]
+    marco.atualizar_status("REFORÇO APROVADO")
+    # demanda de lacuna (RN03) em aberto para a mesma turma
+    repositorio.adicionar_demanda(DemandaFactory.criar_demanda("PEDAGOGICA", "SISTEMA", turma=turma,
+                                                                indice_lacuna=0.5, alunos_abaixo_media=2))
+
+    chamada(turma, professor, alunos, date(2026, 4, 2), False)
+    novo = AgendadorRN02(repositorio)
+    novo.acompanhar_turma(turma, "M1")
+    resumo = novo.executar()
+
+    assert resumo["duplicadas_ignoradas"] == 1
+    assert [d.referencia_mensal for d in resumo["demandas"]] == [(2026, 4)]
+
+    # a referência do mês é gravada com a demanda
+    repositorio.salvar()
+    repositorio.persistencia.fechar()
+    recarregado = RepositorioGeral(PersistenciaSQLite(str(tmp_path / "rede.db")))
+    assert recarregado.buscar_demanda(marco.id_demanda).referencia_mensal == (2026, 3)
+
+
+def test_pool_de_threads_opcional_da_o_mesmo_resultado():
+    turmas = []
+    for i in range(4):
+        turma, professor, alunos = criar_turma(f"T{i}", n_alunos=6, i0=10 * i + 1)
+        chamadas_aleatorias(turma, professor, alunos, n_aulas=30, semente=i)
+        turmas.append(turma)
+    resumos = []
+    for trabalhadores in (None, 3):
+        agendador = AgendadorRN02(trabalhadores=trabalhadores)
+        for turma in turmas:
+            agendador.acompanhar_turma(turma, "M1")
+        resumo = agendador.executar()
+        resumos.append((resumo["avaliadas"], sorted(d.descricao for d in resumo["demandas"])))
+
+    assert resumos[0] == resumos[1] and resumos[0][0] > 0
+
+
+def test_turma_deixa_de_ser_acompanhada():
+    turma, professor, alunos = turma_com_faltas(meses=(3,))
+    agendador = AgendadorRN02()
+    agendador.acompanhar_turma(turma)
+    agendador.deixar_de_acompanhar(turma)
+
+    chamada(turma, professor, alunos, date(2026, 3, 5), False)
+
+    assert agendador.pendentes() == [] and agendador.executar()["avaliadas"] == 0
@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+from datetime import date
+
+import pytest
+
+from src.database.RepositorioGeral import RepositorioGeral
+from src.database.arquivo_frequencia import CatalogoArquivos, configurar_catalogo
+from src.database.persistencia_sqlite import PersistenciaSQLite
+from src.database.serializacao_jsonl import CarregadorJSONL, ExportadorJSONL
+from src.services.avaliador_frequencia import AvaliadorFrequencia
+from tests.conftest import criar_municipio, criar_turma
+
+ANO_TODO = (date(2025, 1, 1), date(2026, 12, 31))
+
+
+@pytest.fixture
+def catalogo(tmp_path):
+    catalogo = configurar_catalogo(CatalogoArquivos(str(tmp_path / "arquivo")))
+    yield catalogo
+    configurar_catalogo(None)
+    catalogo.fechar()
+
+
+def rede(persistencia=None):
+    """Turma com 3 alunos, 4 aulas em 2025 e 3 em 2026."""
+    repositorio = RepositorioGeral(persistencia)
+    municipio, escola, _ = criar_municipio()
+    turma, professor, alunos = criar_turma("T1", n_alunos=3, id_escola=escola.id_escola)
+    professor.escola_associada = escola
+    escola.adicionar_turma(turma)
+    repositorio.adicionar_municipio(municipio)
+    repositorio.adicionar_escola(escola)
+    repositorio.adicionar_turma(turma)
+    for usuario in [professor, *alunos]:
+        repositorio.adicionar_usuario(usuario)
+    for data in (date(2025, 3, 3), date(2025, 3, 5), date(2025, 9, 1), date(2025, 9, 3),
+                 date(2026, 3, 2), date(2026, 3, 4), date(2026, 4, 1)):
+        professor.realizar_chamada(turma, data, [{"aluno": a, "presente": i != data.day % 3}
+                                                 for i, a in enumerate(alunos)])
+    return repositorio, turma, alunos
+
+
+def contagens(repositorio):
+    turma = repositorio.buscar_turma("T1")
+    aluno = repositorio.buscar_aluno("MAT-2026-0002")
+    return (turma.aulas_no_periodo(*ANO_TODO), turma.aulas_no_mes(3, 2025), turma.aulas_no_mes(3, 2026),
+            aluno.presenca.registros_no_periodo(*ANO_TODO), aluno.presenca.presencas_no_periodo(*ANO_TODO),
+            aluno.presenca.presencas_mes(9, 2025))
+
+
+def test_recarga_do_sqlite_nao_conta_anos_arquivados_duas_vezes(tmp_path, catalogo):
+    caminho = str(tmp_path / "rede.db")
+    repositorio, turma, _ = rede(PersistenciaSQLite(caminho))
+    repositorio.salvar()
+    esperado = contagens(repositorio)
+    assert esperado[0] == 7 and esperado[3] == 7
+
+    assert catalogo.arquivar_ano([turma], 2025) == (4, 12)
+    assert contagens(repositorio) == esperado
+    repositorio.salvar()
+    repositorio.persistencia.fechar()
+
+    recarregado = RepositorioGeral(PersistenciaSQLite(caminho))
+    assert contagens(recarregado) == esperado
+    turma = recarregado.buscar_turma("T1")
+    assert (turma.posicao_inicial_diario, turma.total_aulas) == (4, 3)
+    aluno = recarregado.buscar_aluno("MAT-2026-0002")
+    assert (aluno.presenca.posicao_inicial, len(aluno.presenca)) == (4, 3)
+
+    # as posições continuam alinhadas às gravadas: novas aulas são acrescentadas sem erro
+    professor = turma._professores_regentes[0]
+    professor.realizar_chamada(turma, date(2026, 4, 6), [{"aluno": a, "presente": True}
+                                                         for a in turma.alunos_matriculados])
+    recarregado.salvar()
+    recarregado.persistencia.fechar()
+    assert RepositorioGeral(PersistenciaSQLite(caminho)).buscar_turma("T1").aulas_no_periodo(*ANO_TODO) == 8
+
+
+def test_instantaneo_anterior_ao_arquivamento_carrega_so_a_parte_viva(tmp_path, catalogo):
+    repositorio, turma, _ = rede()
+    ExportadorJSONL(repositorio).exportar(str(tmp_path / "rede.jsonl"))
+    esperado = contagens(repositorio)
+    catalogo.arquivar_ano([turma], 2025)
+
+    destino = RepositorioGeral()
+    CarregadorJSONL(destino).carregar(str(tmp_path / "rede.jsonl"))
+
+    assert contagens(destino) == esperado
+    assert destino.buscar_turma("T1").posicao_inicial_diario == 4
+
+
+def test_rn02_avalia_mes_de_ano_arquivado(catalogo):
+    _, turma, _ = rede()
+    avaliador = AvaliadorFrequencia()
+    esperado = avaliador.motor.resumo_mensal(turma, 9, 2025)
+
+    catalogo.arquivar_ano([turma], 2025)
+
+    assert (2025, 9) not in turma._aulas_por_mes
+    assert avaliador.motor.resumo_mensal(turma, 9, 2025) == esperado == (pytest.approx(2 / 3), 2)
+    assert avaliador.verificar_media_frequencia_mensal(turma, 9, ano=2025) is not None
+
+
+def test_modelos_recebem_o_catalogo_sem_importar_a_camada_de_dados():
+    codigo = ("import sys, src.models.turma, src.models.historico_frequencia; "
+              "print(any(m.startswith('src.database') for m in sys.modules))")
+    saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True,
+                           cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert saida.stdout.strip() == "False"
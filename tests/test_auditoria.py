@@ -0,0 +1,81 @@
+import pytest
+
+from src.core.auditoria import DestinoJSONL, DestinoSQLite, RegistroAuditoria, configurar_registro
+from src.models.demanda_infraestrutura import DemandaInfraestrutura
+from tests.conftest import criar_municipio, criar_professor
+
+
+@pytest.fixture
+def registro():
+    """Registro sem destino, restaurado ao final do teste."""
+    yield configurar_registro(RegistroAuditoria())
+    configurar_registro(RegistroAuditoria())
+
+
+def test_sem_destino_mantem_o_historico_completo_por_entidade():
+    registro = RegistroAuditoria(tamanho_lote=2, capacidade=2)
+    for i in range(8):
+        registro.registrar("Demanda", "A", "STATUS", "SISTEMA", str(i), str(i + 1))
+    registro.registrar("Demanda", "B", "STATUS", "SISTEMA", "0", "1")
+
+    assert [e.status_novo for e in registro.historico("A")] == [str(i + 1) for i in range(8)]
+    assert len(registro.historico("B")) == 1 and registro.historico("C") == []
+
+
+@pytest.mark.parametrize("destino", [None, DestinoJSONL, DestinoSQLite])
+def test_destinos_tratam_ids_nao_textuais_da_mesma_forma(tmp_path, destino):
+    registro = RegistroAuditoria(destino(str(tmp_path / "auditoria")) if destino else None, tamanho_lote=2)
+    for i in range(3):
+        registro.registrar("Demanda", 7, "STATUS", "SISTEMA", str(i), str(i + 1))
+    registro.registrar("Demanda", "D7", "STATUS", "SISTEMA", "0", "1")
+    registro.descarregar()
+
+    assert [e.status_novo for e in registro.historico(7)] == ["1", "2", "3"]
+    assert [e.status_novo for e in registro.historico("7")] == ["1", "2", "3"]
+    registro.fechar()
+
+
+@pytest.mark.parametrize("destino", [DestinoJSONL, DestinoSQLite])
+def test_historico_junta_destino_e_buffer_sem_duplicar(tmp_path, destino):
+    caminho = str(tmp_path / "auditoria")
+    registro = RegistroAuditoria(destino(caminho), tamanho_lote=3, intervalo=60, capacidade=10)
+    for i in range(5):
+        registro.registrar("Demanda", "A", "STATUS", "SISTEMA", str(i), str(i + 1))
+    registro.descarregar()
+    for i in range(5, 7):
+        registro.registrar("Demanda", "A", "STATUS", "SISTEMA", str(i), str(i + 1))
+    registro.registrar("Demanda", "B", "STATUS", "SISTEMA", "0", "1")
+
+    esperado = [str(i + 1) for i in range(7)]
+    assert [e.status_novo for e in registro.historico("A")] == esperado
+    registro.fechar()
+
+    # o destino reaberto monta o índice a partir do que já foi gravado
+    reaberto = RegistroAuditoria(destino(caminho))
+    assert [e.status_novo for e in reaberto.historico("A")] == esperado
+    assert [e.status_novo for e in reaberto.historico("B")] == ["1"]
+    reaberto.fechar()
+
+
+def test_mudanca_de_status_e_atribuida_a_quem_a_fez(registro):
+    _, _, secretario = criar_municipio(1)
+    professor = criar_professor(1)
+    demanda = DemandaInfraestrutura("D1", "Reparo", "NORMAL", secretario, 500, "Escola")
+    demanda.atualizar(professor)
+
+    demanda.processar_solicitacao(secretario)
+    demanda.atualizar_status("CONCLUIDO")
+
+    status = [(e.usuario, e.status_anterior, e.status_novo) for e in registro.historico("D1") if e.acao == "STATUS"]
+    assert status == [(secretario.cpf, "ABERTO", "EM ANDAMENTO"), (None, "EM ANDAMENTO", "CONCLUIDO")]
+    assert demanda._alterado_por is secretario
+
+
+def test_secretario_registra_as_demandas_que_aprova(registro):
+    _, _, secretario = criar_municipio(1)
+    demanda = DemandaInfraestrutura("D2", "Reparo", "NORMAL", "SISTEMA", 500, "Escola")
+    demanda.vincular_municipio(secretario.id_municipio)
+
+    secretario.gerenciar_verba(demanda)
+
+    assert registro.historico("D2")[-1].usuario == secretario.cpf
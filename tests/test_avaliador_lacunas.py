@@ -0,0 +1,62 @@
+import pytest
+
+from src.services.avaliador_lacunas import AvaliadorLacunas
+from src.services.motor_notas import MotorNotas
+from tests.conftest import criar_turma
+
+
+def turma_com_notas(motor, notas):
+    """Turma com um aluno por nota lançada em Matemática."""
+    turma, _, alunos = criar_turma("T1", n_alunos=len(notas))
+    for aluno, nota in zip(alunos, notas):
+        motor.lancar(turma, aluno, "Matemática", nota)
+    return turma, alunos
+
+
+def test_demanda_gerada_traz_o_indice_da_descricao():
+    motor = MotorNotas()
+    turma, _ = turma_com_notas(motor, (3.0, 4.0, 8.0, 9.0))
+    avaliador = AvaliadorLacunas(motor_notas=motor)
+    avaliador.acompanhar_turma(turma)
+
+    demanda, = avaliador.executar()["demandas"]
+
+    assert demanda.indice_lacuna == 0.5
+    assert "50.0% dos alunos abaixo da média" in demanda.descricao
+
+
+@pytest.mark.parametrize("status", ["ABERTO", "EM ANDAMENTO", "REFORÇO APROVADO"])
+def test_demanda_em_tratamento_bloqueia_nova_demanda(status):
+    motor = MotorNotas()
+    turma, alunos = turma_com_notas(motor, (3.0, 4.0, 8.0, 9.0))
+    avaliador = AvaliadorLacunas(motor_notas=motor)
+    avaliador.acompanhar_turma(turma)
+    demanda, = avaliador.executar()["demandas"]
+    demanda.atualizar_status(status)
+
+    # a turma sai da lacuna e volta a cruzar o limite com a demanda ainda em tratamento
+    motor.lancar(turma, alunos[0], "Matemática", 10.0)
+    assert avaliador.executar()["demandas"] == []
+    motor.lancar(turma, alunos[0], "Matemática", 0.0)
+    resumo = avaliador.executar()
+
+    assert resumo["demandas"] == [] and resumo["duplicadas_ignoradas"] == 1
+
+
+def test_nova_demanda_so_depois_de_status_final_e_novo_cruzamento():
+    motor = MotorNotas()
+    turma, alunos = turma_com_notas(motor, (3.0, 4.0, 8.0, 9.0))
+    avaliador = AvaliadorLacunas(motor_notas=motor)
+    avaliador.acompanhar_turma(turma)
+    demanda, = avaliador.executar()["demandas"]
+    demanda.atualizar_status("CONCLUIDO")
+
+    # ainda na lacuna: concluir a demanda não gera outra até a turma cruzar o limite de novo
+    motor.lancar(turma, alunos[2], "Matemática", 7.0)
+    assert avaliador.executar()["duplicadas_ignoradas"] == 1
+    motor.lancar(turma, alunos[0], "Matemática", 10.0)
+    assert avaliador.executar()["demandas"] == []
+    motor.lancar(turma, alunos[0], "Matemática", 0.0)
+
+    nova, = avaliador.executar()["demandas"]
+    assert nova is not demanda and nova.em_aberto
@@ -0,0 +1,44 @@
+from datetime import date
+
+from tests.conftest import criar_professor, criar_turma
+
+
+def test_chamada_em_lote_igual_a_chamadas_individuais():
+    turma_lote, professor_lote, alunos_lote = criar_turma("T1", n_alunos=3)
+    turma_ind, professor_ind, alunos_ind = criar_turma("T2", n_alunos=3, i0=11)
+    datas = [date(2026, 4, d) for d in (1, 3, 8, 10)]
+
+    chamadas = []
+    for i, data in enumerate(datas):
+        chamadas.append((turma_lote, data, [{"aluno": a, "presente": (i + j) % 2 == 0} for j, a in enumerate(alunos_lote)]))
+        professor_ind.realizar_chamada(turma_ind, data,
+                                       [{"aluno": a, "presente": (i + j) % 2 == 0} for j, a in enumerate(alunos_ind)])
+    resumo = professor_lote.realizar_chamada_em_lote(chamadas)
+
+    assert resumo == {"chamadas_registradas": 4, "presencas_registradas": 12, "chamadas_rejeitadas": []}
+    assert turma_lote.total_aulas == turma_ind.total_aulas == 4
+    assert [a.frequencia for a in alunos_lote] == [a.frequencia for a in alunos_ind]
+
+
+def test_chamada_de_professor_que_nao_e_regente_e_rejeitada_sem_gravar():
+    turma, _, (aluno,) = criar_turma(n_alunos=1)
+    intruso = criar_professor(50)
+    intruso.turmas_associadas.append(turma)  # vínculo apenas do lado do professor
+
+    resumo = intruso.realizar_chamada_em_lote([(turma, date(2026, 4, 1), [{"aluno": aluno, "presente": True}])])
+
+    assert resumo["chamadas_registradas"] == 0
+    assert resumo["presencas_registradas"] == 0
+    assert resumo["chamadas_rejeitadas"][0]["motivo"] == "Professor não é regente da turma"
+    assert turma.total_aulas == 0 and len(aluno.presenca) == 0
+
+
+def test_registro_que_nao_e_dicionario_rejeita_a_chamada():
+    turma, professor, (aluno,) = criar_turma(n_alunos=1)
+    resumo = professor.realizar_chamada_em_lote([
+        (turma, date(2026, 4, 1), [(aluno, True)]),
+        (turma, date(2026, 4, 2), [{"aluno": aluno, "presente": True}]),
+    ])
+    assert resumo["chamadas_registradas"] == 1
+    assert [r["data"] for r in resumo["chamadas_rejeitadas"]] == [date(2026, 4, 1)]
+    assert turma.total_aulas == 1 and aluno.frequencia == 100.0
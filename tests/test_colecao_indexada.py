@@ -0,0 +1,31 @@
+import pytest
+
+from src.utils.colecao_indexada import ColecaoIndexada
+from tests.conftest import criar_aluno
+
+
+def test_colecao_se_comporta_como_lista_sem_repetidos():
+    alunos = [criar_aluno(i) for i in range(1, 5)]
+    colecao = ColecaoIndexada("id_matricula", alunos)
+    assert not colecao.append(criar_aluno(2))  # mesma matrícula
+    assert list(colecao) == alunos and len(colecao) == 4
+    assert colecao[0] is alunos[0] and colecao[-1] is alunos[-1]
+    assert colecao[1:3] == alunos[1:3]
+    assert colecao.buscar("MAT-2026-0003") is alunos[2]
+
+    colecao.remove(alunos[1])
+    assert list(colecao) == [alunos[0], alunos[2], alunos[3]]
+    assert colecao[1] is alunos[2]
+    with pytest.raises(ValueError):
+        colecao.remove(alunos[1])
+
+
+def test_inclusao_apos_acesso_por_posicao_nao_reconstroi_a_lista():
+    colecao = ColecaoIndexada("id_matricula")
+    for i in range(1, 50):
+        colecao.append(criar_aluno(i))
+        assert colecao[-1].id_matricula == f"MAT-2026-{i:04d}"
+    lista = colecao._lista
+    colecao.append(criar_aluno(60))
+    assert colecao._lista is lista
+    assert colecao[-1].id_matricula == "MAT-2026-0060"
@@ -0,0 +1,84 @@
+import gc
+import threading
+
+import pytest
+
+from src.core.configuracoes import Configuracoes
+from src.services.avaliador_frequencia import AvaliadorFrequencia
+
+
+def test_instantaneo_e_imutavel_e_nao_muda_com_novas_versoes(configuracoes_padrao):
+    config = configuracoes_padrao
+    antes = config.instantaneo()
+
+    novo = config.atualizar_parametros(frequencia_minima=0.5, LIMITE_CUSTO_DEMANDA=100)
+
+    assert novo.versao == antes.versao + 1 and config.instantaneo() is novo
+    assert (antes.FREQUENCIA_MINIMA, antes.LIMITE_CUSTO_DEMANDA) == (0.75, 15000.0)
+    assert (config.FREQUENCIA_MINIMA, config.LIMITE_CUSTO_DEMANDA) == (0.5, 100.0)
+    with pytest.raises(AttributeError):
+        antes.FREQUENCIA_MINIMA = 0.1
+
+
+def test_parametro_invalido_nao_publica_versao(configuracoes_padrao):
+    config = configuracoes_padrao
+    versao = config.versao
+
+    with pytest.raises(ValueError):
+        config.atualizar_parametros(FREQUENCIA_MINIMA=0.5, INEXISTENTE=1)
+    with pytest.raises(TypeError):
+        config.atualizar_parametro("FREQUENCIA_MINIMA", "alta")
+
+    assert config.versao == versao and config.FREQUENCIA_MINIMA == 0.75
+
+
+def test_assinantes_recebem_o_novo_instantaneo_e_sao_referencias_fracas(configuracoes_padrao):
+    config = configuracoes_padrao
+    avaliador = AvaliadorFrequencia()
+
+    config.atualizar_parametro("FREQUENCIA_MINIMA", 0.6)
+    assert avaliador.frequencia_minima == 0.6
+
+    assinantes = len(config._assinantes)
+    del avaliador
+    gc.collect()
+    config.atualizar_parametro("FREQUENCIA_MINIMA", 0.7)
+    assert len(config._assinantes) < assinantes
+
+
+def test_publicacoes_concorrentes_geram_versoes_consecutivas(configuracoes_padrao):
+    config = configuracoes_padrao
+    vistas = []
+    trava = threading.Lock()
+
+    def registrar(instantaneo):
+        with trava:
+            vistas.append(instantaneo.versao)
+
+    config.assinar(registrar)
+    inicial = config.versao
+
+    def publicar():
+        for i in range(100):
+            config.atualizar_parametro("LIMITE_CUSTO_DEMANDA", i)
+
+    threads = [threading.Thread(target=publicar) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    config._assinantes = [referencia for referencia in config._assinantes if referencia() is not registrar]
+
+    assert config.versao == inicial + 400
+    assert sorted(vistas) == list(range(inicial + 1, inicial + 401))
+
+
+def test_reset_restaura_padroes_em_nova_versao():
+    config = Configuracoes()
+    config.atualizar_parametro("MEDIA_MINIMA", 7)
+    versao = config.versao
+
+    config.resetar_padroes()
+
+    assert config.versao == versao + 1
+    assert dict(config.instantaneo().valores) == Configuracoes._PADROES
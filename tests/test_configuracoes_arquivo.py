@@ -0,0 +1,94 @@
+import json
+import os
+import time
+
+import pytest
+
+from src.core.demanda_factory import DemandaFactory
+from src.services.avaliador_frequencia import AvaliadorFrequencia
+from tests.conftest import criar_municipio
+
+
+@pytest.fixture
+def config(configuracoes_padrao):
+    """Configurações sem arquivo associado ao final do teste."""
+    yield configuracoes_padrao
+    configuracoes_padrao.parar_observacao()
+    configuracoes_padrao._arquivo = None
+
+
+def escrever(caminho, texto):
+    """Grava o arquivo garantindo uma data de modificação diferente da anterior."""
+    anterior = os.stat(caminho).st_mtime_ns if os.path.exists(caminho) else 0
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write(texto)
+    os.utime(caminho, ns=(anterior + 10**9, anterior + 10**9))
+
+
+def test_toml_com_sobrescritas_por_municipio(config, tmp_path):
+    caminho = str(tmp_path / "config.toml")
+    escrever(caminho, 'frequencia_minima = 0.8\n[municipios."M1"]\nLIMITE_CUSTO_DEMANDA = 50000\n'
+                      '[municipios."M2"]\nFREQUENCIA_MINIMA = 0.6\n')
+
+    config.carregar_arquivo(caminho)
+
+    assert config.FREQUENCIA_MINIMA == 0.8 and config.MEDIA_MINIMA == 6.0
+    assert config.para_municipio("M1").LIMITE_CUSTO_DEMANDA == 50000.0
+    assert config.para_municipio("M1").FREQUENCIA_MINIMA == 0.8
+    assert config.para_municipio("M2").FREQUENCIA_MINIMA == 0.6
+    assert config.para_municipio("M1") is config.para_municipio("M1")
+    assert config.para_municipio("M9") is config.instantaneo()
+
+
+def test_fabrica_usa_o_limite_do_municipio_do_solicitante(config, tmp_path):
+    caminho = str(tmp_path / "config.json")
+    escrever(caminho, json.dumps({"municipios": {"M1": {"LIMITE_CUSTO_DEMANDA": 50000}}}))
+    config.carregar_arquivo(caminho)
+    _, _, secretario1 = criar_municipio(1)
+    _, _, secretario2 = criar_municipio(2)
+
+    prioridades = [DemandaFactory.criar_demanda("INFRAESTRUTURA", s, "Obra", custo_estimado=20000).prioridade
+                   for s in (secretario1, secretario2)]
+
+    assert prioridades == ["NORMAL", "MAXIMA"]
+
+
+def test_recarrega_quando_o_arquivo_muda_e_mantem_o_anterior_se_invalido(config, tmp_path):
+    caminho = str(tmp_path / "config.toml")
+    escrever(caminho, "FREQUENCIA_MINIMA = 0.8\n")
+    config.carregar_arquivo(caminho)
+    avaliador = AvaliadorFrequencia()
+
+    assert not config.recarregar_se_alterado()
+    escrever(caminho, 'FREQUENCIA_MINIMA = 0.9\n[municipios."M1"]\nMEDIA_MINIMA = 7.0\n')
+    assert config.recarregar_se_alterado()
+    assert avaliador.frequencia_minima == 0.9
+    assert config.para_municipio("M1").MEDIA_MINIMA == 7.0
+
+    versao = config.versao
+    escrever(caminho, 'FREQUENCIA_MINIMA = "alta"\n')
+    with pytest.raises(TypeError):
+        config.recarregar_se_alterado()
+    assert config.versao == versao and config.FREQUENCIA_MINIMA == 0.9
+
+
+def test_observador_recarrega_em_segundo_plano(config, tmp_path):
+    caminho = str(tmp_path / "config.json")
+    escrever(caminho, json.dumps({"FREQUENCIA_MINIMA": 0.8}))
+    config.carregar_arquivo(caminho)
+    config.observar_arquivo(0.01)
+
+    escrever(caminho, json.dumps({"FREQUENCIA_MINIMA": 0.5}))
+    prazo = time.monotonic() + 2
+    while config.FREQUENCIA_MINIMA != 0.5 and time.monotonic() < prazo:
+        time.sleep(0.01)
+
+    assert config.FREQUENCIA_MINIMA == 0.5
+
+
+def test_secao_municipios_invalida(config, tmp_path):
+    caminho = str(tmp_path / "config.json")
+    escrever(caminho, json.dumps({"municipios": {"M1": 0.5}}))
+
+    with pytest.raises(ValueError):
+        config.carregar_arquivo(caminho)
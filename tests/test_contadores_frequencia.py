@@ -0,0 +1,39 @@
+from datetime import date
+
+from src.models.aluno import Aluno
+from tests.conftest import chamadas_aleatorias, criar_turma
+
+
+def test_contadores_de_aulas_e_presencas_acompanham_o_diario():
+    turma, professor, alunos = criar_turma(n_alunos=5)
+    chamadas_aleatorias(turma, professor, alunos, n_aulas=30, semente=1)
+
+    for (ano, mes), aulas in turma._aulas_por_mes.items():
+        assert aulas == sum(1 for a in turma._diario_de_classe if (a["data"].year, a["data"].month) == (ano, mes))
+        assert turma.presencas_alunos_no_mes(mes, ano) == sum(a.presenca.presencas_mes(mes, ano) for a in alunos)
+    assert turma.presencas_alunos == sum(1 for a in alunos for r in a.presenca if r["presenca"])
+
+    for aluno in alunos:
+        presencas = sum(1 for r in aluno.presenca if r["presenca"])
+        assert aluno.frequencia == round(presencas / turma.total_aulas * 100, 2)
+
+
+def test_versao_do_mes_muda_a_cada_aula_ou_presenca():
+    turma, professor, (aluno,) = criar_turma(n_alunos=1)
+    assert turma.versao_mes(2026, 3) == 0
+    professor.realizar_chamada(turma, date(2026, 3, 2), [{"aluno": aluno, "presente": True}])
+    versao = turma.versao_mes(2026, 3)
+    assert versao > 0
+    aluno.registrar_presenca(date(2026, 3, 3), False)
+    assert turma.versao_mes(2026, 3) > versao
+    assert turma.versao_mes(2026, 4) == 0
+
+
+def test_aluno_matriculado_com_historico_entra_nos_contadores():
+    turma, _, _ = criar_turma(n_alunos=0)
+    novo = Aluno("Ana Lima", "55566677788", "ana@escola.com", "AnaLima2026", "88912345678", "10/05/2001",
+                 "MAT-2026-0999")
+    novo.registrar_presenca(date(2026, 5, 4), True)
+    turma.adicionar_aluno(novo)
+    assert turma.presencas_alunos_no_mes(5) == 1
+    assert novo.frequencia == 100.0  # turma ainda sem aulas
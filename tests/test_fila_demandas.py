@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from src.models.demanda_infraestrutura import DemandaInfraestrutura
+from src.services.fila_demandas import FilaDemandas
+
+
+def demanda(i, prioridade="NORMAL", municipio="M1", idade=0):
+    d = DemandaInfraestrutura(f"D-{i}", "Reparo", prioridade, "SISTEMA", 1000, "Escola")
+    d.vincular_municipio(municipio)
+    d._criado_em = datetime(2026, 1, 1) + timedelta(minutes=idade)
+    return d
+
+
+def test_retira_por_prioridade_e_idade_dentro_do_municipio():
+    fila = FilaDemandas()
+    demandas = [demanda(1, idade=3), demanda(2, "ALTA", idade=5), demanda(3, idade=1),
+                demanda(4, "MAXIMA", idade=9), demanda(5, "MAXIMA", municipio="M2")]
+    fila.adicionar_varias(demandas)
+
+    assert [d.id_demanda for d in fila.retirar_proximas("M1", 3)] == ["D-4", "D-2", "D-3"]
+    assert fila.proxima("M1").id_demanda == "D-1"
+    assert fila.municipios() == {"M1", "M2"}
+    assert len(fila) == 2
+
+
+def test_mudanca_de_status_fora_da_fila_e_refletida_imediatamente():
+    fila = FilaDemandas()
+    a, b, c = demanda(1, idade=1), demanda(2, idade=2), demanda(3, idade=3)
+    fila.adicionar_varias([a, b, c])
+
+    c.atualizar_status("EM ANDAMENTO")  # não está no topo do heap de ABERTO
+
+    assert fila.proxima("M1", "EM ANDAMENTO") is c
+    assert [d.id_demanda for d in fila.retirar_proximas("M1", 5)] == ["D-1", "D-2"]
+    fila.atualizar_status(c, "ABERTO")
+    assert fila.retirar_proximas("M1", 5) == [c]
+    assert fila.proxima("M1", "EM ANDAMENTO") is None
+
+
+def test_demanda_removida_nao_volta_a_fila():
+    fila = FilaDemandas()
+    a = demanda(1)
+    fila.adicionar(a)
+    assert fila.remover(a)
+    a.atualizar_status("EM ANDAMENTO")
+    assert a not in fila
+    assert fila.proxima("M1", "EM ANDAMENTO") is None
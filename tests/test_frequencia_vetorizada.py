@@ -0,0 +1,59 @@
+from datetime import date
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.services.avaliador_frequencia import AvaliadorFrequencia
+from src.services.frequencia_vetorizada import AvaliadorFrequenciaVetorizado
+from src.services.motor_frequencia import MotorFrequencia
+from tests.conftest import chamadas_aleatorias, criar_municipio, criar_turma
+
+
+def escola_com_turmas(n_turmas=3):
+    municipio, escola, _ = criar_municipio()
+    for t in range(n_turmas):
+        turma, professor, alunos = criar_turma(f"T{t}", n_alunos=6, i0=100 * t + 1)
+        chamadas_aleatorias(turma, professor, alunos, n_aulas=40, semente=t)
+        escola.adicionar_turma(turma)
+    return municipio, escola
+
+
+def test_resumo_escola_igual_ao_avaliador_frequencia():
+    _, escola = escola_com_turmas()
+    vetorizado = AvaliadorFrequenciaVetorizado()
+    motor = MotorFrequencia(0.75)
+    for mes in range(1, 12):
+        esperado = {}
+        for turma in escola._turmas_existentes:
+            try:
+                esperado[turma.id_turma] = motor.resumo_mensal(turma, mes)
+            except ValueError:
+                pass
+        obtido = {turma.id_turma: (media, abaixo) for turma, media, abaixo in vetorizado.resumo_escola(escola, mes)}
+        assert obtido.keys() == esperado.keys()
+        for id_turma, (media, abaixo) in esperado.items():
+            assert obtido[id_turma][0] == pytest.approx(media)
+            assert obtido[id_turma][1] == abaixo
+
+
+def test_presenca_em_data_sem_aula_so_e_ignorada_com_a_opcao_explicita():
+    turma, professor, (aluno,) = criar_turma(n_alunos=1)
+    professor.realizar_chamada(turma, date(2026, 3, 2), [{"aluno": aluno, "presente": True}])
+    professor.realizar_chamada(turma, date(2026, 3, 4), [{"aluno": aluno, "presente": False}])
+    aluno.registrar_presenca(date(2026, 3, 9), True)  # sem aula no diário
+
+    base = AvaliadorFrequencia().media_presenca_mensal_aluno(aluno, turma, 3)
+    assert AvaliadorFrequenciaVetorizado().taxas_mensais_turma(turma, 3)[0] == pytest.approx(base)
+    assert AvaliadorFrequenciaVetorizado(somente_aulas_do_diario=True).taxas_mensais_turma(turma, 3)[0] == 0.5
+
+
+def test_matriz_do_diario_lida_do_armazenamento_compacto():
+    turma, professor, alunos = criar_turma(n_alunos=4)
+    datas = chamadas_aleatorias(turma, professor, alunos, n_aulas=30, semente=7)
+    vetorizado = AvaliadorFrequenciaVetorizado(somente_aulas_do_diario=True)
+    mes = datas[0].month
+    matriz = vetorizado.matriz_turma(turma, mes)
+    assert matriz.shape == (4, turma.aulas_no_mes(mes))
+    for linha, aluno in enumerate(alunos):
+        assert matriz[linha].sum() == aluno.presenca.presencas_mes(mes)
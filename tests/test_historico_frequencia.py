@@ -0,0 +1,40 @@
+from datetime import date
+
+import pytest
+
+from src.models.historico_frequencia import HistoricoFrequencia
+from tests.conftest import criar_aluno
+
+
+def test_historico_compacto_se_comporta_como_lista_de_registros():
+    aluno = criar_aluno()
+    registros = [(date(2026, 2, d), d % 3 != 0) for d in range(1, 20)]
+    for data, presente in registros:
+        aluno.registrar_presenca(data, presente)
+
+    historico = aluno.presenca
+    assert len(historico) == len(registros)
+    assert [(r["data"], r["presenca"]) for r in historico] == registros
+    assert historico[-1] == {"data": date(2026, 2, 19), "aluno": aluno.nome, "presenca": True}
+    assert [r["data"] for r in historico[2:4]] == [date(2026, 2, 3), date(2026, 2, 4)]
+    assert historico.contar_presencas() == sum(p for _, p in registros)
+    assert historico.presencas_mes(2, 2026) == sum(p for _, p in registros)
+
+
+def test_registro_em_lote_igual_ao_registro_individual():
+    registros = [(date(2026, 1 + d % 12, 1 + d % 28), d % 2 == 0) for d in range(50)]
+    individual, lote = HistoricoFrequencia(), HistoricoFrequencia()
+    for data, presente in registros:
+        individual.registrar(data, presente)
+    lote.registrar_em_lote(registros)
+    assert list(lote.registros_compactos()) == list(individual.registros_compactos())
+    assert lote._presencas_por_mes == individual._presencas_por_mes
+
+
+def test_registro_em_lote_valida_antes_de_gravar():
+    historico = HistoricoFrequencia()
+    with pytest.raises(TypeError):
+        historico.registrar_em_lote([(date(2026, 1, 1), True), ("2026-01-02", True)])
+    assert len(historico) == 0
+    with pytest.raises(IndexError):
+        historico[0]
@@ -0,0 +1,56 @@
+import json
+
+from src.database.RepositorioGeral import RepositorioGeral
+from src.models.gestor import Gestor
+from src.models.turma import Turma
+from src.services.importador_em_massa import ImportadorEmMassa
+from tests.conftest import criar_municipio
+
+
+def linha_aluno(i, **extra):
+    return {"tipo": "ALUNO", "nome": "Levi Farias", "cpf": f"{i:011d}", "email": f"a{i}@escola.com",
+            "senha": "LeviFarias2026", "telefone": "88912345678", "data_nascimento": "10/05/2000",
+            "id_matricula": f"MAT-2026-{i:04d}", **extra}
+
+
+def linha_professor(i, **extra):
+    return {"tipo": "PROFESSOR", "nome": "Claudio Oliveira", "cpf": f"{70000000000 + i:011d}",
+            "email": f"p{i}@escola.com", "senha": "Professor123!", "telefone": "88999887766",
+            "data_nascimento": "01/01/1980", "registro_funcional": f"RF-2026-{i:04d}", "titulacao": "Mestre",
+            "area_atuacao": "Matematica", "salario": "4500", **extra}
+
+
+def cenario(tmp_path, linhas):
+    _, escola, _ = criar_municipio()
+    gestor = Gestor("Ana Silva", "11122233344", "gestor@escola.com", "Gestor123!", "88999887766", "01/01/1980",
+                    escola, 50000)
+    turmas = {"T1": Turma("T1", "Turma 1", 2026, escola.id_escola), "T9": Turma("T9", "Outra", 2026, "E-OUTRA")}
+    caminho = tmp_path / "carga.jsonl"
+    caminho.write_text("\n".join(json.dumps(linha) for linha in linhas) + "\nnão é json\n", encoding="utf-8")
+    repositorio = RepositorioGeral()
+    resumo = ImportadorEmMassa(gestor, repositorio, tamanho_lote=2).importar(str(caminho), turmas=turmas)
+    return resumo, turmas, repositorio
+
+
+def test_importa_vincula_e_reporta_rejeitados(tmp_path):
+    linhas = [linha_aluno(1, id_turma="T1"), linha_aluno(2), linha_aluno(2), linha_aluno(3, email="x"),
+              linha_aluno(4, id_turma="T404"), linha_professor(1, id_turma="T1"), linha_professor(2, id_turma="T9")]
+    resumo, turmas, repositorio = cenario(tmp_path, linhas)
+
+    assert resumo["linhas_lidas"] == 8
+    assert resumo["importados"] == 3
+    assert resumo["pool"] == "threads"
+    assert sorted(r["linha"] for r in resumo["rejeitados"]) == [3, 4, 5, 7, 8]
+    assert [a.id_matricula for a in turmas["T1"].alunos_matriculados] == ["MAT-2026-0001"]
+
+    professor = repositorio.buscar_professor("RF-2026-0001")
+    assert professor in turmas["T1"]._professores_regentes
+    assert turmas["T1"] in professor.turmas_associadas
+    assert repositorio.buscar_professor("RF-2026-0002") is None
+
+
+def test_pool_de_processos_por_padrao_para_arquivos_grandes(tmp_path, monkeypatch):
+    monkeypatch.setattr(ImportadorEmMassa, "LIMIAR_PROCESSOS", 1)
+    resumo, _, _ = cenario(tmp_path, [linha_aluno(1, id_turma="T1")])
+    assert resumo["pool"] == "processos"
+    assert resumo["importados"] == 1
@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+
+from src.services.avaliador_frequencia import AvaliadorFrequencia
+from src.services.motor_frequencia import MotorFrequencia
+from tests.conftest import chamadas_aleatorias, criar_turma
+
+
+def resumo_por_aluno(turma, mes, ano, frequencia_minima):
+    """Cálculo de referência: percorre o histórico de cada aluno."""
+    aulas = sum(1 for aula in turma._diario_de_classe
+                if aula["data"].month == mes and aula["data"].year == ano)
+    taxas = [sum(1 for r in aluno.presenca if r["presenca"] and r["data"].month == mes and r["data"].year == ano)
+             / aulas for aluno in turma.alunos_matriculados]
+    return sum(taxas) / len(taxas), sum(taxa < frequencia_minima for taxa in taxas)
+
+
+def test_resumo_mensal_igual_ao_calculo_por_aluno():
+    turma, professor, alunos = criar_turma(n_alunos=8)
+    chamadas_aleatorias(turma, professor, alunos, n_aulas=60, semente=3)
+    motor = MotorFrequencia(0.75)
+    indice = motor.indexar_turma(turma)
+
+    for ano, mes in turma._aulas_por_mes:
+        media, abaixo = motor.resumo_mensal(turma, mes, ano, indice=indice)
+        media_ref, abaixo_ref = resumo_por_aluno(turma, mes, ano, 0.75)
+        assert media == pytest.approx(media_ref)
+        assert abaixo == abaixo_ref
+
+
+def test_resumo_mensal_sem_aulas_ou_sem_alunos():
+    turma, professor, alunos = criar_turma(n_alunos=2)
+    with pytest.raises(ValueError):
+        MotorFrequencia(0.75).resumo_mensal(turma, 5)
+    vazia, _, _ = criar_turma("T2", n_alunos=0)
+    with pytest.raises(ValueError):
+        MotorFrequencia(0.75).resumo_mensal(vazia, 5)
+
+
+def test_avaliador_gera_demanda_abaixo_do_minimo():
+    turma, professor, (aluno,) = criar_turma(n_alunos=1)
+    for i, dia in enumerate((2, 4, 9, 11)):
+        professor.realizar_chamada(turma, date(2026, 2, dia), [{"aluno": aluno, "presente": i == 0}])
+
+    demanda = AvaliadorFrequencia().verificar_media_frequencia_mensal(turma, 2)
+    assert demanda is not None
+    assert demanda.prioridade == "ALTA"
+    with pytest.raises(ValueError):
+        AvaliadorFrequencia().verificar_media_frequencia_mensal(turma, 3)
+
+
+def test_indexar_turma_nao_aloca_historico_de_aluno_sem_registros():
+    turma, professor, alunos = criar_turma(n_alunos=3)
+    professor.realizar_chamada(turma, date(2026, 3, 2), [{"aluno": alunos[0], "presente": True}])
+
+    media, abaixo = MotorFrequencia(0.75).resumo_mensal(turma, 3)
+
+    assert (media, abaixo) == (pytest.approx(1 / 3), 2)
+    assert alunos[1]._historico_frequencia is None and alunos[2]._historico_frequencia is None
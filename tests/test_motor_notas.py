@@ -0,0 +1,84 @@
+import pytest
+
+from src.database.RepositorioGeral import RepositorioGeral
+from src.database.persistencia_sqlite import PersistenciaSQLite
+from src.database.serializacao_jsonl import CarregadorJSONL, ExportadorJSONL
+from src.services.motor_notas import MotorNotas, obter_motor_notas
+from tests.conftest import criar_municipio, criar_turma
+
+
+def rede(persistencia=None):
+    """Turma com 4 alunos; dois abaixo da média em Matemática (duas avaliações cada)."""
+    repositorio = RepositorioGeral(persistencia)
+    municipio, escola, _ = criar_municipio()
+    turma, professor, alunos = criar_turma("T1", n_alunos=4, id_escola=escola.id_escola)
+    professor.escola_associada = escola
+    escola.adicionar_turma(turma)
+    repositorio.adicionar_municipio(municipio)
+    repositorio.adicionar_escola(escola)
+    repositorio.adicionar_turma(turma)
+    for usuario in [professor, *alunos]:
+        repositorio.adicionar_usuario(usuario)
+    for aluno, notas in zip(alunos, ((9, 8), (4, 5), (3, 6), (7, 7))):
+        for nota in notas:
+            professor.lancar_nota(aluno, "Matemática", nota)
+    professor.lancar_nota(alunos[0], "História", 5.5)
+    return repositorio, professor, alunos
+
+
+def estado(motor):
+    return (motor.verificar_lacuna("T1"), motor.media("T1", "Matemática"),
+            motor.notas_aluno("T1", "Matemática", "MAT-2026-0002"), motor.total_avaliacoes("T1", "Matemática"))
+
+
+@pytest.mark.parametrize("disciplina, nota", [("", 7.0), ("   ", 7.0), (None, 7.0), ("Matemática", True),
+                                               ("Matemática", 11), ("Matemática", "8")])
+def test_lancar_nota_invalida_avisa_e_nao_grava(capsys, disciplina, nota):
+    turma, professor, alunos = criar_turma(n_alunos=1)
+
+    assert professor.lancar_nota(alunos[0], disciplina, nota) is None
+
+    assert "Erro" in capsys.readouterr().out
+    assert obter_motor_notas().turmas() == [] and alunos[0].notas == {}
+
+
+def test_avaliacoes_voltam_ao_motor_ao_recarregar_do_sqlite(tmp_path):
+    caminho = str(tmp_path / "rede.db")
+    repositorio, _, _ = rede(PersistenciaSQLite(caminho))
+    esperado = estado(obter_motor_notas())
+    assert esperado[0] == (0.5, 2, 4, True)
+    repositorio.salvar()
+    repositorio.persistencia.fechar()
+
+    motor = MotorNotas()
+    recarregado = RepositorioGeral(PersistenciaSQLite(caminho), motor_notas=motor)
+    aluno = recarregado.buscar_aluno("MAT-2026-0002")
+    assert estado(motor) == esperado
+    assert motor.media_aluno("T1", "MAT-2026-0001", "História") == 5.5
+
+    # a gravação seguinte acrescenta só a avaliação nova
+    motor.lancar(aluno.turma_associada, aluno, "Matemática", 9.0, "M1")
+    recarregado.salvar()
+    recarregado.persistencia.fechar()
+    outro = MotorNotas()
+    RepositorioGeral(PersistenciaSQLite(caminho), motor_notas=outro).buscar_turma("T1")
+    assert outro.notas_aluno("T1", "Matemática", "MAT-2026-0002") == [4.0, 5.0, 9.0]
+    assert outro.verificar_lacuna("T1", "Matemática")[1] == 1
+
+
+def test_avaliacoes_exportadas_em_jsonl_incremental(tmp_path):
+    repositorio, professor, alunos = rede()
+    exportador = ExportadorJSONL(repositorio)
+    marca = exportador.exportar(str(tmp_path / "base.jsonl"))["marca"]
+    professor.lancar_nota(alunos[2], "Matemática", 2.0)
+    resumo = exportador.exportar(str(tmp_path / "incremento.jsonl"), marca)
+    assert resumo["avaliacoes"] == 1
+
+    motor = MotorNotas()
+    carregador = CarregadorJSONL(RepositorioGeral(motor_notas=motor))
+    carregador.carregar(str(tmp_path / "base.jsonl"))
+    carregador.carregar(str(tmp_path / "incremento.jsonl"))
+    carregador.carregar(str(tmp_path / "incremento.jsonl"))  # reaplicar o incremento não duplica
+
+    assert estado(motor) == estado(obter_motor_notas())
+    assert motor.notas_aluno("T1", "Matemática", "MAT-2026-0003") == [3.0, 6.0, 2.0]
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+from src.core.notificador import Assinatura, DestinoMemoria, Notificacao, Notificador
+
+
+class DestinoLento(DestinoMemoria):
+    async def entregar(self, assinatura, notificacao):
+        await asyncio.sleep(0.002)
+        await super().entregar(assinatura, notificacao)
+
+
+def notificacao(i, municipio="M1"):
+    return Notificacao(f"D{i}", municipio, "CRÍTICO", "Vazamento", "2026-03-02T10:00:00")
+
+
+def test_assinatura_inativa_guarda_as_notificacoes_ate_ativar():
+    assinatura = Assinatura("GESTOR", DestinoMemoria(), "M1", capacidade=2)
+
+    assert assinatura._enfileirar(notificacao(1)) and assinatura._enfileirar(notificacao(1))
+    assert assinatura._enfileirar(notificacao(2))
+    assert not assinatura._enfileirar(notificacao(3))
+    assert assinatura.pendentes == 2 and assinatura.combinadas == 1
+
+
+def test_publicar_logo_apos_assinar_de_outra_thread():
+    async def principal():
+        notificador = Notificador()
+        await notificador.iniciar()
+        destino = DestinoMemoria()
+        # a ativação fica agendada no laço, que só a executa quando esta corrotina ceder a vez
+        thread = threading.Thread(target=notificador.assinar, args=("GESTOR", destino, "M1"))
+        thread.start()
+        thread.join()
+        await notificador.publicar(notificacao(1))
+        await notificador.encerrar()
+        return destino
+
+    destino = asyncio.run(principal())
+    assert [n.id_demanda for _, n in destino.entregues] == ["D1"]
+
+
+def test_assinar_no_laco_ativa_na_hora_e_aguardar_entregas_espera_todas():
+    async def principal():
+        notificador = Notificador(capacidade=3)
+        await notificador.iniciar()
+        destino = DestinoLento()
+        assinatura = notificador.assinar("SECRETARIO", destino)
+        assert assinatura.ativa
+        for i in range(10):
+            await notificador.publicar(notificacao(i, f"M{i % 2}"))
+        await notificador.aguardar_entregas()
+        entregues = len(destino.entregues)
+        await notificador.encerrar()
+        return entregues, assinatura
+
+    entregues, assinatura = asyncio.run(principal())
+    assert entregues == 10
+    assert assinatura.pendentes == 0 and assinatura.entregues == 10
+
+
+def test_assinaturas_concorrentes_com_o_laco_em_segundo_plano():
+    notificador = Notificador()
+    notificador.iniciar_em_segundo_plano()
+    destinos = [DestinoMemoria() for _ in range(8)]
+    threads = [threading.Thread(target=notificador.assinar, args=("GESTOR", destino, "M1")) for destino in destinos]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for i in range(3):
+        notificador._laco.call_soon_threadsafe(notificador._publicar_sem_bloquear, notificacao(i), ("GESTOR",))
+    notificador.encerrar_segundo_plano()
+
+    assert len(notificador.assinantes("M1")) == 8
+    assert all(len(destino.entregues) == 3 for destino in destinos)
@@ -0,0 +1,81 @@
+from datetime import date
+
+import pytest
+
+from src.database.RepositorioGeral import RepositorioGeral
+from src.database.persistencia_sqlite import PersistenciaSQLite
+from tests.conftest import criar_municipio, criar_professor, criar_turma
+
+
+def rede_persistida(caminho):
+    """Grava um município com uma turma de 2 alunos, 2 aulas e a frequência delas."""
+    repositorio = RepositorioGeral(PersistenciaSQLite(caminho))
+    municipio, escola, _ = criar_municipio()
+    turma, professor, alunos = criar_turma("T1", n_alunos=2, id_escola=escola.id_escola)
+    professor.escola_associada = escola
+    escola.adicionar_turma(turma)
+    repositorio.adicionar_municipio(municipio)
+    repositorio.adicionar_escola(escola)
+    repositorio.adicionar_turma(turma)
+    for usuario in [professor, *alunos]:
+        repositorio.adicionar_usuario(usuario)
+    for dia in (2, 4):
+        professor.realizar_chamada(turma, date(2026, 3, dia), [{"aluno": a, "presente": True} for a in alunos])
+    repositorio.salvar()
+    repositorio.persistencia.fechar()
+
+
+def test_carga_sob_demanda_restaura_diario_e_frequencia(tmp_path):
+    caminho = str(tmp_path / "rede.db")
+    rede_persistida(caminho)
+
+    repositorio = RepositorioGeral(PersistenciaSQLite(caminho))
+    aluno = repositorio.buscar_aluno("MAT-2026-0001")
+    assert aluno.turma_associada.total_aulas == 2
+    assert aluno.frequencia == 100.0
+    assert aluno.presenca.presencas_mes(3, 2026) == 2
+
+
+def test_aula_registrada_antes_de_carregar_os_alunos_nao_se_perde(tmp_path):
+    caminho = str(tmp_path / "rede.db")
+    rede_persistida(caminho)
+
+    repositorio = RepositorioGeral(PersistenciaSQLite(caminho))
+    turma = repositorio.buscar_turma("T1")
+    substituto = criar_professor(9)
+    turma.adicionar_professor(substituto)
+    assert turma.registrar_aula(substituto, date(2026, 3, 9), "Aula de reposição")
+    repositorio.carregar_alunos_da_turma("T1")
+    assert turma.total_aulas == 3
+    assert all(aluno.frequencia <= 100.0 for aluno in turma.alunos_matriculados)
+    repositorio.salvar()
+    repositorio.persistencia.fechar()
+
+    recarregado = RepositorioGeral(PersistenciaSQLite(caminho)).buscar_turma("T1")
+    assert [aula["data"] for aula in recarregado._diario_de_classe] == [
+        date(2026, 3, 2), date(2026, 3, 4), date(2026, 3, 9)]
+
+
+def test_salvar_diario_atras_do_persistido_falha_em_vez_de_perder_aulas(tmp_path):
+    caminho = str(tmp_path / "rede.db")
+    rede_persistida(caminho)
+
+    persistencia = PersistenciaSQLite(caminho)
+    turma, professor, _ = criar_turma("T1", n_alunos=0)
+    turma.registrar_aula(professor, date(2026, 3, 9), "Aula de reposição")
+    with pytest.raises(ValueError):
+        with persistencia._conexao:
+            persistencia.salvar_diarios([turma])
+    assert len(list(persistencia.iterar_diario("T1"))) == 2
+
+
+def test_buscar_professor_carrega_da_persistencia(tmp_path):
+    caminho = str(tmp_path / "rede.db")
+    rede_persistida(caminho)
+
+    repositorio = RepositorioGeral(PersistenciaSQLite(caminho))
+    professor = repositorio.buscar_professor("rf-2026-0001")
+    assert professor is not None
+    assert professor.id_municipio == "M1"
+    assert repositorio.buscar_usuario_por_cpf(professor.cpf) is professor
+    assert repositorio.buscar_professor("RF-2026-9999") is None
@@ -0,0 +1,127 @@
+import sys
+
+import pytest
+
+from src.models.demanda_infraestrutura import DemandaInfraestrutura
+from src.models.demanda_pedagogica import DemandaPedagogica
+from src.services.fila_demandas import FilaDemandas
+from src.services.processador_demandas import ProcessadorDemandas
+from tests.conftest import criar_municipio, criar_turma
+
+
+class DemandaComFalha(DemandaPedagogica):
+    __slots__ = ()
+
+    def processar_solicitacao(self, usuario):
+        raise RuntimeError("falha inesperada")
+
+
+class DemandaQueObservaSaida(DemandaPedagogica):
+    __slots__ = ()
+    saidas = []
+
+    def processar_solicitacao(self, usuario):
+        DemandaQueObservaSaida.saidas.append(sys.stdout)
+        super().processar_solicitacao(usuario)
+
+
+def lote(n_municipios=2, verba=50_000):
+    secretarios, demandas = [], []
+    for i in range(1, n_municipios + 1):
+        _, _, secretario = criar_municipio(i, verba)
+        secretarios.append(secretario)
+        turma, _, _ = criar_turma(f"T{i}", n_alunos=4, i0=10 * i)
+        for k in range(3):
+            infra = DemandaInfraestrutura(f"I{i}-{k}", "Reparo", "NORMAL", secretario, 20_000, "Escola")
+            demandas.append(infra)
+        pedagogica = DemandaPedagogica(f"P{i}", "Reforço", "ALTA", secretario, 4, 2, 0.5, 2, turma)
+        demandas.append(pedagogica)
+    return secretarios, demandas
+
+
+@pytest.mark.parametrize("usar_processos", [False, True])
+def test_lote_aplica_status_verba_e_estado_calculado(usar_processos):
+    secretarios, demandas = lote()
+    turmas = [d.turma_alvo for d in demandas if isinstance(d, DemandaPedagogica)]
+
+    resumo = ProcessadorDemandas(secretarios, trabalhadores=2, usar_processos=usar_processos).processar(demandas)
+
+    assert resumo["processadas"] == 8 and resumo["com_erro"] == 0
+    assert [linha["id_demanda"] for linha in resumo["resultados"]] == [d.id_demanda for d in demandas]
+    assert [s.verba_municipal_total for s in secretarios] == [10_000, 10_000]
+    infra = [d for d in demandas if isinstance(d, DemandaInfraestrutura)]
+    assert [d.status for d in infra] == ["EM ANDAMENTO", "EM ANDAMENTO", "EM LICITAÇÃO"] * 2
+    pedagogicas = [d for d in demandas if isinstance(d, DemandaPedagogica)]
+    # valores calculados nos trabalhadores chegam aos originais, que seguem ligados às mesmas turmas
+    assert [d.status for d in pedagogicas] == ["REFORÇO APROVADO"] * 2
+    assert [d.indice_lacuna for d in pedagogicas] == [0.5, 0.5]
+    assert [d.turma_alvo for d in pedagogicas] == turmas
+
+
+class ProcessadorComGastoParalelo(ProcessadorDemandas):
+    def _sincronizar(self, itens, linhas, estados, secretario, verba_gasta):
+        # gasto feito no Secretario original enquanto as cópias eram processadas
+        secretario.gerenciar_verba(DemandaInfraestrutura("G1", "Extra", "NORMAL", secretario, 5_000, "Escola"))
+        super()._sincronizar(itens, linhas, estados, secretario, verba_gasta)
+
+
+def test_processos_debitam_so_o_gasto_do_lote_da_verba_original():
+    secretarios, demandas = lote(1)
+
+    ProcessadorComGastoParalelo(secretarios, trabalhadores=1, usar_processos=True).processar(demandas)
+
+    assert secretarios[0].verba_municipal_total == 50_000 - 40_000 - 5_000
+
+
+def test_fila_acompanha_mudancas_de_status_vindas_de_varias_threads():
+    secretarios, demandas = [], []
+    for i in range(1, 9):
+        _, _, secretario = criar_municipio(i)
+        secretarios.append(secretario)
+        demandas.extend(DemandaInfraestrutura(f"I{i}-{k}", "Reparo", "NORMAL", secretario, 1_000, "Escola")
+                        for k in range(50))
+    fila = FilaDemandas()
+    fila.adicionar_varias(demandas)
+
+    ProcessadorDemandas(secretarios, trabalhadores=8).processar(demandas)
+
+    retiradas = [d for s in secretarios for d in fila.retirar_proximas(s.id_municipio, 100, "EM ANDAMENTO")]
+    assert sorted(d.id_demanda for d in retiradas) == sorted(d.id_demanda for d in demandas)
+    assert len(fila) == 0
+
+
+def test_falha_qualquer_fica_no_resumo_sem_interromper_o_lote():
+    secretarios, demandas = lote(1)
+    turma = demandas[-1].turma_alvo
+    demandas.insert(1, DemandaComFalha("F1", "Reforço", "ALTA", secretarios[0], 4, 2, 0.5, 2, turma))
+
+    resumo = ProcessadorDemandas(secretarios, trabalhadores=2).processar(demandas)
+
+    assert resumo["com_erro"] == 1 and resumo["processadas"] == 4
+    assert resumo["resultados"][1]["erro"] == "RuntimeError: falha inesperada"
+    assert resumo["resultados"][1]["status_final"] == "ABERTO"
+    assert all(d.status != "ABERTO" for d in demandas if not isinstance(d, DemandaComFalha))
+
+
+def test_demanda_sem_secretario_e_registrada_como_erro():
+    secretarios, demandas = lote(1)
+    _, _, outro = criar_municipio(9)
+    demandas.append(DemandaInfraestrutura("X", "Reparo", "NORMAL", outro, 10, "Escola"))
+
+    resumo = ProcessadorDemandas(secretarios).processar(demandas)
+
+    assert resumo["resultados"][-1]["erro"].startswith("Erro: Nenhum secretário")
+    assert demandas[-1].status == "ABERTO"
+
+
+def test_lote_nao_troca_o_stdout_do_processo():
+    secretarios, _ = lote(1)
+    turma, _, _ = criar_turma("TS", n_alunos=2, i0=50)
+    demanda = DemandaQueObservaSaida("S1", "Reforço", "ALTA", secretarios[0], 2, 1, 0.5, 1, turma)
+    DemandaQueObservaSaida.saidas.clear()
+    antes = sys.stdout
+
+    ProcessadorDemandas(secretarios, trabalhadores=1).processar([demanda])
+
+    assert DemandaQueObservaSaida.saidas == [antes]
+    assert demanda.status == "REFORÇO APROVADO"
@@ -0,0 +1,96 @@
+import random
+from datetime import date, timedelta
+
+from src.models.escola import Escola
+from src.models.turma import Turma
+from src.services.relatorios_frequencia import AgregadorFrequencia
+from tests.conftest import chamadas_aleatorias, criar_aluno, criar_municipio, criar_professor, criar_turma
+
+
+def bruto(entidade):
+    """Relatório recalculado percorrendo os alunos (sem o agregador)."""
+    agregador, entidade._agregador = entidade._agregador, None
+    try:
+        return entidade.gerar_relatorio_frequencia()
+    finally:
+        entidade._agregador = agregador
+
+
+def rede():
+    municipio, escola, _ = criar_municipio(1)
+    turma, professor, alunos = criar_turma("T1", n_alunos=10, i0=1, id_escola=escola.id_escola)
+    chamadas_aleatorias(turma, professor, alunos, n_aulas=20, semente=1)
+    escola.adicionar_turma(turma)
+    agregador = AgregadorFrequencia()
+    agregador.acompanhar_municipio(municipio)
+    return municipio, escola, agregador, alunos
+
+
+def test_totais_acompanham_aulas_presencas_e_matriculas():
+    municipio, escola, agregador, alunos = rede()
+    assert agregador.frequencia_escola(escola.id_escola) == bruto(escola)
+
+    outra = Escola("Escola B", "Rua", "E2", None, 10, municipio.id_municipio)
+    municipio.cadastrar_escola(outra)
+    nova = Turma("T3", "Turma B", 2026, "E2")
+    outra.adicionar_turma(nova)
+    professor = criar_professor(77)
+    nova.adicionar_professor(professor)
+    matriculados = [criar_aluno(500 + i) for i in range(5)]
+    for aluno in matriculados:
+        nova.adicionar_aluno(aluno)
+    assert agregador.frequencia_escola("E2") == 100.0
+
+    rnd = random.Random(3)
+    for k in range(30):
+        data = date(2026, 3, 1) + timedelta(days=k)
+        professor.realizar_chamada(nova, data, [{"aluno": a, "presente": rnd.random() < 0.6} for a in matriculados])
+        if k % 7 == 0:
+            aluno = criar_aluno(600 + k)
+            aluno.registrar_presenca(date(2026, 2, 1), True)
+            nova.adicionar_aluno(aluno)
+            matriculados.append(aluno)
+        alunos[0].registrar_presencas_em_lote([(data, True), (data, False)])
+        for entidade in (escola, outra):
+            assert agregador.frequencia_escola(entidade.id_escola) == bruto(entidade)
+        assert agregador.frequencia_municipio(municipio.id_municipio) == bruto(municipio)
+
+    assert agregador.verificar_consistencia() == []
+    presencas = sum(a.presenca.presencas_mes(3, 2026) for a in nova.alunos_matriculados)
+    esperadas = nova.aulas_no_mes(3, 2026) * len(nova.alunos_matriculados)
+    assert agregador.frequencia_mensal_escola("E2", 2026, 3) == round(presencas / esperadas * 100, 2)
+
+
+def test_reconstrucao_corrige_divergencia_e_saida_de_turma():
+    municipio, escola, agregador, _ = rede()
+    turma = escola._turmas_existentes[0]
+
+    agregador._escolas[escola.id_escola][0] += 50
+    assert agregador.verificar_consistencia() != []
+    agregador.reconstruir()
+    assert agregador.verificar_consistencia() == []
+
+    turma.descartar_ate(2026)
+    assert agregador.verificar_consistencia() == []
+    assert escola.gerar_relatorio_frequencia() == bruto(escola)
+
+    agregador.deixar_de_acompanhar(turma)
+    assert agregador.alunos_escola(escola.id_escola) == 0
+    assert agregador.alunos_municipio(municipio.id_municipio) == 0
+
+
+def test_media_sem_arredondar_por_aluno_igual_nos_dois_caminhos():
+    # 0, 2 e 2 presenças em 3 aulas: arredondar cada aluno daria 44.45 em vez de 44.44
+    municipio, escola, _ = criar_municipio(1)
+    turma, professor, alunos = criar_turma("T1", n_alunos=3, id_escola=escola.id_escola)
+    escola.adicionar_turma(turma)
+    for dia, presentes in ((2, (1, 2)), (3, (1, 2)), (4, ())):
+        professor.realizar_chamada(turma, date(2026, 3, dia),
+                                   [{"aluno": a, "presente": i in presentes} for i, a in enumerate(alunos)])
+    esperado = bruto(escola)
+    agregador = AgregadorFrequencia()
+    agregador.acompanhar_municipio(municipio)
+
+    assert esperado == bruto(municipio) == 44.44
+    assert agregador.frequencia_escola(escola.id_escola) == escola.gerar_relatorio_frequencia() == esperado
+    assert agregador.frequencia_municipio(municipio.id_municipio) == esperado
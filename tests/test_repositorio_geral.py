@@ -0,0 +1,51 @@
+import pytest
+
+from src.database.RepositorioGeral import RepositorioGeral
+from src.models.demanda_infraestrutura import DemandaInfraestrutura
+from tests.conftest import criar_aluno, criar_municipio, criar_professor
+
+
+def repositorio_com_municipio():
+    repositorio = RepositorioGeral()
+    municipio, escola, secretario = criar_municipio()
+    repositorio.adicionar_municipio(municipio)
+    repositorio.adicionar_escola(escola)
+    repositorio.adicionar_usuario(secretario)
+    return repositorio, municipio, escola, secretario
+
+
+def test_indices_de_usuarios_impedem_duplicidade():
+    repositorio = RepositorioGeral()
+    aluno = criar_aluno(1)
+    repositorio.adicionar_usuario(aluno)
+    assert repositorio.buscar_usuario_por_cpf("000.000.000-01") is aluno
+    assert repositorio.buscar_aluno(" mat-2026-0001 ") is aluno
+    with pytest.raises(ValueError):
+        repositorio.adicionar_usuario(criar_aluno(1))
+    professor = criar_professor(2)
+    repositorio.adicionar_usuario(professor)
+    assert repositorio.buscar_professor("rf-2026-0002") is professor
+
+
+def test_indice_por_status_acompanha_processar_solicitacao():
+    repositorio, municipio, _, secretario = repositorio_com_municipio()
+    demanda = DemandaInfraestrutura("D-1", "Telhado", "NORMAL", secretario, 5000, "Bloco A")
+    repositorio.adicionar_demanda(demanda)
+    assert repositorio.demandas_por_status("ABERTO") == [demanda]
+
+    demanda.processar_solicitacao(secretario)
+
+    assert demanda.status == "EM ANDAMENTO"
+    assert repositorio.demandas_por_status("ABERTO") == []
+    assert repositorio.demandas_por_status("EM ANDAMENTO") == [demanda]
+    assert repositorio.demandas_do_municipio(municipio.id_municipio, "EM ANDAMENTO") == [demanda]
+
+
+def test_demanda_removida_deixa_de_ser_indexada():
+    repositorio, municipio, _, secretario = repositorio_com_municipio()
+    demanda = DemandaInfraestrutura("D-2", "Muro", "NORMAL", secretario, 5000, "Pátio")
+    repositorio.adicionar_demanda(demanda)
+    assert repositorio.remover_demanda("D-2") is demanda
+    demanda.atualizar_status("EM ANDAMENTO")
+    assert repositorio.demandas_por_status("EM ANDAMENTO") == []
+    assert repositorio.demandas_do_municipio(municipio.id_municipio) == []
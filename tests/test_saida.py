@@ -0,0 +1,81 @@
+import threading
+from datetime import date
+
+from src.core import saida
+from tests.conftest import criar_turma
+
+
+class Contador:
+    """Argumento de log que conta quantas vezes foi formatado."""
+    def __init__(self):
+        self.formatado = 0
+
+    def __str__(self):
+        self.formatado += 1
+        return "valor"
+
+
+def test_modo_interativo_escreve_no_console(capsys):
+    turma, professor, _ = criar_turma()
+    capsys.readouterr()
+
+    turma.registrar_aula(professor, date(2026, 3, 2), "Frações e decimais")
+
+    assert "Aula registrada com sucesso na Turma T1 (2026-03-02)." in capsys.readouterr().out
+
+
+def test_modo_silencioso_nao_escreve_nem_formata_e_restaura_o_nivel(capsys):
+    logger = saida.obter_logger("teste")
+    argumento = Contador()
+    nivel = saida.nivel_atual()
+
+    with saida.modo_silencioso():
+        turma, professor, alunos = criar_turma()
+        professor.realizar_chamada(turma, date(2026, 3, 2), [{"aluno": a, "presente": True} for a in alunos])
+        logger.info("mensagem %s", argumento)
+        logger.error("erro %s", argumento)
+
+    assert capsys.readouterr().out == ""
+    assert argumento.formatado == 0
+    assert saida.nivel_atual() == nivel
+    assert turma.aulas_no_mes(3, 2026) == 1
+
+
+def test_modo_silencioso_vale_so_para_a_thread_que_o_abriu(capsys):
+    logger = saida.obter_logger("teste")
+    dentro, liberar = threading.Event(), threading.Event()
+
+    def lote():
+        with saida.modo_silencioso():
+            dentro.set()
+            logger.error("erro do lote")
+            liberar.wait()
+
+    trabalhador = threading.Thread(target=lote)
+    trabalhador.start()
+    dentro.wait()
+    with saida.modo_silencioso():
+        with saida.modo_silencioso():
+            pass
+        logger.error("silenciada")
+    logger.error("erro de outra thread")
+    liberar.set()
+    trabalhador.join()
+
+    assert capsys.readouterr().out == "erro de outra thread\n"
+    assert saida.nivel_atual() == saida.INFO
+
+
+def test_ouvinte_recebe_eventos_no_nivel_pedido():
+    mensagens = []
+    ouvinte = saida.adicionar_ouvinte(lambda registro: mensagens.append(registro.getMessage()), saida.AVISO)
+    try:
+        saida.configurar_saida(saida.INFO, console=False)
+        turma, professor, _ = criar_turma()
+        turma.registrar_aula(professor, date(2026, 3, 2), "Frações e decimais")
+        turma.registrar_aula(professor, "2026-03-03", "Frações e decimais")
+    finally:
+        saida.remover_ouvinte(ouvinte)
+        saida.configurar_saida(saida.INFO, console=True)
+
+    assert mensagens == ["Erro: O campo data deve ser um objeto do tipo date (ex: date.today())."]
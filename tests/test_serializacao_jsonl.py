@@ -0,0 +1,102 @@
+from datetime import date
+
+from src.database.RepositorioGeral import RepositorioGeral
+from src.database.serializacao_jsonl import CarregadorJSONL, ExportadorJSONL
+from src.models.gestor import Gestor
+from src.models.turma import Turma
+from tests.conftest import criar_municipio, criar_turma
+
+
+def criar_gestor(i, escola):
+    return Gestor("Ana Souza", f"{70000000000 + i:011d}", f"gestor{i}@escola.com", "Gestor123!",
+                  "88999887766", "01/01/1975", escola, 20000.0)
+
+
+def rede():
+    """Município com uma escola (gestor), duas turmas, um professor e três alunos com frequência."""
+    repositorio = RepositorioGeral()
+    municipio, escola, secretario = criar_municipio()
+    turma, professor, alunos = criar_turma("T1", n_alunos=3, id_escola=escola.id_escola)
+    outra = Turma("T2", "Turma B", 2026, escola.id_escola)
+    professor.escola_associada = escola
+    gestor = criar_gestor(1, escola)
+    escola.gestor_atual = gestor
+    for dia in (2, 4, 6):
+        professor.realizar_chamada(turma, date(2026, 3, dia),
+                                   [{"aluno": a, "presente": dia != 4 or i == 0} for i, a in enumerate(alunos)])
+    alunos[0].registrar_nota("Matemática", 7.5)
+    alunos[0].registrar_nota("História", 6.0)
+
+    repositorio.adicionar_municipio(municipio)
+    repositorio.adicionar_escola(escola)
+    for t in (turma, outra):
+        escola.adicionar_turma(t)
+        repositorio.adicionar_turma(t)
+    for usuario in [secretario, gestor, professor, *alunos]:
+        repositorio.adicionar_usuario(usuario)
+    return repositorio
+
+
+def foto(repositorio, caminho):
+    """Registros de entidades de um instantâneo completo, sem depender da ordem."""
+    ExportadorJSONL(repositorio).exportar(caminho)
+    with open(caminho, encoding="utf-8") as arquivo:
+        return sorted(linha for linha in arquivo if '"registro": "frequencia"' not in linha)
+
+
+def test_incremento_aplica_o_registro_inteiro_e_religa_as_entidades(tmp_path):
+    origem = rede()
+    exportador = ExportadorJSONL(origem)
+    marca = exportador.exportar(str(tmp_path / "base.jsonl"))["marca"]
+    destino = RepositorioGeral()
+    carregador = CarregadorJSONL(destino)
+    carregador.carregar(str(tmp_path / "base.jsonl"))
+
+    municipio = origem.buscar_municipio("M1")
+    escola = origem.buscar_escola("E1")
+    turma, outra = origem.buscar_turma("T1"), origem.buscar_turma("T2")
+    aluno = origem.buscar_aluno("MAT-2026-0001")
+    professor = origem.buscar_professor("RF-2026-0001")
+    municipio.nome = "Nova Cidade"
+    escola.endereco = "Avenida Central"
+    outra.nome = "Turma B (tarde)"
+    turma.remover_aluno(aluno)
+    outra.adicionar_aluno(aluno)
+    aluno.nome = "Levi Farias Souza"
+    aluno.telefone = "88900001111"
+    origem.atualizar_email(aluno, "levi.souza@escola.com")
+    aluno.remover_nota("História")
+    turma.remover_professor(professor)
+    outra.adicionar_professor(professor)
+    novo_gestor = criar_gestor(2, escola)
+    escola.gestor_atual = novo_gestor
+    origem.adicionar_usuario(novo_gestor)
+
+    resumo = exportador.exportar(str(tmp_path / "incremento.jsonl"), marca)
+    carregador.carregar(str(tmp_path / "incremento.jsonl"))
+
+    assert resumo["inalteradas"] > 0
+    assert foto(destino, str(tmp_path / "destino.jsonl")) == foto(origem, str(tmp_path / "origem.jsonl"))
+    carregado = destino.buscar_aluno("MAT-2026-0001")
+    assert carregado.turma_associada is destino.buscar_turma("T2")
+    assert carregado not in destino.buscar_turma("T1").alunos_matriculados
+    assert destino.buscar_usuario_por_email("levi.souza@escola.com") is carregado
+    assert destino.buscar_usuario_por_email("aluno1@escola.com") is None
+    assert [t.id_turma for t in destino.buscar_professor("RF-2026-0001").turmas_associadas] == ["T2"]
+    assert destino.buscar_escola("E1").gestor_atual is destino.buscar_usuario_por_cpf(novo_gestor.cpf)
+    for id_turma in ("T1", "T2"):
+        assert destino.buscar_turma(id_turma).presencas_alunos == origem.buscar_turma(id_turma).presencas_alunos
+
+
+def test_transferencia_retira_as_presencas_da_turma_anterior():
+    repositorio = rede()
+    turma, outra = repositorio.buscar_turma("T1"), repositorio.buscar_turma("T2")
+    aluno = repositorio.buscar_aluno("MAT-2026-0001")
+    antes = turma.presencas_alunos
+
+    assert turma.remover_aluno(aluno) and not turma.remover_aluno(aluno)
+    outra.adicionar_aluno(aluno)
+
+    assert turma.presencas_alunos == antes - 3
+    assert turma.presencas_alunos_no_mes(3, 2026) == antes - 3
+    assert outra.presencas_alunos == 3 and aluno.turma_associada is outra
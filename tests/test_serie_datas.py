@@ -0,0 +1,90 @@
+import random
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+from src.models.historico_frequencia import HistoricoFrequencia
+from src.utils.serie_datas import SerieDatas, contar_bits
+
+
+def bitset(valores):
+    bits = bytearray((len(valores) + 7) // 8)
+    for i, valor in enumerate(valores):
+        if valor:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bits
+
+
+def test_contar_bits_em_qualquer_trecho():
+    rnd = random.Random(1)
+    valores = [rnd.random() < 0.5 for _ in range(83)]
+    bits = bitset(valores)
+    for inicio in range(0, 84, 3):
+        for fim in range(inicio, 84, 5):
+            assert contar_bits(bits, inicio, fim) == sum(valores[inicio:fim])
+
+
+@pytest.mark.parametrize("embaralhar", [False, True])
+def test_contar_por_intervalo_confere_com_forca_bruta(embaralhar):
+    rnd = random.Random(2)
+    ordinais = sorted(date(2026, 1, 1).toordinal() + rnd.randrange(300) for _ in range(500))
+    if embaralhar:
+        rnd.shuffle(ordinais)
+    pesos = [rnd.random() < 0.7 for _ in ordinais]
+    serie = SerieDatas()
+    serie.extend(ordinais[:200])
+    for ordinal in ordinais[200:]:
+        serie.append(ordinal)
+    bits = bitset(pesos)
+
+    for _ in range(200):
+        inicio = date(2026, 1, 1).toordinal() + rnd.randrange(320)
+        fim = inicio + rnd.randrange(60)
+        dentro = [i for i, o in enumerate(ordinais) if inicio <= o <= fim]
+        assert serie.contar(inicio, fim) == (len(dentro), len(dentro))
+        assert serie.contar(inicio, fim, bits) == (len(dentro), sum(pesos[i] for i in dentro))
+
+
+def test_prefixo_e_descarte_preservam_posicoes_globais():
+    serie = SerieDatas()
+    base = date(2025, 12, 1).toordinal()
+    for dias in (0, 10, 20, 31, 40, 60):
+        serie.append(base + dias)
+    limite = date(2025, 12, 31).toordinal()
+    assert serie.prefixo_ate(limite) == 3
+
+    serie.descartar_prefixo(3)
+    assert len(serie) == 3 and serie.descartados == 3
+    assert serie.contar(limite, base + 60) == (3, 3)
+
+    serie.append(base + 5)  # fora de ordem: prefixo por varredura
+    assert serie.prefixo_ate(base + 45) == 2
+    assert serie.contar(base, base + 45) == (3, 3)
+
+
+def test_historico_usa_so_datas_e_bitset_por_registro():
+    historico = HistoricoFrequencia()
+    inicio = date(2026, 1, 1)
+    n = 20000
+    historico.registrar_em_lote([(inicio + timedelta(days=i % 300), i % 3 != 0) for i in range(n)])
+
+    assert not hasattr(historico._datas, "_acumulados")
+    ordinais, bits = historico.dados_compactos()
+    por_registro = (sys.getsizeof(ordinais) + sys.getsizeof(bits)) / n
+    assert por_registro < 4.5  # antes: 8 bytes (data + soma acumulada) por registro
+    assert historico.presencas_no_periodo(inicio, inicio + timedelta(days=299)) == historico.contar_presencas()
+
+
+def test_historico_descarta_ano_e_mantem_consultas():
+    historico = HistoricoFrequencia()
+    registros = [(date(2025, 11, 3) + timedelta(days=7 * i), i % 2 == 0) for i in range(20)]
+    historico.registrar_em_lote(registros)
+
+    descartados = historico.descartar_ate(2025)
+
+    restantes = [(d, p) for d, p in registros if d.year > 2025]
+    assert descartados == len(registros) - len(restantes)
+    assert historico.posicao_inicial == descartados
+    assert historico.presencas_no_periodo(date(2026, 1, 1), date(2026, 12, 31)) == sum(p for _, p in restantes)
+    assert list(historico.registros_compactos(descartados)) == [(d.toordinal(), p) for d, p in restantes]
@@ -0,0 +1,71 @@
+import pickle
+from datetime import date
+
+from src.models.aluno import Aluno
+from src.models.demanda_infraestrutura import DemandaInfraestrutura
+from src.models.demanda_pedagogica import DemandaPedagogica
+from src.models.historico_frequencia import HistoricoFrequencia
+from tests.benchmark_memoria import _AlunoLayoutAnterior, medir
+from tests.conftest import criar_aluno, criar_municipio, criar_turma
+
+ATRIBUTOS_ALUNO = ("_id", "_nome", "_cpf", "_email", "_senha", "_telefone", "_data_nascimento", "_status",
+                   "_id_matricula", "_turma_associada")
+
+
+def test_entidades_nao_tem_dict_por_instancia():
+    municipio, escola, secretario = criar_municipio(1)
+    turma, professor, alunos = criar_turma(n_alunos=1)
+    entidades = [municipio, escola, turma, professor, alunos[0], HistoricoFrequencia(),
+                 DemandaInfraestrutura("D1", "Reparo", "NORMAL", secretario, 10, "Escola"),
+                 DemandaPedagogica("D2", "Reforço", "ALTA", secretario, 1, 0, 1.0, 1, turma)]
+
+    assert [type(e).__name__ for e in entidades if hasattr(e, "__dict__")] == []
+
+
+def test_aluno_so_aloca_notas_e_historico_no_primeiro_uso():
+    aluno = criar_aluno(1)
+    assert aluno._notas is None and aluno._historico_frequencia is None
+    assert aluno.notas == {}
+    assert aluno._notas is None
+
+    aluno.registrar_nota("Matemática", 8.0)
+    aluno.registrar_presenca(date(2026, 3, 2), True)
+
+    assert aluno.notas == {"Matemática": 8.0}
+    assert len(aluno._historico_frequencia) == 1
+
+
+def test_layout_com_slots_ocupa_menos_da_metade_do_anterior():
+    modelos = [criar_aluno(i) for i in range(1, 2001)]
+
+    def layout_atual(i):
+        aluno = Aluno.__new__(Aluno)
+        for nome in ATRIBUTOS_ALUNO:
+            setattr(aluno, nome, getattr(modelos[i], nome))
+        aluno._notas = aluno._historico_frequencia = None
+        return aluno
+
+    # os dois layouts compartilham as mesmas strings: a diferença medida é só a das instâncias
+    por_aluno, _ = medir(layout_atual, len(modelos))
+    por_aluno_anterior, _ = medir(lambda i: _AlunoLayoutAnterior(modelos[i]), len(modelos))
+
+    assert por_aluno < por_aluno_anterior / 2
+
+
+def test_demanda_sobrevive_ao_pickle_sem_os_ouvintes():
+    _, _, secretario = criar_municipio(1)
+    turma, _, _ = criar_turma(n_alunos=2)
+    pedagogica = DemandaPedagogica("D2", "Reforço", "ALTA", secretario, 2, 1, 0.5, 1, turma, 0.5, (2026, 3))
+    infraestrutura = DemandaInfraestrutura("D1", "Reparo", "NORMAL", secretario, 10, "Escola")
+    for demanda in (pedagogica, infraestrutura):
+        demanda.vincular_municipio("M1")
+        demanda.atualizar_status("EM ANDAMENTO")
+        demanda.adicionar_ouvinte_status(lambda d, anterior: None)
+
+    copias = [pickle.loads(pickle.dumps(demanda)) for demanda in (pedagogica, infraestrutura)]
+
+    for demanda, copia in zip((pedagogica, infraestrutura), copias):
+        assert copia.to_dict() == demanda.to_dict()
+        assert (copia.id_municipio, copia._criado_em) == (demanda.id_municipio, demanda._criado_em)
+        assert copia._ouvintes_status is None
+    assert copias[0].referencia_mensal == (2026, 3) and copias[0].turma_alvo.id_turma == turma.id_turma
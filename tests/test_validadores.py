@@ -0,0 +1,38 @@
+import pytest
+
+from src.utils import validadores
+from tests.conftest import criar_aluno
+
+CPFS_VALIDOS = ["52998224725", "111.444.777-35"]
+
+
+def test_normalizacoes_individuais():
+    assert validadores.normalizar_nome("  levi farias ") == "Levi Farias"
+    assert validadores.normalizar_nome("Levi 2") is None
+    assert validadores.normalizar_cpf("529.982.247-25") == "52998224725"
+    assert validadores.normalizar_cpf("123") is None
+    assert validadores.normalizar_email(" Levi@Escola.COM ") is None  # espaço não casa com o padrão
+    assert validadores.normalizar_email("Levi@Escola.COM") == "levi@escola.com"
+    assert validadores.normalizar_matricula(" mat-2026-0001 ") == "MAT-2026-0001"
+    assert validadores.normalizar_registro_funcional("RF-26-1") is None
+
+
+@pytest.mark.parametrize("usar_numpy", [True, False])
+def test_validacao_de_cpfs_em_lote_igual_a_individual(monkeypatch, usar_numpy):
+    if not usar_numpy:
+        monkeypatch.setattr(validadores, "np", None)
+    valores = CPFS_VALIDOS + ["52998224726", "11111111111", "abc", None, 12345678901]
+    esperado = [validadores.normalizar_cpf(v) if isinstance(v, str) and validadores.normalizar_cpf(v)
+                and validadores.cpf_digitos_validos(validadores.normalizar_cpf(v)) else None for v in valores]
+    assert validadores.validar_cpfs(valores) == esperado == ["52998224725", "11144477735", None, None, None, None, None]
+    assert validadores.validar_cpfs(valores, verificar_digitos=False)[2] == "52998224726"
+
+
+def test_setters_de_usuario_usam_os_validadores():
+    aluno = criar_aluno()
+    aluno.cpf = "529.982.247-25"
+    assert aluno.cpf == "52998224725"
+    with pytest.raises(ValueError):
+        aluno.email = "sem-arroba"
+    with pytest.raises(TypeError):
+        aluno.nome = 10